@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for the orchestration graph.
+
+Runs representative conversations through ``orchestration.graph.get()`` with
+the deterministic fake model (``LLM_PROVIDER=fake``), so orchestration overhead
+can be measured without an API key or network access.
+"""
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Load Generator
+
+Simulates concurrent conversations against the orchestration graph, either
+in-process (the compiled graph from orchestration.graph.get()) or through the
+HTTP service, and reports turn latency and time-to-first-token percentiles,
+throughput and LLM calls per turn.
+
+Each conversation picks a scenario from benchmarks.scenarios according to the
+intent mix, plays its turns (cycling them when --turns asks for more) and
+waits an exponentially distributed think time between turns.
+
+HTTP target: each turn is POST {url}/conversations/{thread_id}/messages with
+{"content": ...}, answered as server-sent events ("token" and "message"
+events with a "content" field, then "done" with optional "llm_calls", or
+"error").
+
+Usage:
+    python -m benchmarks.load [options]
+
+Examples:
+    python -m benchmarks.load --concurrency 20 --conversations 200
+    python -m benchmarks.load --mix greeting=0.4,estimate=0.6 --think-ms 500 --latency-ms 400 --jitter-ms 150
+    python -m benchmarks.load --target http://localhost:8000 --concurrency 50 --duration 60
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run import percentile
+
+
+def parse_mix(value: Optional[str], scenarios: Dict[str, List[str]]) -> Dict[str, float]:
+    """Parse 'greeting=0.3,estimate=0.7' into normalized weights (default: uniform)."""
+    if not value:
+        return {name: 1.0 / len(scenarios) for name in scenarios}
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise ValueError(f"Unknown scenario '{name}'. Available: {', '.join(scenarios)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+class TurnResult:
+    def __init__(self, scenario: str, latency_ms: float, ttft_ms: Optional[float], llm_calls: Optional[int], error: Optional[str] = None):
+        self.scenario = scenario
+        self.latency_ms = latency_ms
+        self.ttft_ms = ttft_ms
+        self.llm_calls = llm_calls
+        self.error = error
+
+
+class InProcessTarget:
+    """Runs turns against the compiled graph; conversation state is carried by the client."""
+
+    def __init__(self):
+        from orchestration.graph import get as get_graph
+        from orchestration.state import create as create_state
+        self.graph = get_graph()
+        self.create_state = create_state
+        self.states: Dict[str, Dict[str, Any]] = {}
+
+    async def turn(self, thread_id: str, text: str) -> Tuple[Optional[float], Optional[int]]:
+        from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+        state = self.states.get(thread_id) or self.create_state()
+        state["messages"] = state["messages"] + [HumanMessage(content=text)]
+
+        started = time.perf_counter()
+        first_token = None
+        final_state = state
+        async for mode, payload in self.graph.astream(state, stream_mode=["messages", "values"]):
+            if mode == "values":
+                final_state = payload
+            elif first_token is None:
+                message = payload[0]
+                if isinstance(message, (AIMessage, AIMessageChunk)) and message.content:
+                    first_token = (time.perf_counter() - started) * 1000
+        self.states[thread_id] = final_state
+        # LLM calls are counted process-wide, see run_load
+        return first_token, None
+
+    def end(self, thread_id: str) -> None:
+        self.states.pop(thread_id, None)
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpTarget:
+    """Runs turns against the HTTP service, reading its server-sent events."""
+
+    def __init__(self, url: str, timeout: float):
+        import httpx
+        self.url = url.rstrip("/")
+        self.client = httpx.AsyncClient(timeout=timeout)
+
+    async def turn(self, thread_id: str, text: str) -> Tuple[Optional[float], Optional[int]]:
+        started = time.perf_counter()
+        first_token, llm_calls, event = None, None, None
+        async with self.client.stream(
+            "POST", f"{self.url}/conversations/{thread_id}/messages",
+            json={"content": text}, headers={"Accept": "text/event-stream"}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[5:].strip() or "{}")
+                    if event in ("token", "message") and first_token is None and data.get("content"):
+                        first_token = (time.perf_counter() - started) * 1000
+                    elif event == "done":
+                        llm_calls = data.get("llm_calls")
+                    elif event == "error":
+                        raise RuntimeError(data.get("detail", "server error"))
+        return first_token, llm_calls
+
+    def end(self, thread_id: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+async def conversation(target, scenario: str, turns: List[str], length: int, think_ms: float,
+                       rng: random.Random, results: List[TurnResult], deadline: Optional[float]) -> None:
+    thread_id = str(uuid.uuid4())
+    for index in range(length):
+        if deadline and time.perf_counter() >= deadline:
+            break
+        if index and think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+        started = time.perf_counter()
+        try:
+            ttft, llm_calls = await target.turn(thread_id, turns[index % len(turns)])
+            results.append(TurnResult(scenario, (time.perf_counter() - started) * 1000, ttft, llm_calls))
+        except Exception as e:
+            results.append(TurnResult(scenario, (time.perf_counter() - started) * 1000, None, None, str(e)))
+            break
+    target.end(thread_id)
+
+
+async def run_load(target, scenarios: Dict[str, List[str]], mix: Dict[str, float], concurrency: int,
+                   conversations: int, duration: Optional[float], turns: Optional[int], think_ms: float,
+                   seed: int) -> Dict[str, Any]:
+    from core.metrics import metrics
+
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    results: List[TurnResult] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker(conversation_rng: random.Random):
+        async with semaphore:
+            if deadline and time.perf_counter() >= deadline:
+                return
+            scenario = conversation_rng.choices(names, weights)[0]
+            script = scenarios[scenario]
+            await conversation(target, scenario, script, turns or len(script), think_ms,
+                               conversation_rng, results, deadline)
+
+    calls_before = sum(metrics.snapshot().get("llm_calls", {}).values())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(rng.random())) for _ in range(conversations)))
+    elapsed = time.perf_counter() - started
+    calls_in_process = sum(metrics.snapshot().get("llm_calls", {}).values()) - calls_before
+
+    return summarize(results, elapsed, calls_in_process)
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "mean": round(statistics.mean(values), 2) if values else 0.0,
+    }
+
+
+def summarize(results: List[TurnResult], elapsed: float, calls_in_process: float) -> Dict[str, Any]:
+    ok = [r for r in results if r.error is None]
+    reported_calls = [r.llm_calls for r in ok if r.llm_calls is not None]
+    llm_calls = sum(reported_calls) if reported_calls else calls_in_process
+
+    summary = {
+        "turns": len(results),
+        "errors": len(results) - len(ok),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_turns_per_s": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _percentiles([r.latency_ms for r in ok]),
+        "ttft_ms": _percentiles([r.ttft_ms for r in ok if r.ttft_ms is not None]),
+        "llm_calls_per_turn": round(llm_calls / len(ok), 2) if ok else 0.0,
+        "scenarios": {},
+    }
+    for scenario in sorted({r.scenario for r in results}):
+        turns = [r for r in ok if r.scenario == scenario]
+        summary["scenarios"][scenario] = {
+            "turns": len(turns),
+            "latency_ms": _percentiles([r.latency_ms for r in turns]),
+            "ttft_ms": _percentiles([r.ttft_ms for r in turns if r.ttft_ms is not None]),
+        }
+    errors = [r.error for r in results if r.error]
+    if errors:
+        summary["first_errors"] = errors[:5]
+    return summary
+
+
+def print_report(summary: Dict[str, Any], concurrency: int) -> None:
+    latency, ttft = summary["latency_ms"], summary["ttft_ms"]
+    print(f"\n{summary['turns']} turns, {summary['errors']} errors in {summary['elapsed_s']} s "
+          f"at concurrency {concurrency} | {summary['throughput_turns_per_s']} turns/s | "
+          f"{summary['llm_calls_per_turn']} LLM calls/turn")
+    print(f"  turn latency ms  p50 {latency['p50']:>9.2f}  p95 {latency['p95']:>9.2f}  p99 {latency['p99']:>9.2f}")
+    print(f"  TTFT ms          p50 {ttft['p50']:>9.2f}  p95 {ttft['p95']:>9.2f}  p99 {ttft['p99']:>9.2f}")
+    print(f"\n  {'scenario':<22} {'turns':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ttft p50':>9}")
+    for name, row in summary["scenarios"].items():
+        print(f"  {name:<22} {row['turns']:>6} {row['latency_ms']['p50']:>9.2f} {row['latency_ms']['p95']:>9.2f} "
+              f"{row['latency_ms']['p99']:>9.2f} {row['ttft_ms']['p50']:>9.2f}")
+    for error in summary.get("first_errors", []):
+        print(f"  error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the orchestration graph")
+    parser.add_argument("--target", default="inproc", help="'inproc' or the base URL of the HTTP service")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent conversations")
+    parser.add_argument("--conversations", type=int, default=100, help="Total conversations to run")
+    parser.add_argument("--duration", type=float, help="Stop starting turns after this many seconds")
+    parser.add_argument("--mix", help="Scenario weights, e.g. greeting=0.3,appointment_sop=0.3,estimate=0.2,support_escalation=0.2")
+    parser.add_argument("--turns", type=int, help="Turns per conversation (default: the scenario's length)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean think time between turns")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean fake LLM latency (in-process)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Fake LLM latency jitter (in-process)")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="Fake LLM delay per streamed token (in-process)")
+    parser.add_argument("--distribution", default="lognormal", help="fixed, uniform, normal or lognormal")
+    parser.add_argument("--real-llm", action="store_true", help="Use the configured LLM provider instead of the fake model")
+    parser.add_argument("--timeout", type=float, default=120.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for scenario choice and think times")
+    parser.add_argument("--json", help="Write the summary to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application INFO logs")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if not args.real_llm:
+        os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_LATENCY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["FAKE_LLM_TOKEN_LATENCY_MS"] = str(args.token_ms)
+    os.environ["FAKE_LLM_LATENCY_DISTRIBUTION"] = args.distribution
+
+    from core.logger import logger
+    from benchmarks.scenarios import SCENARIOS
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+
+    try:
+        mix = parse_mix(args.mix, SCENARIOS)
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+
+    async def run():
+        target = InProcessTarget() if args.target == "inproc" else HttpTarget(args.target, args.timeout)
+        try:
+            return await run_load(target, SCENARIOS, mix, args.concurrency, args.conversations,
+                                  args.duration, args.turns, args.think_ms, args.seed)
+        finally:
+            await target.close()
+
+    summary = asyncio.run(run())
+    print_report(summary, args.concurrency)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Node Profiler - Per-node wall time and allocations from LangGraph callbacks.
+
+Every graph node run (including nodes of nested sub-graphs and of the
+prebuilt react agents) starts a chain run whose name matches its
+``langgraph_node`` metadata. The profiler times those runs and, when
+tracemalloc is tracing, records the net bytes allocated while each ran.
+"""
+
+import time
+import threading
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from core.telemetry import node_path
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """Collects wall time (ms) and net allocated bytes per graph node."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running: Dict[UUID, tuple] = {}
+        self.wall_ms: Dict[str, List[float]] = defaultdict(list)
+        self.allocated: Dict[str, List[int]] = defaultdict(list)
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *, run_id: UUID,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name")
+        if not name or name != metadata.get("langgraph_node"):
+            return
+        memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        with self._lock:
+            self._running[run_id] = (node_path(name, metadata), time.perf_counter(), memory)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._running.pop(run_id, None)
+        if started is None:
+            return
+        path, start, memory = started
+        elapsed = (time.perf_counter() - start) * 1000
+        allocated = tracemalloc.get_traced_memory()[0] - memory if tracemalloc.is_tracing() else 0
+        with self._lock:
+            self.wall_ms[path].append(elapsed)
+            self.allocated[path].append(allocated)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # Handoffs end a node with ParentCommand; it still ran
+        self._finish(run_id)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._running.clear()
+            self.wall_ms.clear()
+            self.allocated.clear()
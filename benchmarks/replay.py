@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Batch Replay
+
+Re-runs recorded conversations through orchestration.graph.get(), e.g. to
+check a prompt change against thousands of historical conversations.
+
+Input is JSONL. Each line is one conversation: either
+{"id": "...", "messages": [{"role": "user", "content": "..."}, ...]} or a bare
+list of messages, in the format utils.helper.convert_to_langchain_messages
+reads. Lines without an id are named after their line number.
+
+Modes:
+- turns (default): every user message is replayed in order, with the graph's
+  own earlier replies as history.
+- last: the recorded history up to the last user message is sent as one
+  turn, and only the final reply is regenerated.
+
+Conversations run on a pool of --workers. The process pool (default) gives
+each worker process its own compiled graph. The async pool runs them
+concurrently in this process. Each result is appended to --out as one JSON
+line as soon as it finishes: the replies, whether they match the recorded
+ones, latency, LLM calls, tokens and cost. --resume skips conversations
+already in --out that succeeded, so an interrupted run can be continued.
+
+Usage:
+    python -m benchmarks.replay INPUT --out RESULTS [options]
+
+Examples:
+    python -m benchmarks.replay transcripts.jsonl --out replay.jsonl --workers 8
+    python -m benchmarks.replay transcripts.jsonl --out replay.jsonl --resume
+    python -m benchmarks.replay transcripts.jsonl --out replay.jsonl --pool async --mode last --real-llm
+    python -m benchmarks.replay transcripts.jsonl --out replay.jsonl --cassette cassettes/staging.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run import percentile
+
+
+def read_conversations(path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Conversations from a JSONL file as {"id", "messages"}; malformed lines are reported and skipped."""
+    count = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Skipping line {line_number}: not valid JSON", file=sys.stderr)
+                continue
+            if isinstance(record, list):
+                record = {"messages": record}
+            if not isinstance(record, dict) or not isinstance(record.get("messages"), list):
+                print(f"Skipping line {line_number}: no 'messages' list", file=sys.stderr)
+                continue
+            conversation_id = record.get("id") or record.get("conversation_id") or record.get("thread_id")
+            yield {"id": str(conversation_id or f"line-{line_number}"), "messages": record["messages"]}
+            count += 1
+            if limit and count >= limit:
+                return
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids of conversations that already replayed successfully in a results file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if isinstance(result, dict) and result.get("status") == "ok":
+                done.add(result.get("id"))
+    return done
+
+
+#
+# Replaying one conversation (runs inside a pool worker)
+#
+_graph = None
+
+def _get_graph():
+    global _graph
+    if _graph is None:
+        from orchestration.graph import get as get_graph
+        _graph = get_graph()
+    return _graph
+
+
+def _turns(messages: List[Dict[str, Any]], mode: str) -> List[Dict[str, Any]]:
+    """Turns to replay: the user message, the history sent with it, and the recorded reply."""
+    from utils.helper import convert_to_langchain_messages
+
+    turns = []
+    for index, message in enumerate(messages):
+        if message.get("role", "user") != "user":
+            continue
+        following = next((m for m in messages[index + 1:] if m.get("role") in ("user", "assistant", "ai")), None)
+        expected = following.get("content") if following and following.get("role") != "user" else None
+        turns.append({
+            "user": message.get("content", ""),
+            "history": convert_to_langchain_messages(messages[:index]) if mode == "last" else None,
+            "expected": expected,
+        })
+    return turns[-1:] if mode == "last" else turns
+
+
+def _turn_input(state: Optional[Dict[str, Any]], turn: Dict[str, Any]) -> Dict[str, Any]:
+    from langchain_core.messages import HumanMessage
+    from orchestration.state import create as create_state
+
+    if state is None or turn["history"] is not None:
+        state = create_state()
+        state["messages"] = list(turn["history"] or [])
+    state["messages"] = state["messages"] + [HumanMessage(content=turn["user"])]
+    return state
+
+
+def _turn_result(turn: Dict[str, Any], state: Dict[str, Any], latency_ms: float) -> Dict[str, Any]:
+    from orchestration.nodes import reply_agent
+    from utils.helper import get_message_content
+
+    reply = next((m for m in reversed(state.get("messages", [])) if getattr(m, "type", None) == "ai" and get_message_content(m)), None)
+    reply_text = get_message_content(reply) if reply is not None else ""
+    usage = (state.get("metadata") or {}).get("ledger", {}).get("last_turn", {})
+    return {
+        "user": turn["user"],
+        "reply": reply_text,
+        "expected": turn["expected"],
+        "matches_expected": None if turn["expected"] is None else reply_text.strip() == str(turn["expected"]).strip(),
+        "agent": reply_agent(reply),
+        "latency_ms": round(latency_ms, 1),
+        "llm_calls": usage.get("llm_calls", 0),
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "cost_usd": usage.get("cost_usd", 0.0),
+        "hops": usage.get("hops", 0),
+    }
+
+
+def _conversation_result(conversation: Dict[str, Any], turns: List[Dict[str, Any]], started: float,
+                         error: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": conversation["id"],
+        "status": "error" if error else "ok",
+        "error": error,
+        "turns": turns,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "llm_calls": sum(turn["llm_calls"] for turn in turns),
+        "tokens": sum(turn["prompt_tokens"] + turn["completion_tokens"] for turn in turns),
+        "cost_usd": round(sum(turn["cost_usd"] for turn in turns), 6),
+        "hops": sum(turn["hops"] for turn in turns),
+    }
+
+
+def replay_conversation(conversation: Dict[str, Any], mode: str = "turns") -> Dict[str, Any]:
+    """Replay one conversation synchronously; errors are reported in the result, never raised."""
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    try:
+        graph, state = _get_graph(), None
+        for turn in _turns(conversation["messages"], mode):
+            turn_started = time.perf_counter()
+            state = graph.invoke(_turn_input(state, turn))
+            results.append(_turn_result(turn, state, (time.perf_counter() - turn_started) * 1000))
+        return _conversation_result(conversation, results, started, None)
+    except Exception as e:
+        return _conversation_result(conversation, results, started, f"{type(e).__name__}: {str(e)}")
+
+
+async def areplay_conversation(conversation: Dict[str, Any], mode: str = "turns") -> Dict[str, Any]:
+    """Async variant of replay_conversation for the in-process pool."""
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    try:
+        graph, state = _get_graph(), None
+        for turn in _turns(conversation["messages"], mode):
+            turn_started = time.perf_counter()
+            state = await graph.ainvoke(_turn_input(state, turn))
+            results.append(_turn_result(turn, state, (time.perf_counter() - turn_started) * 1000))
+        return _conversation_result(conversation, results, started, None)
+    except Exception as e:
+        return _conversation_result(conversation, results, started, f"{type(e).__name__}: {str(e)}")
+
+
+def _init_worker(verbose: bool) -> None:
+    from core.logger import logger
+    if not verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+    # Compile the graph and build clients once per worker, before its first conversation
+    from orchestration.warmup import warmup
+    warmup()
+    _get_graph()
+
+
+#
+# Pools
+#
+class ResultWriter:
+    """Appends results to the output file as they arrive and keeps running totals."""
+
+    def __init__(self, path: str, resume: bool):
+        mode = "a" if resume else "w"
+        if resume and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                needs_newline = file.read(1) != b"\n"
+        else:
+            needs_newline = False
+        self.file = open(path, mode, encoding="utf-8")
+        if needs_newline:
+            self.file.write("\n")
+        self.results: List[Dict[str, Any]] = []
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self.file.write(json.dumps(result, default=str) + "\n")
+        self.file.flush()
+        # Only the metrics are kept in memory
+        self.results.append({key: value for key, value in result.items() if key != "turns"} | {
+            "turn_latency_ms": [turn["latency_ms"] for turn in result["turns"]],
+            "mismatches": sum(1 for turn in result["turns"] if turn["matches_expected"] is False),
+        })
+        done = len(self.results)
+        if done % 50 == 0:
+            errors = sum(1 for r in self.results if r["status"] != "ok")
+            print(f"  {done} conversations replayed ({errors} errors)", file=sys.stderr)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def run_process_pool(conversations: Iterator[Dict[str, Any]], writer: ResultWriter, workers: int, mode: str,
+                     verbose: bool) -> None:
+    # Spawned workers start clean instead of inheriting the parent's logger threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(verbose,)) as pool:
+        pending = set()
+        for conversation in conversations:
+            # Keep a bounded window of submitted conversations so large inputs stream through
+            if len(pending) >= workers * 4:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    writer.write(future.result())
+            pending.add(pool.submit(replay_conversation, conversation, mode))
+        for future in wait(pending).done:
+            writer.write(future.result())
+
+
+async def run_async_pool(conversations: Iterator[Dict[str, Any]], writer: ResultWriter, workers: int, mode: str) -> None:
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=workers * 4)
+
+    async def worker():
+        while True:
+            conversation = await queue.get()
+            if conversation is None:
+                return
+            writer.write(await areplay_conversation(conversation, mode))
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    for conversation in conversations:
+        await queue.put(conversation)
+    for _ in tasks:
+        await queue.put(None)
+    await asyncio.gather(*tasks)
+
+
+def summarize(results: List[Dict[str, Any]], skipped: int, elapsed: float) -> Dict[str, Any]:
+    ok = [r for r in results if r["status"] == "ok"]
+    turn_latency = [ms for r in ok for ms in r["turn_latency_ms"]]
+    return {
+        "conversations": len(results),
+        "ok": len(ok),
+        "errors": len(results) - len(ok),
+        "skipped": skipped,
+        "turns": len(turn_latency),
+        "mismatched_turns": sum(r["mismatches"] for r in ok),
+        "turn_mean_ms": round(statistics.mean(turn_latency), 1) if turn_latency else 0.0,
+        "turn_p50_ms": round(percentile(turn_latency, 50), 1),
+        "turn_p95_ms": round(percentile(turn_latency, 95), 1),
+        "turn_p99_ms": round(percentile(turn_latency, 99), 1),
+        "llm_calls": sum(r["llm_calls"] for r in results),
+        "tokens": sum(r["tokens"] for r in results),
+        "cost_usd": round(sum(r["cost_usd"] for r in results), 4),
+        "hops": sum(r["hops"] for r in results),
+        "elapsed_s": round(elapsed, 2),
+        "conversations_per_s": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    print(f"\nReplayed {summary['conversations']} conversations ({summary['ok']} ok, {summary['errors']} errors, "
+          f"{summary['skipped']} skipped) in {summary['elapsed_s']:.1f} s | {summary['conversations_per_s']} conv/s")
+    print(f"  turns: {summary['turns']} | mean {summary['turn_mean_ms']:.1f} ms | p50 {summary['turn_p50_ms']:.1f} | "
+          f"p95 {summary['turn_p95_ms']:.1f} | p99 {summary['turn_p99_ms']:.1f}")
+    print(f"  replies differing from the recording: {summary['mismatched_turns']}")
+    print(f"  {summary['llm_calls']} LLM calls | {summary['tokens']:,} tokens | ${summary['cost_usd']:.4f} | "
+          f"{summary['hops']} handoff hops")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded conversations through the orchestration graph")
+    parser.add_argument("input", help="JSONL file with one conversation per line")
+    parser.add_argument("--out", required=True, help="JSONL file the results are appended to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Conversations replayed at once")
+    parser.add_argument("--pool", default="process", choices=["process", "async"], help="Worker processes or asyncio tasks")
+    parser.add_argument("--mode", default="turns", choices=["turns", "last"], help="Replay every user turn or only the last one")
+    parser.add_argument("--resume", action="store_true", help="Skip conversations already replayed successfully in --out")
+    parser.add_argument("--limit", type=int, help="Replay at most this many conversations")
+    parser.add_argument("--real-llm", action="store_true", help="Use the configured LLM provider instead of the fake model")
+    parser.add_argument("--cassette", help="Replay LLM responses from this cassette (uses the OpenAI client)")
+    parser.add_argument("--json", help="Write the summary to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application INFO logs")
+    args = parser.parse_args()
+
+    # .env no longer loads as an import side effect; options below override it
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Set before the pool starts: worker processes inherit the environment
+    if args.cassette:
+        os.environ["LLM_PROVIDER"] = "openai"
+        os.environ["LLM_CASSETTE_MODE"] = "replay"
+        os.environ["LLM_CASSETTE_PATH"] = args.cassette
+    elif not args.real_llm:
+        os.environ["LLM_PROVIDER"] = "fake"
+
+    if not os.path.exists(args.input):
+        print(f"Input not found: {args.input}")
+        sys.exit(1)
+
+    done = completed_ids(args.out) if args.resume else set()
+    skipped = 0
+
+    def pending_conversations() -> Iterator[Dict[str, Any]]:
+        nonlocal skipped
+        for conversation in read_conversations(args.input, args.limit):
+            if conversation["id"] in done:
+                skipped += 1
+                continue
+            yield conversation
+
+    writer = ResultWriter(args.out, args.resume)
+    started = time.perf_counter()
+    try:
+        if args.pool == "process":
+            run_process_pool(pending_conversations(), writer, args.workers, args.mode, args.verbose)
+        else:
+            _init_worker(args.verbose)
+            asyncio.run(run_async_pool(pending_conversations(), writer, args.workers, args.mode))
+    except KeyboardInterrupt:
+        print("\nInterrupted; continue with --resume", file=sys.stderr)
+    finally:
+        writer.close()
+
+    summary = summarize(writer.results, skipped, time.perf_counter() - started)
+    print_report(summary)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        print(f"\nSummary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Orchestration Benchmarks
+
+Drives orchestration.graph.get_persistent() through the scenarios in
+benchmarks.scenarios with the fake model (or a recorded LLM cassette) and
+reports per-scenario and per-node wall time, plus net allocations per node
+when --memory is given. Exits with an error when a scenario did not reach the
+nodes it is meant to exercise (benchmarks.scenarios.EXPECTED_NODES).
+
+Usage:
+    python -m benchmarks.run [options]
+
+Examples:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario appointment_sop --iterations 50 --memory
+    python -m benchmarks.run --latency-ms 300 --jitter-ms 100 --distribution lognormal
+    python -m benchmarks.run --json bench_results.json
+    python -m benchmarks.run --cassette cassettes/staging.jsonl --cassette-mode record   # needs OPENAI_API_KEY
+    python -m benchmarks.run --cassette cassettes/staging.jsonl                          # offline replay
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import statistics
+import tracemalloc
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_scenario(graph, turns: List[str], profiler) -> float:
+    """
+    Run one conversation turn by turn on the checkpointed graph, as the entry
+    points do (answers to SOP questions resume the paused run); returns total
+    wall time in ms.
+    """
+    from langchain_core.messages import HumanMessage
+    from langgraph.types import Command
+    from orchestration.graph import get_checkpointer
+    from orchestration.state import create as create_state
+
+    config = {"configurable": {"thread_id": f"bench-{uuid.uuid4().hex}"}, "callbacks": [profiler]}
+    started = time.perf_counter()
+    for index, text in enumerate(turns):
+        if index == 0:
+            turn_input: Any = create_state()
+            turn_input["messages"] = [HumanMessage(content=text)]
+        elif graph.get_state(config).interrupts:
+            turn_input = Command(resume=text)
+        else:
+            turn_input = {"messages": [HumanMessage(content=text)]}
+        graph.invoke(turn_input, config=config)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    get_checkpointer().delete_thread(config["configurable"]["thread_id"])
+    return elapsed_ms
+
+
+def summarize(profiler, scenario_ms: List[float], llm_calls: float, turns: int, iterations: int) -> Dict[str, Any]:
+    nodes = {}
+    for path, samples in sorted(profiler.wall_ms.items()):
+        allocated = profiler.allocated.get(path, [])
+        nodes[path] = {
+            "calls_per_iteration": round(len(samples) / iterations, 2),
+            "mean_ms": round(statistics.mean(samples), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "total_ms": round(sum(samples), 3),
+            "mean_allocated_kb": round(statistics.mean(allocated) / 1024, 1) if allocated else 0.0,
+        }
+    return {
+        "turns": turns,
+        "iterations": iterations,
+        "mean_ms": round(statistics.mean(scenario_ms), 3),
+        "p50_ms": round(percentile(scenario_ms, 50), 3),
+        "p95_ms": round(percentile(scenario_ms, 95), 3),
+        "mean_turn_ms": round(statistics.mean(scenario_ms) / turns, 3),
+        "llm_calls_per_iteration": round(llm_calls / iterations, 2),
+        "nodes": nodes,
+    }
+
+
+def print_report(results: Dict[str, Dict[str, Any]], memory: bool) -> None:
+    for name, result in results.items():
+        print(f"\n{name}: {result['turns']} turns x {result['iterations']} iterations | "
+              f"mean {result['mean_ms']:.2f} ms (p50 {result['p50_ms']:.2f}, p95 {result['p95_ms']:.2f}) | "
+              f"{result['mean_turn_ms']:.2f} ms/turn | {result['llm_calls_per_iteration']} LLM calls")
+        header = f"  {'node':<36} {'calls':>6} {'mean ms':>9} {'p95 ms':>9} {'total ms':>10}"
+        print(header + (f" {'alloc KB':>9}" if memory else ""))
+        for path, node in sorted(result["nodes"].items(), key=lambda item: -item[1]["total_ms"]):
+            line = (f"  {path:<36} {node['calls_per_iteration']:>6} {node['mean_ms']:>9.3f} "
+                    f"{node['p95_ms']:>9.3f} {node['total_ms']:>10.2f}")
+            print(line + (f" {node['mean_allocated_kb']:>9.1f}" if memory else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the orchestration graph offline with the fake model")
+    parser.add_argument("--scenario", default="all", help="Scenario name or 'all'")
+    parser.add_argument("--iterations", type=int, default=20, help="Measured iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured iterations per scenario")
+    parser.add_argument("--memory", action="store_true", help="Trace allocations per node (slower)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean fake LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Fake LLM latency jitter")
+    parser.add_argument("--distribution", default="fixed", help="fixed, uniform, normal or lognormal")
+    parser.add_argument("--cassette", help="Record to / replay from this LLM cassette (uses the OpenAI client)")
+    parser.add_argument("--cassette-mode", default="replay", choices=["replay", "record"], help="Cassette mode")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application INFO logs")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.cassette:
+        os.environ["LLM_PROVIDER"] = "openai"
+        os.environ["LLM_CASSETTE_MODE"] = args.cassette_mode
+        os.environ["LLM_CASSETTE_PATH"] = args.cassette
+    else:
+        os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_LATENCY_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["FAKE_LLM_LATENCY_DISTRIBUTION"] = args.distribution
+
+    from core.logger import logger
+    from core.metrics import metrics
+    from orchestration.graph import get_persistent
+    from benchmarks.scenarios import SCENARIOS, EXPECTED_NODES
+    from benchmarks.node_profiler import NodeProfiler
+    from utils.llm_cassette import get_cassette
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+
+    if args.scenario != "all" and args.scenario not in SCENARIOS:
+        print(f"Unknown scenario '{args.scenario}'. Available: {', '.join(SCENARIOS)}")
+        sys.exit(1)
+    selected = SCENARIOS if args.scenario == "all" else {args.scenario: SCENARIOS[args.scenario]}
+
+    graph = get_persistent()
+    results = {}
+    missed = {}
+    for name, turns in selected.items():
+        profiler = NodeProfiler()
+        for _ in range(args.warmup):
+            run_scenario(graph, turns, profiler)
+        profiler.reset()
+        metrics.reset()
+
+        if args.memory:
+            tracemalloc.start()
+        scenario_ms = [run_scenario(graph, turns, profiler) for _ in range(args.iterations)]
+        if args.memory:
+            tracemalloc.stop()
+
+        llm_calls = sum(metrics.snapshot().get("llm_calls", {}).values())
+        results[name] = summarize(profiler, scenario_ms, llm_calls, len(turns), args.iterations)
+        missing = [path for path in EXPECTED_NODES.get(name, []) if path not in profiler.wall_ms]
+        if missing:
+            missed[name] = missing
+
+    print_report(results, args.memory)
+
+    # A scenario that never reached the nodes it exists for measured the wrong path
+    if missed:
+        for name, missing in missed.items():
+            print(f"\nScenario {name} never ran: {', '.join(missing)}")
+        sys.exit(1)
+
+    # Replayed numbers are only meaningful if every request was on the cassette
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        cassette.assert_no_misses()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
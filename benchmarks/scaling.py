@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Conversation-Length Scaling Benchmark
+
+Runs one turn through orchestration.graph.get() on top of synthetic histories
+of increasing length (10 to 2000 messages by default) with the fake model, and
+measures per-turn CPU time, peak allocated bytes (tracemalloc) and prompt
+tokens sent to the LLM. format_conversation_history (the SOP collector's
+history rendering) is measured on its own as well.
+
+Growth is checked with a log-log fit of each metric against history length
+over the longer histories: a slope of 1 is linear. With --check the script
+exits non-zero when any slope exceeds --max-slope.
+
+Usage:
+    python -m benchmarks.scaling [options]
+
+Examples:
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --turn appointment --lengths 10,100,1000 --repeat 5
+    python -m benchmarks.scaling --check --max-slope 1.2 --csv scaling.csv
+"""
+
+import os
+import sys
+import csv
+import math
+import time
+import argparse
+import statistics
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_LENGTHS = [10, 50, 100, 250, 500, 1000, 2000]
+
+# Latest user message of the measured turn
+TURNS = {
+    "support": "It's still not working after the visit, please escalate my ticket",
+    "appointment": "I want to book a lawn care appointment",
+    "estimate": "How much would pest control cost at 42 Oak Street?",
+    "general": "Thanks, can you tell me a bit more about your company?",
+}
+
+# A support call that repeats until the history is long enough
+HISTORY_CYCLE = [
+    ("human", "Hi, my sprinkler system stopped working after your team serviced the lawn last week."),
+    ("ai", "I'm sorry to hear that! Let me open a support ticket so our technicians can take a look."),
+    ("tool", ("create_support_ticket", {"issue": "Sprinkler system stopped working", "priority": "medium"},
+              "Support ticket created for Sprinkler system stopped working with priority medium. Ticket ID: SUP-20250101120000")),
+    ("ai", "I've created ticket SUP-20250101120000 for you. Is the controller showing any error lights?"),
+    ("human", "Yes, the red light is blinking and zone 3 doesn't turn on at all."),
+    ("ai", "Thanks for checking. A blinking red light usually points to a wiring fault on that zone. Can you confirm the address?"),
+    ("human", "It's 42 Oak Street. I also noticed the grass near the driveway is drying out."),
+    ("ai", "Got it, 42 Oak Street. I've added the dry patch near the driveway to the ticket notes."),
+]
+
+
+def build_history(length: int, turn: str) -> List[Any]:
+    """Synthetic history of exactly `length` messages ending with the measured user turn."""
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    messages: List[Any] = []
+    index = 0
+    while len(messages) < length - 1:
+        kind, payload = HISTORY_CYCLE[index % len(HISTORY_CYCLE)]
+        if kind == "human":
+            messages.append(HumanMessage(content=payload))
+        elif kind == "ai":
+            messages.append(AIMessage(content=payload))
+        elif len(messages) < length - 2:
+            # Tool call and its result always come as a pair
+            name, args, result = payload
+            call_id = f"call_history_{index}"
+            messages.append(AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": call_id, "type": "tool_call"}]))
+            messages.append(ToolMessage(content=result, tool_call_id=call_id, name=name))
+        index += 1
+    messages.append(HumanMessage(content=turn))
+    return messages
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median CPU ms, wall ms and peak allocated bytes of fn over `repeat` runs."""
+    cpu, wall, peak = [], [], []
+    for _ in range(repeat):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        fn()
+        cpu.append((time.process_time() - cpu_start) * 1000)
+        wall.append((time.perf_counter() - wall_start) * 1000)
+        peak.append(tracemalloc.get_traced_memory()[1] - baseline)
+    return {
+        "cpu_ms": statistics.median(cpu),
+        "wall_ms": statistics.median(wall),
+        "peak_bytes": statistics.median(peak),
+    }
+
+
+def loglog_slope(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of log(y) against log(x)."""
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = statistics.mean(x for x, _ in points)
+    mean_y = statistics.mean(y for _, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator if denominator else 0.0
+
+
+def bar(value: float, maximum: float, width: int = 30) -> str:
+    return "#" * max(1, round(width * value / maximum)) if maximum else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how turn cost grows with conversation length")
+    parser.add_argument("--turn", default="support", choices=sorted(TURNS), help="Kind of turn to measure")
+    parser.add_argument("--lengths", default=",".join(str(n) for n in DEFAULT_LENGTHS), help="History lengths in messages")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per length (median is reported)")
+    parser.add_argument("--fit-from", type=int, default=100, help="Fit growth on lengths >= this")
+    parser.add_argument("--max-slope", type=float, default=1.25, help="Largest accepted log-log slope")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if growth is super-linear")
+    parser.add_argument("--csv", help="Write the measurements to this CSV file")
+    parser.add_argument("--verbose", action="store_true", help="Keep application INFO logs")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = "0"
+
+    from core.logger import logger
+    from core.metrics import metrics
+    from orchestration.graph import get as get_graph
+    from orchestration.state import create as create_state
+    from utils.helper import format_conversation_history
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+
+    lengths = sorted(int(n) for n in args.lengths.split(","))
+    graph = get_graph()
+    turn = TURNS[args.turn]
+
+    def graph_turn(history: List[Any]) -> Callable[[], Any]:
+        def run():
+            state = create_state()
+            state["messages"] = list(history)
+            return graph.invoke(state)
+        return run
+
+    # Warm up imports, prompt templates and compiled graphs
+    graph_turn(build_history(10, turn))()
+
+    rows = []
+    tracemalloc.start()
+    try:
+        for length in lengths:
+            history = build_history(length, turn)
+            tokens_before = sum(metrics.snapshot().get("llm_prompt_tokens", {}).values())
+            calls_before = sum(metrics.snapshot().get("llm_calls", {}).values())
+            turn_stats = measure(graph_turn(history), args.repeat)
+            prompt_tokens = (sum(metrics.snapshot().get("llm_prompt_tokens", {}).values()) - tokens_before) / args.repeat
+            llm_calls = (sum(metrics.snapshot().get("llm_calls", {}).values()) - calls_before) / args.repeat
+
+            format_stats = measure(lambda: format_conversation_history(history), args.repeat)
+
+            rows.append({
+                "messages": length,
+                "turn_cpu_ms": round(turn_stats["cpu_ms"], 3),
+                "turn_wall_ms": round(turn_stats["wall_ms"], 3),
+                "turn_peak_kb": round(turn_stats["peak_bytes"] / 1024, 1),
+                "prompt_tokens": round(prompt_tokens),
+                "llm_calls": round(llm_calls, 1),
+                "format_history_ms": round(format_stats["cpu_ms"], 3),
+            })
+    finally:
+        tracemalloc.stop()
+
+    print(f"\nTurn: {args.turn!r} ({args.repeat} runs per length, medians)\n")
+    print(f"{'messages':>9} {'cpu ms':>10} {'wall ms':>10} {'peak KB':>10} {'prompt tok':>11} {'calls':>6} {'format ms':>10}")
+    for row in rows:
+        print(f"{row['messages']:>9} {row['turn_cpu_ms']:>10.2f} {row['turn_wall_ms']:>10.2f} {row['turn_peak_kb']:>10.1f} "
+              f"{row['prompt_tokens']:>11} {row['llm_calls']:>6} {row['format_history_ms']:>10.3f}")
+
+    checked = ["turn_cpu_ms", "turn_peak_kb", "prompt_tokens", "format_history_ms"]
+    for metric in ("turn_cpu_ms", "turn_peak_kb", "prompt_tokens"):
+        maximum = max(row[metric] for row in rows)
+        print(f"\n{metric}")
+        for row in rows:
+            print(f"  {row['messages']:>6} | {bar(row[metric], maximum):<30} {row[metric]}")
+
+    fitted = [row for row in rows if row["messages"] >= args.fit_from] or rows
+    print(f"\nGrowth (log-log slope over {len(fitted)} lengths >= {fitted[0]['messages']}; 1.0 = linear):")
+    failures = []
+    for metric in checked:
+        slope = loglog_slope([(row["messages"], row[metric]) for row in fitted])
+        verdict = "ok" if slope <= args.max_slope else "SUPER-LINEAR"
+        if verdict != "ok":
+            failures.append(metric)
+        print(f"  {metric:<20} {slope:>6.2f}  {verdict}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nMeasurements written to {args.csv}")
+
+    if args.check and failures:
+        print(f"\nFAILED: super-linear growth in {', '.join(failures)} (max slope {args.max_slope})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
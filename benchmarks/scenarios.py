@@ -0,0 +1,36 @@
+"""
+Representative conversations used by the benchmarks.
+
+Each scenario is a list of user turns; turns of a scenario share one
+conversation, so the appointment scenario walks the full SOP. EXPECTED_NODES
+lists the node paths each scenario must reach for its numbers to mean anything.
+"""
+
+from typing import Dict, List
+
+SCENARIOS: Dict[str, List[str]] = {
+    "greeting": [
+        "Hello!",
+        "Thanks, bye!",
+    ],
+    "appointment_sop": [
+        "I want to book a lawn mowing appointment",
+        "Tomorrow at 10am works for me",
+        "The address is 42 Oak Street",
+        "You can reach me at 555-123-4567",
+    ],
+    "estimate": [
+        "How much would lawn care cost at 12 Elm Road?",
+    ],
+    "support_escalation": [
+        "My lawn mower is broken after your last visit",
+        "This is urgent, please escalate the ticket",
+    ],
+}
+
+EXPECTED_NODES: Dict[str, List[str]] = {
+    "greeting": ["small_talk"],
+    "appointment_sop": ["appointment/sop_collector", "appointment/booking_agent", "appointment/booking_tools"],
+    "estimate": ["estimate/tools"],
+    "support_escalation": ["support/tools"],
+}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Measures the cold-start cost of each entry point, each run in a fresh
+interpreter with the fake model:
+
+- process: wall time from spawning the interpreter until it exits
+- import: importing the entry point's module
+- warmup: orchestration.warmup.warmup() (skipped with --no-warmup)
+- first turn / second turn: an estimate request through orchestration.graph.get()
+
+Running once with and once without --no-warmup shows how much of the first
+turn's latency the warm-up moves to startup.
+
+Usage:
+    python -m benchmarks.startup [options]
+
+Examples:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --entry server --runs 10
+    python -m benchmarks.startup --no-warmup --json startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+import importlib.util
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> module whose import is measured
+ENTRY_POINTS = {
+    "orchestration": "orchestration.graph",
+    "console": "main",
+    "server": "server.app",
+    "streamlit": "streamlit_app",
+}
+
+# Packages an entry point needs beyond the base requirements
+OPTIONAL_REQUIREMENTS = {
+    "streamlit": "streamlit",
+}
+
+TURN = "How much would pest control cost for a 2000 sq ft house at 42 Oak Street?"
+
+PROBE = """
+import sys, json, time, importlib
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+result = {"import_ms": (imported - started) * 1000, "modules": len(sys.modules), "warmup_ms": 0.0}
+
+from core.logger import logger
+logger.remove()
+if sys.argv[3] == "1":
+    from orchestration.warmup import warmup
+    stages = warmup()
+    result["warmup_ms"] = (time.perf_counter() - imported) * 1000
+    result["warmup_stages"] = stages
+
+from langchain_core.messages import HumanMessage
+from orchestration.graph import get
+from orchestration.state import create
+for name in ("first_turn_ms", "second_turn_ms"):
+    state = create()
+    state["messages"] = [HumanMessage(content=sys.argv[4])]
+    turn_started = time.perf_counter()
+    get().invoke(state)
+    result[name] = (time.perf_counter() - turn_started) * 1000
+
+with open(sys.argv[2], "w", encoding="utf-8") as file:
+    json.dump(result, file)
+"""
+
+
+def probe(module: str, warm: bool) -> Dict[str, Any]:
+    """Run one cold start of an entry point in a fresh interpreter."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        output = handle.name
+    env = {**os.environ, "LLM_PROVIDER": "fake", "FAKE_LLM_LATENCY_MS": "0", "FAKE_LLM_TOKEN_LATENCY_MS": "0"}
+    try:
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE, module, output, "1" if warm else "0", TURN],
+            cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        process_ms = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "probe failed")
+        with open(output, "r", encoding="utf-8") as file:
+            result = json.load(file)
+        result["process_ms"] = process_ms
+        return result
+    finally:
+        os.unlink(output)
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    fields = ["process_ms", "import_ms", "warmup_ms", "first_turn_ms", "second_turn_ms"]
+    summary = {field: round(statistics.median(run[field] for run in runs), 1) for field in fields}
+    summary["modules"] = runs[-1]["modules"]
+    if runs[-1].get("warmup_stages"):
+        summary["warmup_stages"] = {
+            stage: round(statistics.median(run["warmup_stages"][stage] for run in runs), 1)
+            for stage in runs[-1]["warmup_stages"]
+        }
+    return summary
+
+
+def print_report(results: Dict[str, Dict[str, Any]], runs: int, warm: bool) -> None:
+    print(f"\nCold start, median of {runs} runs ({'with' if warm else 'without'} warm-up, fake model)")
+    print(f"  {'entry point':<14} {'process':>9} {'import':>9} {'warmup':>9} {'1st turn':>9} {'2nd turn':>9} {'modules':>8}")
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"  {name:<14} skipped: {result['skipped']}")
+            continue
+        print(f"  {name:<14} {result['process_ms']:>9.1f} {result['import_ms']:>9.1f} {result['warmup_ms']:>9.1f} "
+              f"{result['first_turn_ms']:>9.1f} {result['second_turn_ms']:>9.1f} {result['modules']:>8}")
+    stages = next((r["warmup_stages"] for r in results.values() if r.get("warmup_stages")), None)
+    if stages:
+        print("  warm-up stages (ms): " + ", ".join(f"{stage} {ms:.1f}" for stage, ms in stages.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start cost per entry point")
+    parser.add_argument("--entry", default="all", help=f"Entry point ({', '.join(ENTRY_POINTS)}) or 'all'")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per entry point")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip warmup() before the first turn")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.entry != "all" and args.entry not in ENTRY_POINTS:
+        print(f"Unknown entry point '{args.entry}'. Available: {', '.join(ENTRY_POINTS)}")
+        sys.exit(1)
+    selected = ENTRY_POINTS if args.entry == "all" else {args.entry: ENTRY_POINTS[args.entry]}
+
+    warm = not args.no_warmup
+    results = {}
+    for name, module in selected.items():
+        requirement = OPTIONAL_REQUIREMENTS.get(name)
+        if requirement and importlib.util.find_spec(requirement) is None:
+            results[name] = {"skipped": f"{requirement} is not installed"}
+            continue
+        try:
+            results[name] = summarize([probe(module, warm) for _ in range(args.runs)])
+        except RuntimeError as e:
+            results[name] = {"skipped": str(e)}
+
+    print_report(results, args.runs, warm)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,92 @@
 import os
 import sys
+import random
 from pathlib import Path
 from loguru import logger
 import logging
 from functools import wraps
 import time
+from typing import Any, Dict
 
-logs_dir = Path("logs")
-logs_dir.mkdir(exist_ok=True)
+# Logging profile: "development" keeps the verbose defaults; "production" writes
+# structured JSON, disables variable-value tracebacks and drops debug dumps
+LOG_PROFILE = os.getenv("LOG_PROFILE", "development").lower()
+IS_PRODUCTION = LOG_PROFILE == "production"
+
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if IS_PRODUCTION else "text").lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_DIAGNOSE = os.getenv("LOG_DIAGNOSE", "false" if IS_PRODUCTION else "true").lower() == "true"
+LOG_DEBUG_DUMPS = os.getenv("LOG_DEBUG_DUMPS", "false" if IS_PRODUCTION else "true").lower() == "true"
+LOG_PREVIEW_CHARS = int(os.getenv("LOG_PREVIEW_CHARS", "300" if IS_PRODUCTION else "2000"))
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for part in value.split(","):
+        category, _, rate = part.partition("=")
+        if category.strip() and rate.strip():
+            rates[category.strip()] = float(rate)
+    return rates
+
+# Per-category sampling, e.g. "routing=0.05,sop=0.01"; "*" sets the default
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+# Log files are only created once an entry point calls enable_file_logging()
+logs_dir = Path(os.getenv("LOG_DIR", "logs"))
 
 logger.remove()
 
-logger.add(
-    sys.stdout,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan> - <level>{message}</level>",
-    level="INFO",
-    colorize=True,
-    filter=lambda record: record["level"].name in ["INFO", "WARNING", "ERROR"] and not record["message"].startswith("Processing")
-)
-
-logger.add(
-    "logs/application.log",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="INFO",
-    rotation="50 MB",
-    retention="3 days",
-    compression=None,
-    backtrace=True,
-    diagnose=True,
-    enqueue=True
-)
-
-logger.add(
-    "logs/errors.log",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="ERROR",
-    rotation="10 MB",
-    retention="7 days",
-    compression=None,
-    backtrace=True,
-    diagnose=True,
-    enqueue=True
-)
+CONSOLE_FORMAT = "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan> - <level>{message}</level>"
+
+def _add_console_sink(levels) -> int:
+    return logger.add(
+        sys.stdout,
+        format=CONSOLE_FORMAT,
+        level="INFO",
+        colorize=not IS_PRODUCTION,
+        filter=lambda record: record["level"].name in levels and not record["message"].startswith("Processing")
+    )
+
+_console_sink = _add_console_sink(["INFO", "WARNING", "ERROR"])
+
+
+def set_console_level(level: str) -> None:
+    """Only show records from level up on the console (e.g. WARNING in interactive tools); files are unaffected."""
+    global _console_sink
+    levels = ["INFO", "WARNING", "ERROR"]
+    logger.remove(_console_sink)
+    _console_sink = _add_console_sink(levels[levels.index(level.upper()):] if level.upper() in levels else levels)
+
+_file_sinks = []
+
+def enable_file_logging() -> None:
+    """Add the application and error log files under LOG_DIR (idempotent)."""
+    if _file_sinks:
+        return
+    _file_sinks.append(logger.add(
+        logs_dir / "application.log",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        level=LOG_LEVEL,
+        serialize=LOG_FORMAT == "json",
+        rotation="50 MB",
+        retention="3 days",
+        compression=None,
+        backtrace=True,
+        diagnose=LOG_DIAGNOSE,
+        enqueue=True
+    ))
+    _file_sinks.append(logger.add(
+        logs_dir / "errors.log",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        level="ERROR",
+        serialize=LOG_FORMAT == "json",
+        rotation="10 MB",
+        retention="7 days",
+        compression=None,
+        backtrace=True,
+        diagnose=LOG_DIAGNOSE,
+        enqueue=True
+    ))
 
 class InterceptHandler(logging.Handler):
     def emit(self, record):
@@ -59,4 +104,86 @@ class InterceptHandler(logging.Handler):
 
 logging.basicConfig(handlers=[InterceptHandler()], level=logging.INFO, force=True)
 
-logger.info("Logging system initialized")
+
+#
+# Cheap logging helpers for the hot path
+#
+def _summarize(value: Any, limit: int) -> str:
+    """Bounded-work text for a value: only as much of it is visited as fits in limit."""
+    if isinstance(value, str):
+        return value if len(value) <= limit else f"{value[:limit]}... (+{len(value) - limit} chars)"
+
+    if hasattr(value, "type") and hasattr(value, "content"):
+        return f"{value.type}: {_summarize(str(value.content), max(limit - len(value.type) - 2, 0))}"
+
+    if isinstance(value, (list, tuple)):
+        parts, used = [], 0
+        for item in value:
+            if used >= limit:
+                break
+            text = _summarize(item, limit - used)
+            parts.append(text)
+            used += len(text) + 2
+        more = f", ... (+{len(value) - len(parts)} items)" if len(parts) < len(value) else ""
+        return f"[{len(value)} items] [" + ", ".join(parts) + more + "]"
+
+    if isinstance(value, dict):
+        parts, used = [], 0
+        for key, item in value.items():
+            if used >= limit:
+                break
+            text = f"{key}: {_summarize(item, max(limit - used - len(str(key)), 0))}"
+            parts.append(text)
+            used += len(text) + 2
+        more = f", ... (+{len(value) - len(parts)} keys)" if len(parts) < len(value) else ""
+        return "{" + ", ".join(parts) + more + "}"
+
+    return _summarize(str(value), limit)
+
+
+class Preview:
+    """Size-capped, lazily rendered view of a value; nothing is serialized unless the record is emitted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = None):
+        self.value = value
+        self.limit = limit or LOG_PREVIEW_CHARS
+
+    def __str__(self) -> str:
+        return _summarize(self.value, self.limit)
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+
+def preview(value: Any, limit: int = None) -> Preview:
+    """Wrap a payload for logging: logger.info("Result: {}", preview(result))."""
+    return Preview(value, limit)
+
+
+def sampled(category: str) -> bool:
+    """Decide whether a record of this category is kept, per LOG_SAMPLE_RATES."""
+    rate = LOG_SAMPLE_RATES.get(category, LOG_SAMPLE_RATES.get("*", 1.0))
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+def log_sampled(category: str, message: str, *args: Any, level: str = "INFO") -> None:
+    """Log a high-frequency event, subject to the category's sampling rate."""
+    if sampled(category):
+        logger.opt(depth=1).bind(category=category).log(level, message, *args)
+
+
+def log_dump(category: str, message: str, *args: Any) -> None:
+    """
+    Log a debug-grade payload dump (state, results, conversation text).
+
+    Dropped entirely unless LOG_DEBUG_DUMPS is on (the development default),
+    sampled per category, and written at DEBUG with size-capped previews, so
+    they reach application.log only with LOG_LEVEL=DEBUG.
+    """
+    if LOG_DEBUG_DUMPS and sampled(category):
+        logger.opt(depth=1).bind(category=category).debug(message, *(preview(arg) for arg in args))
+
+
+logger.info(f"Logging system initialized ({LOG_PROFILE} profile, {LOG_FORMAT} format)")
@@ -0,0 +1,261 @@
+"""
+Profiling - On-demand profiles of single turns through the main graph.
+
+``ProfilingCallbackHandler`` is attached to the compiled main graph and does
+nothing unless a turn is flagged. A turn is profiled when any of these holds:
+
+- ``PROFILE_TURNS`` is ``all``, or lists the turn's thread_id
+  (comma-separated thread_ids flag whole conversations)
+- the run config carries ``metadata={"profile": True}`` (what the HTTP
+  service sets for requests with the ``X-Profile-Turn`` header)
+- the input state has ``metadata["profile"]`` set
+
+The profile is written as a collapsed-stack file (one ``frame;frame;frame
+count`` line per stack, the input format of flamegraph.pl and speedscope) to
+``PROFILE_DIR`` next to the logs. ``PROFILE_MODE`` selects the profiler:
+
+- ``sampling`` (default): a background thread samples the stacks of every
+  thread each ``PROFILE_INTERVAL_MS``, so work LangGraph runs on executor
+  threads is included. Other turns running concurrently in the same process
+  show up too.
+- ``cprofile``: deterministic cProfile of the thread the turn started on;
+  also writes the raw ``.prof`` file for pstats / snakeviz. Collapsed stacks
+  are reconstructed from the caller graph, so they are approximate.
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from core.logger import logger
+from core.metrics import metrics
+
+PROFILE_HEADER = "x-profile-turn"
+
+# Background threads that are idle for the whole turn and only add noise
+IGNORED_THREADS = ("loguru-writer", "turn-profiler", "trace-exporter")
+
+
+def profile_requested(headers: Mapping[str, str]) -> bool:
+    """True when a request's headers flag its turn for profiling."""
+    value = next((v for k, v in headers.items() if k.lower() == PROFILE_HEADER), "")
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack on a background thread and counts collapsed stacks."""
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="turn-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, f"thread-{ident}")
+                if ident == own or name.startswith(IGNORED_THREADS):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: Path) -> None:
+        with open(path.with_suffix(".folded"), "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class DeterministicProfiler:
+    """cProfile of the calling thread, exported as pstats plus approximate collapsed stacks."""
+
+    # Stacks below this many microseconds are dropped from the collapsed file
+    MIN_US = 10
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def write(self, path: Path) -> None:
+        self.profile.dump_stats(str(path.with_suffix(".prof")))
+        stats = pstats.Stats(self.profile).stats
+        callees: Dict[Tuple, Dict[Tuple, float]] = {}
+        for function, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, caller_ct) in callers.items():
+                callees.setdefault(caller, {})[function] = caller_ct
+
+        stacks: Counter = Counter()
+
+        def label(function: Tuple) -> str:
+            filename, line, name = function
+            return f"{name} ({os.path.basename(filename)}:{line})"
+
+        def walk(function: Tuple, prefix: str, seen: frozenset, budget: float) -> None:
+            # Split this call path's share of the function's time between its own
+            # time and its callees, in proportion to the aggregate profile
+            _, _, tt, ct, _ = stats[function]
+            if ct <= 0 or budget * 1e6 < self.MIN_US:
+                return
+            scale = min(budget / ct, 1.0)
+            stack = f"{prefix};{label(function)}" if prefix else label(function)
+            stacks[stack] += round(tt * scale * 1e6)
+            for callee, edge_ct in callees.get(function, {}).items():
+                if callee not in seen:
+                    walk(callee, stack, seen | {callee}, edge_ct * scale)
+
+        # Roots: time a function spent when called from frames that were already
+        # running when the profile started (or from nowhere)
+        for function, (_, _, _, ct, callers) in stats.items():
+            unattributed = ct - sum(edge[3] for edge in callers.values())
+            if unattributed * 1e6 >= self.MIN_US:
+                walk(function, "", frozenset({function}), unattributed)
+
+        with open(path.with_suffix(".folded"), "w", encoding="utf-8") as file:
+            for stack, microseconds in stacks.most_common():
+                if microseconds >= self.MIN_US:
+                    file.write(f"{stack} {microseconds}\n")
+
+
+class ProfilingCallbackHandler(BaseCallbackHandler):
+    """Profiles flagged turns from the root chain's start to its end."""
+
+    # Start and stop on the thread running the graph, also for astream/ainvoke
+    run_inline = True
+
+    def __init__(self, mode: str = "sampling", directory: str = "logs/profiles",
+                 turns: str = "", interval_ms: float = 5.0):
+        self.mode = mode
+        self.directory = Path(directory)
+        self.interval_ms = interval_ms
+        turns = [t.strip() for t in turns.split(",") if t.strip()]
+        self.all_turns = "all" in turns
+        self.thread_ids = set(turns) - {"all"}
+        self._lock = threading.Lock()
+        self._running: Dict[UUID, Tuple[Any, str, float]] = {}
+        # cProfile can only profile one turn per thread at a time
+        self._cprofile_active = False
+
+    def _flagged(self, inputs: Any, metadata: Dict[str, Any]) -> bool:
+        if self.all_turns or metadata.get("profile") is True:
+            return True
+        if metadata.get("thread_id") and str(metadata["thread_id"]) in self.thread_ids:
+            return True
+        state_metadata = inputs.get("metadata") if isinstance(inputs, dict) else None
+        return bool(isinstance(state_metadata, dict) and state_metadata.get("profile"))
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> None:
+        if parent_run_id is not None:
+            return
+        metadata = metadata or {}
+        if not self._flagged(inputs, metadata):
+            return
+
+        with self._lock:
+            if self.mode == "cprofile":
+                if self._cprofile_active:
+                    logger.warning("Skipping turn profile: another cProfile turn is running")
+                    return
+                self._cprofile_active = True
+                profiler = DeterministicProfiler()
+            else:
+                profiler = SamplingProfiler(self.interval_ms)
+            self._running[run_id] = (profiler, str(metadata.get("thread_id") or "turn"), time.perf_counter())
+        try:
+            profiler.start()
+        except Exception as e:
+            logger.error(f"Error starting turn profiler: {str(e)}")
+            self._finish(run_id, write=False)
+
+    def _finish(self, run_id: UUID, write: bool = True) -> None:
+        with self._lock:
+            running = self._running.pop(run_id, None)
+            if running is None:
+                return
+            if isinstance(running[0], DeterministicProfiler):
+                self._cprofile_active = False
+        profiler, thread_id, start = running
+        try:
+            profiler.stop()
+            if not write:
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            safe_thread = "".join(c if c.isalnum() or c in "-_" else "_" for c in thread_id)[:64]
+            path = self.directory / f"{stamp}_{safe_thread}_{run_id.hex[-8:]}"
+            profiler.write(path)
+            metrics.inc("turn_profiles", mode=self.mode)
+            logger.info("Turn profile written to {}.folded ({:.0f} ms, mode {})", path, elapsed_ms, self.mode)
+        except Exception as e:
+            logger.error(f"Error writing turn profile: {str(e)}")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if self._running:
+            self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        if self._running:
+            self._finish(run_id)
+
+
+_profiling_handler = None
+
+def get_profiling_callbacks():
+    """Callbacks to attach to the main graph (empty when PROFILE_MODE is off)."""
+    global _profiling_handler
+    mode = os.getenv("PROFILE_MODE", "sampling").lower()
+    if mode == "off":
+        return []
+    if mode not in ("sampling", "cprofile"):
+        logger.warning(f"Unknown PROFILE_MODE '{mode}', using sampling")
+        mode = "sampling"
+    if _profiling_handler is None:
+        _profiling_handler = ProfilingCallbackHandler(
+            mode=mode,
+            directory=os.getenv("PROFILE_DIR", "logs/profiles"),
+            turns=os.getenv("PROFILE_TURNS", ""),
+            interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "5")),
+        )
+    return [_profiling_handler]
+
+def reset_profiling():
+    global _profiling_handler
+    _profiling_handler = None
@@ -0,0 +1,442 @@
+"""
+Telemetry - Timing spans for turns, graph nodes, tools and LLM calls.
+
+``TelemetryCallbackHandler`` is attached to the compiled main graph, so every
+turn produces spans for the turn itself, each node (including sub-graph nodes
+such as ``appointment/sop_collector`` and the react agents' inner nodes),
+each tool and each LLM call. Node spans carry the LLM calls and prompt /
+completion tokens made while they ran.
+
+Spans go to pluggable exporters selected with ``TELEMETRY_EXPORTERS``
+(comma-separated):
+
+- ``memory``: in-process latency histograms plus the most recent spans
+- ``prometheus``: the same histograms in Prometheus text format, served on
+  ``TELEMETRY_PROMETHEUS_PORT`` at /metrics along with the core.metrics counters
+- ``jsonl``: one JSON line per span in ``TELEMETRY_JSONL_PATH``
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphBubbleUp
+from core.logger import logger
+from core.metrics import metrics
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+def node_path(name: str, metadata: Dict[str, Any]) -> str:
+    """'appointment/sop_collector' style path from the checkpoint namespace."""
+    namespace = metadata.get("checkpoint_ns") or ""
+    parents = [part.split(":")[0] for part in namespace.split("|") if part]
+    # The namespace of a node's own run ends with the node itself
+    if parents and parents[-1] == name:
+        parents = parents[:-1]
+    return "/".join(parents + [name])
+
+
+class Span:
+    """A finished unit of work: a turn, node, tool or LLM call."""
+
+    def __init__(self, kind: str, name: str, trace_id: str, start: float, duration_ms: float,
+                 status: str = "ok", attributes: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.name = name
+        self.trace_id = trace_id
+        self.start = start
+        self.duration_ms = duration_ms
+        self.status = status
+        self.attributes = attributes or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "start": datetime.fromtimestamp(self.start).isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            **self.attributes,
+        }
+
+
+#
+# Exporters
+#
+class SpanExporter:
+    """Base exporter; subclasses override export()."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=1024)
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.errors = 0
+
+    def observe(self, span: Span) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS_MS, span.duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += span.duration_ms
+        self.samples.append(span.duration_ms)
+        self.llm_calls += span.attributes.get("llm_calls", 0)
+        self.prompt_tokens += span.attributes.get("prompt_tokens", 0)
+        self.completion_tokens += span.attributes.get("completion_tokens", 0)
+        if span.status == "error":
+            self.errors += 1
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+class InMemoryExporter(SpanExporter):
+    """Latency histograms per (kind, name) and a ring buffer of recent spans."""
+
+    def __init__(self, recent_spans: int = 2000):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.recent: Deque[Span] = deque(maxlen=recent_spans)
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.histograms[(span.kind, span.name)].observe(span)
+            self.recent.append(span)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Summary per 'kind:name': count, mean/p50/p95/p99 ms, LLM calls and tokens."""
+        with self._lock:
+            return {
+                f"{kind}:{name}": {
+                    "count": hist.count,
+                    "errors": hist.errors,
+                    "mean_ms": round(hist.sum_ms / hist.count, 3) if hist.count else 0.0,
+                    "p50_ms": round(hist.percentile(50), 3),
+                    "p95_ms": round(hist.percentile(95), 3),
+                    "p99_ms": round(hist.percentile(99), 3),
+                    "llm_calls": hist.llm_calls,
+                    "prompt_tokens": hist.prompt_tokens,
+                    "completion_tokens": hist.completion_tokens,
+                }
+                for (kind, name), hist in sorted(self.histograms.items())
+            }
+
+    def trace(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Spans of one turn, in start order (default: the most recent turn)."""
+        with self._lock:
+            spans = list(self.recent)
+        if trace_id is None:
+            turns = [span for span in spans if span.kind == "turn"]
+            if not turns:
+                return []
+            trace_id = turns[-1].trace_id
+        return sorted((span for span in spans if span.trace_id == trace_id), key=lambda span: span.start)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.recent.clear()
+
+
+class PrometheusExporter(InMemoryExporter):
+    """Histograms rendered in the Prometheus text exposition format, optionally served over HTTP."""
+
+    def __init__(self, port: Optional[int] = None, host: str = "127.0.0.1"):
+        super().__init__(recent_spans=0)
+        self._server = None
+        if port:
+            self.serve(port, host)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP orchestration_span_duration_seconds Duration of turns, nodes, tools and LLM calls",
+            "# TYPE orchestration_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        for (kind, name), hist in histograms:
+            labels = f'kind="{kind}",name="{name}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS_MS, hist.buckets):
+                cumulative += count
+                lines.append(f'orchestration_span_duration_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'orchestration_span_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"orchestration_span_duration_seconds_sum{{{labels}}} {hist.sum_ms / 1000:.6f}")
+            lines.append(f"orchestration_span_duration_seconds_count{{{labels}}} {hist.count}")
+
+        for metric, attribute in (("llm_calls", "llm_calls"), ("prompt_tokens", "prompt_tokens"),
+                                  ("completion_tokens", "completion_tokens"), ("errors", "errors")):
+            lines.append(f"# TYPE orchestration_span_{metric}_total counter")
+            for (kind, name), hist in histograms:
+                lines.append(f'orchestration_span_{metric}_total{{kind="{kind}",name="{name}"}} {getattr(hist, attribute)}')
+
+        # Process-wide counters (LLM usage per node/tier, caches, canned responses, ...)
+        for metric, series in sorted(metrics.snapshot().items()):
+            lines.append(f"# TYPE orchestration_{metric}_total counter")
+            for labels, value in series.items():
+                label_text = ",".join(f'{key}="{value_}"' for key, value_ in labels)
+                lines.append(f"orchestration_{metric}_total{{{label_text}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> None:
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=self._server.serve_forever, daemon=True, name="prometheus-exporter").start()
+            logger.info(f"Prometheus metrics served on http://{host}:{port}/metrics")
+        except OSError as e:
+            logger.error(f"Failed to start Prometheus endpoint on port {port}: {str(e)}")
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class JsonlExporter(SpanExporter):
+    """Appends one JSON line per span."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+#
+# Collection
+#
+class Telemetry:
+    """Fans finished spans out to the configured exporters."""
+
+    def __init__(self, exporters: List[SpanExporter]):
+        self.exporters = exporters
+
+    def export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Telemetry exporter {type(exporter).__name__} failed: {str(e)}")
+
+    def get_exporter(self, exporter_type: type) -> Optional[SpanExporter]:
+        return next((e for e in self.exporters if isinstance(e, exporter_type)), None)
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """
+    Turns LangChain run callbacks into spans.
+
+    Node runs are the chain runs whose name matches their ``langgraph_node``
+    metadata; the root graph run is the turn. LLM calls and tokens are added
+    to every enclosing node span and to the turn.
+    """
+
+    def __init__(self, telemetry: Telemetry):
+        self.telemetry = telemetry
+        self._lock = threading.Lock()
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        self._traces: Dict[UUID, UUID] = {}
+        self._open: Dict[UUID, Dict[str, Any]] = {}
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], kind: Optional[str] = None, name: str = "",
+               **attributes: Any) -> None:
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            self._traces[run_id] = self._traces.get(parent_run_id, parent_run_id or run_id)
+            if kind is not None:
+                self._open[run_id] = {"kind": kind, "name": name, "start": time.time(),
+                                      "perf": time.perf_counter(), "llm_calls": 0,
+                                      "prompt_tokens": 0, "completion_tokens": 0, **attributes}
+
+    def _end(self, run_id: UUID, status: str = "ok", **attributes: Any) -> None:
+        with self._lock:
+            self._parents.pop(run_id, None)
+            trace_id = self._traces.pop(run_id, run_id)
+            record = self._open.pop(run_id, None)
+        if record is None:
+            return
+        kind, name, start, perf = record.pop("kind"), record.pop("name"), record.pop("start"), record.pop("perf")
+        record.update(attributes)
+        self.telemetry.export(Span(kind, name, str(trace_id), start, (time.perf_counter() - perf) * 1000, status, record))
+
+    def _add_usage(self, run_id: UUID, prompt_tokens: int, completion_tokens: int) -> None:
+        """Add an LLM call to every open node span above it and to the turn."""
+        with self._lock:
+            parent = self._parents.get(run_id)
+            while parent is not None:
+                record = self._open.get(parent)
+                if record is not None and record["kind"] in ("node", "turn"):
+                    record["llm_calls"] += 1
+                    record["prompt_tokens"] += prompt_tokens
+                    record["completion_tokens"] += completion_tokens
+                parent = self._parents.get(parent)
+
+    @staticmethod
+    def _status(error: BaseException) -> str:
+        # Handoffs and interrupts end a run by raising; they are not failures
+        return "handoff" if isinstance(error, GraphBubbleUp) else "error"
+
+    # Chains: the turn and graph nodes
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name") or ""
+        if parent_run_id is None:
+            self._start(run_id, None, "turn", name, thread_id=(metadata.get("thread_id") or ""))
+        elif name and name == metadata.get("langgraph_node"):
+            self._start(run_id, parent_run_id, "node", node_path(name, metadata))
+        else:
+            self._start(run_id, parent_run_id)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, self._status(error))
+
+    # Tools
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        self._start(run_id, parent_run_id, "tool", name)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, self._status(error))
+
+    # LLM calls
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                            **kwargs: Any) -> None:
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        self._start(run_id, parent_run_id, "llm", node_path(node, metadata) if node else "llm")
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens = completion_tokens = 0
+        try:
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    prompt_tokens += usage.get("input_tokens", 0) or 0
+                    completion_tokens += usage.get("output_tokens", 0) or 0
+        except Exception:
+            pass
+        self._add_usage(run_id, prompt_tokens, completion_tokens)
+        self._end(run_id, llm_calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, "error")
+
+
+def create_exporters(names: List[str]) -> List[SpanExporter]:
+    exporters: List[SpanExporter] = []
+    for name in names:
+        if name == "memory":
+            exporters.append(InMemoryExporter(int(os.getenv("TELEMETRY_RECENT_SPANS", "2000"))))
+        elif name == "prometheus":
+            exporters.append(PrometheusExporter(
+                port=int(os.getenv("TELEMETRY_PROMETHEUS_PORT", "9464")),
+                host=os.getenv("TELEMETRY_PROMETHEUS_HOST", "127.0.0.1"),
+            ))
+        elif name == "jsonl":
+            exporters.append(JsonlExporter(os.getenv("TELEMETRY_JSONL_PATH", "logs/spans.jsonl")))
+        else:
+            logger.warning(f"Unknown telemetry exporter '{name}'")
+    return exporters
+
+
+_telemetry = None
+
+def get_telemetry() -> Optional[Telemetry]:
+    """Get the process-wide telemetry, or None when TELEMETRY_EXPORTERS is empty."""
+    global _telemetry
+    if _telemetry is None:
+        names = [n.strip().lower() for n in os.getenv("TELEMETRY_EXPORTERS", "memory").split(",") if n.strip()]
+        if not names:
+            return None
+        _telemetry = Telemetry(create_exporters(names))
+    return _telemetry
+
+def get_telemetry_callbacks() -> List[BaseCallbackHandler]:
+    """Callbacks to attach to the main graph (empty when telemetry is off)."""
+    telemetry = get_telemetry()
+    return [TelemetryCallbackHandler(telemetry)] if telemetry else []
+
+def reset_telemetry():
+    global _telemetry
+    if _telemetry is not None:
+        _telemetry.shutdown()
+    _telemetry = None
+
+
+def format_trace(spans: List[Span]) -> str:
+    """Render a turn's spans as a timeline: offset, duration, kind, name, LLM calls and tokens."""
+    if not spans:
+        return "No spans recorded"
+    origin = min(span.start for span in spans)
+    lines = [f"{'offset ms':>10} {'duration':>10}  {'kind':<5} {'name':<40} {'llm':>4} {'prompt':>7} {'compl':>6}  status"]
+    for span in spans:
+        attributes = span.attributes
+        lines.append(
+            f"{(span.start - origin) * 1000:>10.1f} {span.duration_ms:>10.1f}  {span.kind:<5} {span.name:<40} "
+            f"{attributes.get('llm_calls', 0):>4} {attributes.get('prompt_tokens', 0):>7} "
+            f"{attributes.get('completion_tokens', 0):>6}  {span.status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,275 @@
+"""
+Tracing - Sampled LangSmith tracing with a background batch exporter.
+
+Setting ``LANGSMITH_TRACING=true`` used to trace every run through
+LangChain's global tracer. In the default ``sampled`` mode
+(``TRACING_MODE``) the main graph instead carries a ``SampledTracer``:
+
+- Sampling is head-based and decided per conversation. The root run's
+  thread_id is hashed against ``TRACING_SAMPLE_RATE``, so a conversation is
+  either traced on every turn or not at all. Turns without a thread_id are
+  sampled individually. Runs of unsampled turns are never built.
+- Finished traces go to a ``BatchTraceExporter`` queue. A background thread
+  posts them to LangSmith in batches of ``TRACING_BATCH_SIZE``, or every
+  ``TRACING_FLUSH_SECONDS``.
+- When LangSmith is unreachable, or no API key is set, batches are written to
+  ``TRACING_FALLBACK_PATH`` as JSON lines. The endpoint is retried after
+  ``TRACING_RETRY_SECONDS``. A full queue drops traces instead of waiting, so
+  tracing never blocks a turn.
+
+``TRACING_MODE=global`` restores LangChain's trace-everything behaviour and
+``TRACING_MODE=off`` disables tracing.
+"""
+
+import os
+import json
+import time
+import queue
+import zlib
+import random
+import atexit
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.base import BaseTracer
+from langchain_core.tracers.schemas import Run
+from core.logger import logger
+from core.metrics import metrics
+
+
+def conversation_sampled(thread_id: Optional[str], rate: float) -> bool:
+    """Head-based sampling: the same conversation always gets the same decision."""
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    if not thread_id:
+        return random.random() < rate
+    return zlib.crc32(str(thread_id).encode("utf-8")) / 0xFFFFFFFF < rate
+
+
+def _json_default(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def flatten_trace(run: Run) -> List[Dict[str, Any]]:
+    """A finished run tree as LangSmith run payloads, parents before children."""
+    runs, pending = [], [run]
+    while pending:
+        current = pending.pop()
+        payload = current.dict(exclude={"child_runs", "parent_run", "ls_client"})
+        runs.append(payload)
+        pending.extend(reversed(current.child_runs))
+    return runs
+
+
+class BatchTraceExporter:
+    """Posts finished traces to LangSmith from a background thread, with a local JSONL fallback."""
+
+    def __init__(self, project: str, api_url: Optional[str] = None, api_key: Optional[str] = None,
+                 fallback_path: str = "logs/traces.jsonl", batch_size: int = 20,
+                 flush_seconds: float = 2.0, retry_seconds: float = 60.0, max_queue: int = 1000,
+                 timeout: float = 5.0):
+        self.project = project
+        self.api_url = api_url
+        self.api_key = api_key
+        self.fallback_path = Path(fallback_path)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retry_seconds = retry_seconds
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[Run]]" = queue.Queue(maxsize=max_queue)
+        self._client = None
+        self._offline_until = 0.0 if api_key else float("inf")
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, run: Run) -> None:
+        """Queue a finished trace; never blocks the caller."""
+        try:
+            self._queue.put_nowait(run)
+        except queue.Full:
+            metrics.inc("traces_dropped")
+
+    def _run(self) -> None:
+        batch: List[Run] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                run = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+                if run is None:
+                    break
+                batch.append(run)
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_seconds
+        if batch:
+            self._flush(batch)
+
+    def _post(self, runs: List[Dict[str, Any]]) -> None:
+        # Plain POST with a short timeout and no retries: a failure goes to the file sink
+        if self._client is None:
+            import httpx
+            self._client = httpx.Client(timeout=self.timeout)
+        response = self._client.post(
+            f"{self.api_url.rstrip('/')}/runs/batch",
+            content=json.dumps({"post": runs, "patch": []}, default=_json_default),
+            headers={"x-api-key": self.api_key, "content-type": "application/json"},
+        )
+        response.raise_for_status()
+
+    def _flush(self, batch: List[Run]) -> None:
+        try:
+            runs = [payload for run in batch for payload in flatten_trace(run)]
+            for payload in runs:
+                payload["session_name"] = self.project
+        except Exception as e:
+            logger.warning(f"Failed to serialize traces: {str(e)}")
+            return
+
+        if time.monotonic() >= self._offline_until:
+            try:
+                self._post(runs)
+                metrics.inc("traces_exported", len(batch), sink="langsmith")
+                return
+            except Exception as e:
+                self._offline_until = time.monotonic() + self.retry_seconds
+                logger.warning(f"LangSmith unreachable, writing traces to {self.fallback_path}: {str(e)}")
+
+        try:
+            self.fallback_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.fallback_path, "a", encoding="utf-8") as file:
+                for payload in runs:
+                    file.write(json.dumps(payload, default=_json_default) + "\n")
+            metrics.inc("traces_exported", len(batch), sink="file")
+        except Exception as e:
+            logger.error(f"Error writing traces to {self.fallback_path}: {str(e)}")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued traces and stop the exporter thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+def _gated_start(name: str):
+    def method(self, serialized, payload, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+               metadata: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        if parent_run_id is None:
+            if not conversation_sampled((metadata or {}).get("thread_id"), self.sample_rate):
+                return None
+            metrics.inc("traces_sampled")
+        elif str(parent_run_id) not in self.run_map:
+            return None
+        return getattr(BaseTracer, name)(self, serialized, payload, run_id=run_id,
+                                         parent_run_id=parent_run_id, metadata=metadata, **kwargs)
+    method.__name__ = name
+    return method
+
+
+def _gated_event(name: str):
+    def method(self, *args, run_id: UUID, **kwargs: Any):
+        if str(run_id) not in self.run_map:
+            return None
+        return getattr(BaseTracer, name)(self, *args, run_id=run_id, **kwargs)
+    method.__name__ = name
+    return method
+
+
+class SampledTracer(BaseTracer):
+    """LangChain tracer that only builds runs for sampled turns and hands finished traces to an exporter."""
+
+    # Keep the tracer on the thread running the graph, also for astream/ainvoke
+    run_inline = True
+
+    def __init__(self, exporter: BatchTraceExporter, sample_rate: float = 1.0, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    on_chain_start = _gated_start("on_chain_start")
+    on_chat_model_start = _gated_start("on_chat_model_start")
+    on_llm_start = _gated_start("on_llm_start")
+    on_tool_start = _gated_start("on_tool_start")
+    on_retriever_start = _gated_start("on_retriever_start")
+
+    on_chain_end = _gated_event("on_chain_end")
+    on_chain_error = _gated_event("on_chain_error")
+    on_llm_new_token = _gated_event("on_llm_new_token")
+    on_llm_end = _gated_event("on_llm_end")
+    on_llm_error = _gated_event("on_llm_error")
+    on_retry = _gated_event("on_retry")
+    on_tool_end = _gated_event("on_tool_end")
+    on_tool_error = _gated_event("on_tool_error")
+    on_retriever_end = _gated_event("on_retriever_end")
+    on_retriever_error = _gated_event("on_retriever_error")
+
+    def _persist_run(self, run: Run) -> None:
+        # Drop the finished trace's bookkeeping before handing it off
+        for run_id in [key for key, (trace_id, _) in self.order_map.items() if trace_id == run.trace_id]:
+            self.order_map.pop(run_id, None)
+        self.exporter.submit(run)
+
+
+def get_tracing_mode() -> str:
+    """off, sampled or global; off unless LANGSMITH_TRACING is true."""
+    if os.getenv("LANGSMITH_TRACING", "false").lower() != "true":
+        return "off"
+    mode = os.getenv("TRACING_MODE", "sampled").lower()
+    if mode not in ("off", "sampled", "global"):
+        logger.warning(f"Unknown TRACING_MODE '{mode}', using sampled")
+        return "sampled"
+    return mode
+
+
+_tracer = None
+
+def get_tracer() -> Optional[SampledTracer]:
+    """Process-wide sampled tracer, or None unless tracing runs in sampled mode."""
+    global _tracer
+    mode = get_tracing_mode()
+    if mode == "global":
+        return None
+    if os.getenv("LANGSMITH_TRACING", "false").lower() == "true":
+        # LangChain would otherwise trace every run from the environment variable
+        import langsmith
+        langsmith.configure(enabled=False)
+    if mode != "sampled":
+        return None
+    if _tracer is None:
+        exporter = BatchTraceExporter(
+            project=os.getenv("LANGSMITH_PROJECT", "langgraph-multi-agent-system"),
+            api_url=os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com"),
+            api_key=os.getenv("LANGSMITH_API_KEY"),
+            fallback_path=os.getenv("TRACING_FALLBACK_PATH", "logs/traces.jsonl"),
+            batch_size=int(os.getenv("TRACING_BATCH_SIZE", "20")),
+            flush_seconds=float(os.getenv("TRACING_FLUSH_SECONDS", "2")),
+            retry_seconds=float(os.getenv("TRACING_RETRY_SECONDS", "60")),
+            max_queue=int(os.getenv("TRACING_MAX_QUEUE", "1000")),
+            timeout=float(os.getenv("TRACING_TIMEOUT_SECONDS", "5")),
+        )
+        _tracer = SampledTracer(exporter, sample_rate=float(os.getenv("TRACING_SAMPLE_RATE", "1.0")))
+        atexit.register(exporter.shutdown)
+        logger.info(f"Sampled tracing enabled (rate {_tracer.sample_rate}, project {exporter.project})")
+    return _tracer
+
+def get_tracing_callbacks() -> List[BaseCallbackHandler]:
+    """Callbacks to attach to the main graph (empty unless tracing runs in sampled mode)."""
+    tracer = get_tracer()
+    return [tracer] if tracer else []
+
+def reset_tracing():
+    global _tracer
+    if _tracer is not None:
+        _tracer.exporter.shutdown()
+    _tracer = None
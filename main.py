@@ -1,48 +1,211 @@
 #!/usr/bin/env python3
 """
-Minimal main.py - just import graph and call with user input
+Console interface - chat with the multi-agent graph from the terminal.
+
+Usage:
+    python main.py                      # one message, then exit
+    python main.py --interactive        # multi-turn conversation, streamed
+    python main.py --demo               # scripted demo conversation
+    printf 'Hi\\nHow much is lawn care?\\n' | python main.py -i   # scripted latency check
+
+The conversation keeps one thread_id, and its state lives in the graph's
+checkpointer, so every turn only sends the new message. Replies stream token by
+token. Each turn ends with its timing (time to first token and total), LLM calls
+and tokens. Piped input is read line by line; blank lines and lines starting
+with '#' are skipped. A summary is printed when the conversation ends.
 """
 
 import os
 import sys
+import time
+import uuid
+import asyncio
+import argparse
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from orchestration.graph import get as get_graph
-from orchestration.state import create as create_state
+# Before any project import: modules such as core.logger read their settings at import
+load_dotenv()
+
+from core.logger import enable_file_logging, set_console_level
+from orchestration.warmup import warmup
+from server import run_turn
 from utils.llm_helpers import initialize_langsmith
-from langchain_core.messages import HumanMessage
+
+EXIT_COMMANDS = {"quit", "exit", "bye", "q"}
+
+DEMO_TURNS = [
+    "Hi there!",
+    "What services do you offer?",
+    "How much would pest control cost for a 2000 sq ft house at 42 Oak Street?",
+    "I'd like to book lawn care next Tuesday afternoon",
+    "Thanks, bye!",
+]
+
+
+async def chat_turn(thread_id: str, text: str, stream: bool = True) -> Dict[str, Any]:
+    """Run one turn, printing the reply as it streams; returns the turn's stats."""
+    started = time.perf_counter()
+    first_token: Optional[float] = None
+    streamed, agent, message_id = False, None, None
+    stats: Dict[str, Any] = {}
+
+    async for event, data in run_turn(thread_id, text):
+        if event == "agent":
+            # A different agent took over mid-turn (handoff)
+            agent = data["agent"]
+        elif event == "token":
+            if first_token is None:
+                first_token = time.perf_counter()
+            if stream:
+                if not streamed:
+                    print(f"Assistant ({agent}): ", end="", flush=True)
+                    streamed = True
+                elif data.get("message_id") != message_id:
+                    # Next model call of the same turn
+                    print(f"\nAssistant ({agent}): ", end="", flush=True)
+                message_id = data.get("message_id")
+                print(data["content"], end="", flush=True)
+        elif event == "message":
+            if first_token is None:
+                first_token = time.perf_counter()
+            if streamed:
+                print()
+            else:
+                print(f"Assistant ({agent or data.get('agent')}): {data['content']}")
+        elif event == "done":
+            stats = data
+
+    total_ms = (time.perf_counter() - started) * 1000
+    return {
+        "ttft_ms": (first_token - started) * 1000 if first_token else total_ms,
+        "total_ms": total_ms,
+        "llm_calls": stats.get("llm_calls") or 0,
+        "tokens": (stats.get("prompt_tokens") or 0) + (stats.get("completion_tokens") or 0),
+        "cost_usd": stats.get("cost_usd") or 0.0,
+    }
+
+
+def format_turn(turn: Dict[str, Any]) -> str:
+    return (
+        f"  [ttft {turn['ttft_ms']:.0f} ms | total {turn['total_ms']:.0f} ms | "
+        f"{turn['llm_calls']} LLM calls | {turn['tokens']:,} tokens | ${turn['cost_usd']:.4f}]"
+    )
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def print_summary(thread_id: str, turns: List[Dict[str, Any]]) -> None:
+    if not turns:
+        return
+    ttft = [turn["ttft_ms"] for turn in turns]
+    total = [turn["total_ms"] for turn in turns]
+    print(f"\nConversation {thread_id}: {len(turns)} turns")
+    print(f"  ttft  p50 {_percentile(ttft, 50):.0f} ms | p95 {_percentile(ttft, 95):.0f} ms | max {max(ttft):.0f} ms")
+    print(f"  total p50 {_percentile(total, 50):.0f} ms | p95 {_percentile(total, 95):.0f} ms | max {max(total):.0f} ms")
+    print(
+        f"  {sum(turn['llm_calls'] for turn in turns)} LLM calls | "
+        f"{sum(turn['tokens'] for turn in turns):,} tokens | ${sum(turn['cost_usd'] for turn in turns):.4f}"
+    )
+
+
+async def read_line(scripted: bool) -> Optional[str]:
+    """Next user message: from the keyboard, or the next line of piped input (None at the end)."""
+    if scripted:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            return None
+        line = line.strip()
+        if line and not line.startswith("#"):
+            print(f"You: {line}")
+        return line
+    try:
+        return (await asyncio.to_thread(input, "You: ")).strip()
+    except (EOFError, KeyboardInterrupt):
+        return None
+
+
+async def conversation(thread_id: str, turns: Optional[List[str]] = None, stream: bool = True, once: bool = False) -> None:
+    """Chat until the user quits, the input or script ends, or after one turn with once=True."""
+    scripted = turns is None and not sys.stdin.isatty()
+    pending = list(turns) if turns is not None else None
+    history: List[Dict[str, Any]] = []
+
+    while True:
+        if pending is not None:
+            if not pending:
+                break
+            text = pending.pop(0)
+            print(f"You: {text}")
+        else:
+            text = await read_line(scripted)
+            if text is None:
+                break
+        if not text or text.startswith("#"):
+            continue
+        if text.lower() in EXIT_COMMANDS:
+            print("Goodbye!")
+            break
+
+        try:
+            turn = await chat_turn(thread_id, text, stream)
+        except Exception as e:
+            print(f"\nError: {str(e)}")
+            continue
+        history.append(turn)
+        print(format_turn(turn))
+        if once:
+            break
+
+    if len(history) > 1:
+        print_summary(thread_id, history)
+
 
 def main():
-    # Load environment
-    load_dotenv()
-    
-    if not os.getenv("OPENAI_API_KEY"):
-        print("Error: OPENAI_API_KEY required")
+    parser = argparse.ArgumentParser(description="Chat with the multi-agent system from the console")
+    parser.add_argument("--interactive", "-i", action="store_true", help="Keep the conversation going until quit/exit")
+    parser.add_argument("--demo", action="store_true", help="Run a scripted demo conversation")
+    parser.add_argument("--thread-id", default=None, help="Conversation id (default: a new one)")
+    parser.add_argument("--no-stream", action="store_true", help="Print each reply once it is complete")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show INFO logs on the console")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY") and os.getenv("LLM_PROVIDER", "openai").lower() != "fake":
+        print("Error: OPENAI_API_KEY required (or LLM_PROVIDER=fake)")
         return
-    
+
+    # Keep log lines from interleaving with streamed replies
+    if not args.verbose:
+        set_console_level("WARNING")
+    enable_file_logging()
+
     # Initialize
     initialize_langsmith()
-    
-    # Get user input
-    user_input = input("You: ").strip()
-    
-    # Create state with message
-    state = create_state()
-    state["messages"] = [HumanMessage(content=user_input)]
-    
-    # Call graph
-    graph = get_graph()
-    for chunk in graph.stream(state):
-        if "messages" in chunk and len(chunk["messages"]) > 0:
-            last_message = chunk["messages"][-1]
-            if hasattr(last_message, 'type') and last_message.type == "ai":
-                print(f"Assistant: {last_message.content}")
-                break
+    if args.interactive or args.demo:
+        # Compile graphs and build clients now, so the first turn's timing is representative
+        warmup(persistent=True)
+
+    thread_id = args.thread_id or f"console-{uuid.uuid4().hex[:8]}"
+    if args.interactive or args.demo:
+        print(f"Conversation {thread_id} (type 'quit' to end)")
+    try:
+        asyncio.run(conversation(
+            thread_id,
+            turns=DEMO_TURNS if args.demo else None,
+            stream=not args.no_stream,
+            once=not (args.interactive or args.demo),
+        ))
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+
 
 if __name__ == "__main__":
     main()
@@ -3,21 +3,34 @@ Orchestration Package - Main orchestration and graph management.
 
 This package contains the main orchestration logic, state management,
 and sub-graph coordination for the multi-agent system.
+
+Exports are resolved on first access, so importing a light module such as
+``orchestration.schema`` does not import every sub-graph.
 """
 
-from .graph import (
-    create,
-    get,
-    reset
-)
-from .state import State, create as create_state
-from .schema import Node
+import importlib
+
+_EXPORTS = {
+    'create': ('.graph', 'create'),
+    'get': ('.graph', 'get'),
+    'get_persistent': ('.graph', 'get_persistent'),
+    'get_checkpointer': ('.graph', 'get_checkpointer'),
+    'reset': ('.graph', 'reset'),
+    'reload': ('.graph', 'reload'),
+    'graphs': ('.registry', 'graphs'),
+    'warmup': ('.warmup', 'warmup'),
+    'State': ('.state', 'State'),
+    'create_state': ('.state', 'create'),
+    'Node': ('.schema', 'Node'),
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'create',
-    'get', 
-    'reset',
-    'State',
-    'create_state',
-    'Node'
-]
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
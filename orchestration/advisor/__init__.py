@@ -7,7 +7,6 @@ and agent nodes for business information and recommendations.
 
 from .graph import (
     create,
-    node,
     get
 )
 from .state import State, create as create_state
@@ -15,7 +14,6 @@ from .nodes import advisor_agent
 
 __all__ = [
     'create',
-    'node',
     'get',
     'State',
     'create_state',
@@ -7,8 +7,9 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt.tool_node import ToolNode
 from .state import AppointmentState
 from .nodes import sop_collector, booking_agent, start, skip_sop_collector
-from tools.appointment_tools import create_appointment, check_availability, reschedule_appointment
+from utils.tool_registry import get_tool_registry
 from core.logger import logger
+from orchestration.registry import graphs
 
 def should_continue(state: AppointmentState) -> Literal["booking_tools", "end"]:
     """Routing function following reference implementation pattern with proper tool call tracking"""
@@ -87,8 +88,8 @@ def create():
         workflow.add_node("skip_sop_collector", skip_sop_collector)
         workflow.add_node("booking_agent", booking_agent)
         
-        # Use ToolNode for proper tool execution
-        booking_tools_node = ToolNode([create_appointment, check_availability, reschedule_appointment])
+        # Runs every tool the booking agent's model is bound to, route_to_router included
+        booking_tools_node = ToolNode(get_tool_registry().tools("booking_agent"))
         workflow.add_node("booking_tools", booking_tools_node)
         
         # Add entry point
@@ -142,13 +143,8 @@ def create():
         logger.error(f"Error creating appointment graph: {str(e)}")
         raise
 
-the_graph = None
-
 def get(args=None):
-    global the_graph
-    if the_graph is None:
-        the_graph = create()
-    return the_graph
+    return graphs.get("appointment", create)
 
 # Visualize graph
 if __name__ == "__main__":
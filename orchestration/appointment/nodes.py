@@ -3,18 +3,20 @@ import re
 from datetime import datetime
 from typing import Literal
 from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, SystemMessage
 from langgraph.graph import MessagesState
 from langgraph.prebuilt import ToolNode
-from tools.appointment_tools import create_appointment, check_availability, reschedule_appointment
-from utils import load_template, to_plain_dict, to_plain_text
-from utils.llm_helpers import create_llm_client
+from utils import load_template, to_plain_dict, to_plain_text, get_template_registry
+from utils.tool_registry import get_tool_registry
+from utils.llm_cassette import CassetteMissError
 from utils.helper import format_conversation_history
-from utils.agent_handoff import get_agent_router_tools
-from core.logger import logger
+from core.logger import logger, log_dump, log_sampled, preview
 from .state import AppointmentState
 from .response_format import SOPExecutionResult
 
+# Name of the collector's question messages; the main graph pauses on them (see orchestration.nodes.await_answer)
+SOP_QUESTION = "sop_collector"
+
 
 #
 # Start
@@ -46,13 +48,14 @@ def sop_collector(state) -> AppointmentState:
         conversation_context = format_conversation_history(state["messages"])
         
         # Debug conversation context
-        logger.info(f"SOP Collector Debug - Conversation context: {conversation_context}")
-        logger.info(f"SOP Collector Debug - Messages count: {len(state['messages'])}")
+        log_dump("sop", "SOP Collector Debug - Conversation context: {}", conversation_context)
+        logger.debug("SOP Collector Debug - Messages count: {}", len(state['messages']))
         
-        llm = create_llm_client()
+        llm = get_tool_registry().client("sop_collector")
 
-        # Get template and context data
-        sop_prompt_template = load_template("sop_enforcer")
+        # Static instructions first, per-turn context last, so the prompt prefix is cacheable
+        registry = get_template_registry()
+        sop_prompt = registry.get_prompt("sop_enforcer") + registry.get_prompt("sop_enforcer_context", role="human")
         sop_checklists = load_template(f"sop_checklists/appointment")
 
         
@@ -67,9 +70,6 @@ def sop_collector(state) -> AppointmentState:
             "sop_checklists": sop_checklists
         }
 
-        messages = [("system", sop_prompt_template)]
-        sop_prompt = ChatPromptTemplate.from_messages(messages)
-
         # Execute SOP enforcement chain using updated output (EnforceSop now is updated to SOPExecutionResult)
         sop_chain = sop_prompt | llm.with_structured_output(SOPExecutionResult, method="function_calling")
         result: SOPExecutionResult = sop_chain.invoke(inputs)
@@ -87,7 +87,7 @@ def sop_collector(state) -> AppointmentState:
         if len(pending_sop_steps) > 0:
             first_pending_step = next(iter(pending_sop_steps.items()), None)
             to_response = first_pending_step[1].get('question', '')
-            logger.info(f"SOP Collector: Asking for {first_pending_step[0]} - {to_response}")
+            log_sampled("sop", "SOP Collector: Asking for {} - {}", first_pending_step[0], preview(to_response))
         else:
             logger.info("SOP Collector: No pending steps found")
         
@@ -96,9 +96,12 @@ def sop_collector(state) -> AppointmentState:
             "sop_steps": sop_steps,
             "adherence_percentage": result.adherence_percentage,
             "should_route": result.should_route,
-            "messages": [AIMessage(content=to_response)]
+            "messages": [AIMessage(content=to_response, name=SOP_QUESTION)]
         }
         
+    except CassetteMissError:
+        raise
+        
     except Exception as e:
         logger.error(f"Error in SOP Collector agent: {str(e)}")
         return {
@@ -116,13 +119,12 @@ def booking_agent(state) -> AppointmentState:
         sop_steps = state.get("sop_steps", {})
         today = datetime.now().strftime("%Y-%m-%d")
         
-        logger.info(f"Booking agent processing: {task_description}")
+        logger.info("Booking agent processing: {}", preview(task_description))
         
-        # Load and process template with variables
-        appointment_template = load_template("appointment")
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(appointment_template)
-        ])
+        # Precompiled templates: static instructions, then conversation, then per-turn context
+        registry = get_template_registry()
+        prompt = registry.get_prompt("appointment")
+        context_prompt = registry.get_prompt("appointment_context")
         
         # Create formatted messages using the template (following reference pattern)
         context_vars = {
@@ -131,31 +133,31 @@ def booking_agent(state) -> AppointmentState:
             "sop_steps": to_plain_text(sop_steps)
         }
         
-        formatted_messages = prompt.format_messages(**context_vars)
-        formatted_messages = formatted_messages + state["messages"]
-        
-        # Create LLM with tools - following reference pattern exactly
-        llm = create_llm_client()
-        
-        # Include both appointment tools and router tools
-        appointment_tools = [create_appointment, check_availability, reschedule_appointment]
-        router_tools = get_agent_router_tools()
-        all_tools = appointment_tools + router_tools
+        formatted_messages = (
+            prompt.format_messages()
+            + state["messages"]
+            + context_prompt.format_messages(**context_vars)
+        )
         
-        llm_with_tools = llm.bind_tools(all_tools)
+        # Appointment and router tools, bound once with precomputed schemas
+        llm_with_tools = get_tool_registry().bound("booking_agent")
 
         response = llm_with_tools.invoke(formatted_messages)
         
         # Create proper AIMessage with additional_kwargs (following reference pattern)
         output = AIMessage(
             content=response.content, 
-            additional_kwargs=response.additional_kwargs
+            additional_kwargs=response.additional_kwargs,
+            name="appointment_agent"
         )
         
         return {
             "messages": [output]
         }
         
+    except CassetteMissError:
+        raise
+        
     except Exception as e:
         logger.error(f"Error in Appointment Booking agent: {str(e)}")
         return {
@@ -2,11 +2,12 @@ from langgraph.graph import MessagesState
 from langchain_core.messages import BaseMessage
 from typing import Dict, Any, Optional, List, TypedDict, Annotated
 from operator import add
+from langgraph.graph.message import add_messages
 from core.logger import logger
 
 class AppointmentState(TypedDict):
     current: str
-    messages: Annotated[List[BaseMessage], add]
+    messages: Annotated[List[BaseMessage], add_messages]
     metadata: Dict[str, Any]
     should_route: bool
     sop_steps: Dict[str, Any]
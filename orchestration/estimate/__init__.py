@@ -7,7 +7,6 @@ and agent nodes for estimate and pricing handling.
 
 from .graph import (
     create,
-    node,
     get
 )
 from .state import State, create as create_state
@@ -15,7 +14,6 @@ from .nodes import estimate_agent
 
 __all__ = [
     'create',
-    'node',
     'get',
     'State',
     'create_state',
@@ -8,7 +8,7 @@ import traceback
 from langgraph.graph import StateGraph, START, END
 from .state import State
 from .nodes import estimate_agent
-from core.logger import logger
+from orchestration.registry import graphs
 
 def create():
     workflow = StateGraph(State)
@@ -20,24 +20,5 @@ def create():
     
     return workflow.compile()
 
-def node(state) -> State:
-    try:
-        logger.info("Starting estimate agent sub-graph workflow")
-        
-        sub_graph = create()
-        result = sub_graph.invoke(state)
-        
-        logger.info("Estimate agent sub-graph workflow completed")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in estimate agent sub-graph: {str(e)}")
-        raise
-
-_estimate_subgraph = None
-
 def get():
-    global _estimate_subgraph
-    if _estimate_subgraph is None:
-        _estimate_subgraph = create()
-    return _estimate_subgraph
+    return graphs.get("estimate", create)
@@ -8,7 +8,7 @@ import traceback
 from langgraph.graph import StateGraph, START, END
 from .state import State
 from .nodes import general_agent
-from core.logger import logger
+from orchestration.registry import graphs
 
 def create():
     workflow = StateGraph(State)
@@ -20,24 +20,5 @@ def create():
     
     return workflow.compile()
 
-def node(state) -> State:
-    try:
-        logger.info("Starting general agent sub-graph workflow")
-        
-        sub_graph = create()
-        result = sub_graph.invoke(state)
-        
-        logger.info("General agent sub-graph workflow completed")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in general agent sub-graph: {str(e)}")
-        raise
-
-_general_subgraph = None
-
 def get():
-    global _general_subgraph
-    if _general_subgraph is None:
-        _general_subgraph = create()
-    return _general_subgraph
+    return graphs.get("general", create)
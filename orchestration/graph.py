@@ -1,43 +1,118 @@
+import os
+import threading
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
+from core.telemetry import get_telemetry_callbacks
+from core.profiling import get_profiling_callbacks
+from core.tracing import get_tracing_callbacks
+from utils.token_ledger import get_ledger_callbacks
+from utils.tool_registry import get_tool_registry
 from .state import State
-from .router.nodes import router
-from .nodes import general, appointment, support, estimate, advisor, start
+from .nodes import start, small_talk, ledger, budget_exceeded, await_answer, after_ledger, agent_done
+from .router.graph import get as router_graph
+from .general.graph import get as general_graph
+from .appointment.graph import get as appointment_graph
+from .support.graph import get as support_graph
+from .estimate.graph import get as estimate_graph
+from .advisor.graph import get as advisor_graph
 from .schema import Node
+from .registry import graphs
 
-def create():
+AGENTS = (Node.GENERAL, Node.APPOINTMENT, Node.SUPPORT, Node.ESTIMATE, Node.ADVISOR)
+
+def create(checkpointer=None):
     workflow = StateGraph(State)
     
-    workflow.add_node(Node.START.value, start)
-    workflow.add_node(Node.ROUTER.value, router)
-    workflow.add_node(Node.GENERAL.value, general)
-    workflow.add_node(Node.APPOINTMENT.value, appointment)
-    workflow.add_node(Node.SUPPORT.value, support)
-    workflow.add_node(Node.ESTIMATE.value, estimate)
-    workflow.add_node(Node.ADVISOR.value, advisor)
+    # Starts the turn's hop accounting and picks its path: greetings/farewells get
+    # a canned reply, sessions over budget a refusal, everything else the router
+    workflow.add_node(
+        Node.START.value, start,
+        destinations=(Node.BUDGET_EXCEEDED.value, Node.SMALL_TALK.value, Node.ROUTER.value)
+    )
+    # Router and agents are their compiled sub-graphs, nested as nodes: they are
+    # compiled once (shared with the sub-packages' get()), and LangGraph streams
+    # and checkpoints through them
+    workflow.add_node(Node.ROUTER.value, router_graph())
+    workflow.add_node(Node.GENERAL.value, general_graph())
+    workflow.add_node(Node.APPOINTMENT.value, appointment_graph())
+    workflow.add_node(Node.SUPPORT.value, support_graph())
+    workflow.add_node(Node.ESTIMATE.value, estimate_graph())
+    workflow.add_node(Node.ADVISOR.value, advisor_graph())
+    workflow.add_node(Node.SMALL_TALK.value, small_talk)
+    workflow.add_node(Node.BUDGET_EXCEEDED.value, budget_exceeded)
+    # Deferred: runs once per turn, after every agent of the turn has finished
+    workflow.add_node(Node.LEDGER.value, ledger, defer=True)
+    # Pauses on an SOP question; the answer goes back to the appointment agent
+    workflow.add_node(
+        Node.AWAIT_ANSWER.value, await_answer,
+        destinations=(Node.BUDGET_EXCEEDED.value, Node.SMALL_TALK.value, Node.APPOINTMENT.value)
+    )
     
-    workflow.add_edge(START, Node.ROUTER.value)
     workflow.add_edge(START, Node.START.value)
-    workflow.add_edge(Node.GENERAL.value, END)
-    workflow.add_edge(Node.APPOINTMENT.value, END)
-    workflow.add_edge(Node.SUPPORT.value, END)
-    workflow.add_edge(Node.ESTIMATE.value, END)
-    workflow.add_edge(Node.ADVISOR.value, END)
     
-    #memory = MemorySaver()
-    return workflow.compile()
+    # Every answered turn ends in the ledger, which records its token usage and cost
+    # (none for canned replies and refusals, but the turn still counts).
+    # Agents only go there when they answered: a static edge would also fire when
+    # they hand off, running the ledger mid-turn (the router's fallback goes there
+    # with a Command)
+    workflow.add_edge(Node.BUDGET_EXCEEDED.value, Node.LEDGER.value)
+    workflow.add_edge(Node.SMALL_TALK.value, Node.LEDGER.value)
+    for agent in AGENTS:
+        workflow.add_conditional_edges(agent.value, agent_done, [Node.LEDGER.value, END])
+    workflow.add_conditional_edges(Node.LEDGER.value, after_ledger, [Node.AWAIT_ANSWER.value, END])
+    
+    graph = workflow.compile(checkpointer=checkpointer)
+    
+    # With a checkpointer, SOP questions pause the run once the turn is recorded
+    # and the answer resumes it at the appointment agent (see orchestration.nodes.await_answer)
+    if checkpointer is not None and os.getenv("SOP_INTERRUPTS", "true").lower() == "true":
+        graph = graph.with_config(configurable={"sop_interrupts": True})
+    
+    # Turn/node/tool/LLM spans, on-demand turn profiles, the token ledger and
+    # sampled tracing; nested sub-graphs inherit the callbacks
+    callbacks = (
+        get_telemetry_callbacks() + get_profiling_callbacks() + get_ledger_callbacks() + get_tracing_callbacks()
+    )
+    return graph.with_config(callbacks=callbacks) if callbacks else graph
 
 def get():
-    global _main_orchestration_graph
-    if _main_orchestration_graph is None:
-        _main_orchestration_graph = create()
-    return _main_orchestration_graph
+    return graphs.get("main", create)
+
+def get_checkpointer():
+    """Process-wide checkpointer holding conversation state per thread_id."""
+    global _checkpointer
+    if _checkpointer is None:
+        with _checkpointer_lock:
+            if _checkpointer is None:
+                _checkpointer = MemorySaver()
+    return _checkpointer
+
+_checkpointer = None
+_checkpointer_lock = threading.Lock()
+
+def get_persistent():
+    """
+    Main graph compiled with the checkpointer: callers pass only the new message
+    and configurable.thread_id, and the conversation state is loaded and saved per thread.
+    """
+    return graphs.get("main_persistent", lambda: create(get_checkpointer()))
 
-_main_orchestration_graph = None
+def reload(reason: str = "") -> int:
+    """
+    Recompile every graph built so far (e.g. after a prompt or config change)
+    and swap them in at once; conversations in the checkpointer are kept.
+    """
+    # Agents rebind their tools against the new LLM clients
+    get_tool_registry().clear()
+    return graphs.reload(reason=reason)
 
 def reset():
-    global _main_orchestration_graph
-    _main_orchestration_graph = None
+    """Drop all compiled graphs and the checkpointer with its conversations."""
+    global _checkpointer
+    with _checkpointer_lock:
+        graphs.reset()
+        get_tool_registry().clear()
+        _checkpointer = None
 
 # print graph
 if __name__ == "__main__":
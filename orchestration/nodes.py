@@ -1,182 +1,188 @@
 """
-Central nodes reference for all orchestration agents.
+Main-graph nodes that are not agents.
 
-This module provides a centralized reference to all agent nodes
-from the various sub-graphs with proper state management.
+The router and the agents are their compiled sub-graphs, added to the main
+graph directly (see orchestration.graph); this module holds the nodes around
+them: pre-routing, canned replies, the budget refusal, start, the ledger and
+the pause on SOP questions.
 """
 
-from typing import Dict, Any, List
-from core.logger import logger
-from langgraph.types import Command
-from .state import State
+import os
+from typing import Any, Optional
+from core.logger import logger, log_sampled, preview
+from core.metrics import metrics
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END
+from langgraph.types import Command, interrupt
+from schemas.intent_analysis import IntentType
+from utils.intent_detector import detect_trivial_intent
+from utils.helper import get_message_content
+from utils.token_ledger import over_budget, record_turn
+from .state import State, NEW_TURN
 from .schema import Node
+from .appointment.nodes import SOP_QUESTION
 
-# Import all agent nodes from sub-graphs
-from .general.nodes import general_agent as general
-from .appointment.graph import get as appointment_graph
-from .support.nodes import support_agent as support_agent_func
-from .estimate.nodes import estimate_agent as estimate_agent_func
-from .advisor.nodes import advisor_agent as advisor_agent_func
 
+# Canned replies in the general agent's voice, used for pure greetings and farewells
+CANNED_RESPONSES = {
+    IntentType.GREETING: [
+        "Hey there! How can I help you today?",
+        "Hi! Great to hear from you. What can I do for you?",
+        "Hello! I can help with booking, pricing, support or general info. What sounds good?",
+    ],
+    IntentType.FAREWELL: [
+        "You're welcome! Have a great day, and reach out anytime.",
+        "Thanks for chatting with us! Take care.",
+        "Happy to help! Talk to you soon.",
+    ],
+}
 
-def filter_tool_messages(messages: List) -> List:
-    """
-    Filter out tool messages to prevent OpenAI API errors.
-    Tool messages require proper tool_calls context which may not be available.
-    
-    Args:
-        messages: List of messages to filter
-        
-    Returns:
-        List of messages with tool messages removed
-    """
-    filtered_messages = []
-    for message in messages:
-        # Check for tool messages in multiple ways
-        is_tool_message = (
-            hasattr(message, 'type') and message.type == 'tool' or
-            hasattr(message, '__class__') and 'ToolMessage' in str(message.__class__) or
-            hasattr(message, 'role') and message.role == 'tool'
-        )
-        
-        if is_tool_message:
-            logger.debug(f"Filtering out tool message: {message}")
-            continue
-        filtered_messages.append(message)
-    
-    return filtered_messages
-
-
-def clean_state_for_agent(state: State) -> State:
-    """
-    Clean state by filtering out tool messages and ensuring proper structure.
-    
-    Args:
-        state: Original state object
-        
-    Returns:
-        Cleaned state object
-    """
-    try:
-        # Create a copy of the state
-        cleaned_state = state.copy()
-        
-        # Filter out tool messages if messages exist
-        if "messages" in cleaned_state and cleaned_state["messages"]:
-            cleaned_state["messages"] = filter_tool_messages(cleaned_state["messages"])
-            logger.debug(f"Filtered {len(state['messages']) - len(cleaned_state['messages'])} tool messages")
-        
-        return cleaned_state
-        
-    except Exception as e:
-        logger.error(f"Error cleaning state: {str(e)}")
-        # Return original state if cleaning fails
-        return state
 
+def detect_small_talk(state: State) -> Optional[IntentType]:
+    """Detect a pure greeting or farewell in the latest user message."""
+    if os.getenv("CANNED_RESPONSES_ENABLED", "true").lower() != "true":
+        return None
 
-def start(state: State) -> State:
-    """Start agent node."""
-    try:
-        # Clean the state by filtering out tool messages
-        cleaned_state = clean_state_for_agent(state)
-        
-        # Get the current value from the state and use command to route to that node
-        current_agent = cleaned_state.get("current", Node.APPOINTMENT.value)
-        
-        logger.info(f"Start node routing to: {current_agent}")
-        logger.debug(f"State cleaned: {len(state.get('messages', []))} -> {len(cleaned_state.get('messages', []))} messages")
-        
-        # Update the state with cleaned messages
-        state.update(cleaned_state)
-        
-        # Return command to route to the appropriate agent
-        return Command(goto=current_agent)
-        
-    except Exception as e:
-        logger.error(f"Error in start node: {str(e)}")
-        # Fallback to appointment agent
-        return Command(goto=Node.APPOINTMENT.value)
+    messages = state.get("messages", [])
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return None
 
-def appointment(state: State) -> State:
-    """Appointment agent node."""
-    try:
-        logger.info("Starting appointment sub-graph workflow")
-        
-        # State is already cleaned by start node
-        sub_graph = appointment_graph()
-        result = sub_graph.invoke(state)
-        
-        logger.info("Appointment sub-graph completed successfully")
-        logger.info(f"Appointment sub-graph result: {result}")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in appointment sub-graph: {str(e)}")
-        return {
-            "current": state.get("current", "appointment")
-        }
+    return detect_trivial_intent(get_message_content(messages[-1]))
 
-def support(state: State) -> State:
-    """Support agent node."""
-    try:
-        logger.info("Starting support sub-graph workflow")
-        
-        # State is already cleaned by start node
-        result = support_agent_func(state)
-        
-        logger.info("Support sub-graph completed successfully")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in support sub-graph: {str(e)}")
-        return {
-            "current": state.get("current", "support")
-        }
 
-def estimate(state: State) -> State:
-    """Estimate agent node."""
-    try:
-        logger.info("Starting estimate sub-graph workflow")
-        
-        # State is already cleaned by start node
-        result = estimate_agent_func(state)
-        
-        logger.info("Estimate sub-graph completed successfully")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in estimate sub-graph: {str(e)}")
-        return {
-            "current": state.get("current", "estimate")
-        }
+def pre_route(state: State, default: str = Node.ROUTER.value) -> str:
+    """Send sessions over budget to the refusal, greetings/farewells to canned replies; everything else to default."""
+    if over_budget((state.get("metadata") or {}).get("ledger")):
+        return Node.BUDGET_EXCEEDED.value
+    if detect_small_talk(state) is not None:
+        return Node.SMALL_TALK.value
+    return default
+
+
+def small_talk(state: State) -> State:
+    """Answer a greeting or farewell from the canned pool without an LLM call."""
+    intent = detect_small_talk(state) or IntentType.GREETING
+    pool = CANNED_RESPONSES[intent]
+
+    # Rotate through the pool as the conversation grows to avoid repeating the same line
+    response = pool[len(state.get("messages", [])) % len(pool)]
+
+    metrics.inc("canned_responses", intent=intent.value)
+    log_sampled("small_talk", "Canned {} response, skipped router and agent", intent.value)
+
+    return {
+        "messages": [AIMessage(content=response, name="general_agent")]
+    }
+
+
+BUDGET_EXCEEDED_RESPONSE = (
+    "We've reached the limit for this conversation. Please call our office "
+    "or start a new chat and we'll be happy to continue helping you."
+)
 
-def advisor(state: State) -> State:
-    """Advisor agent node."""
+
+def budget_exceeded(state: State) -> State:
+    """Answer without any LLM call once the session has used up its token/cost budget."""
+    metrics.inc("ledger_budget_rejections")
+    logger.warning("Session over budget, skipped router and agent")
+    return {
+        "messages": [AIMessage(content=BUDGET_EXCEEDED_RESPONSE, name="general_agent")]
+    }
+
+
+def ledger(state: State, config: RunnableConfig) -> State:
+    """Fold this turn's LLM token usage, cost and handoff hops into state metadata, per agent."""
     try:
-        logger.info("Starting advisor sub-graph workflow")
-        
-        # State is already cleaned by start node
-        result = advisor_agent_func(state)
-        
-        logger.info("Advisor sub-graph completed successfully")
-        
-        return result
-        
+        # The node's callback manager is parented to this node's run, which the
+        # ledger handler maps back to the turn
+        callbacks = config.get("callbacks")
+        run_id = getattr(callbacks, "parent_run_id", None)
+        metadata = dict(state.get("metadata") or {})
+        metadata["ledger"] = record_turn(metadata.get("ledger"), run_id)
+        metadata["ledger"]["last_turn"]["hops"] = record_hops(state)
+        return {"metadata": metadata}
+
     except Exception as e:
-        logger.error(f"Error in advisor sub-graph: {str(e)}")
-        return {
-            "current": state.get("current", "advisor")
-        }
+        logger.error(f"Error updating token ledger: {str(e)}")
+        return {}
+
+
+def record_hops(state: State) -> int:
+    """Export the turn's handoff hop count (routing_history holds the current turn only)."""
+    hops = len(state.get("routing_history") or [])
+    metrics.inc("handoff_turns")
+    metrics.inc("handoff_hops", hops)
+    return hops
+
+
+def start(state: State) -> Command:
+    """First node of every turn: starts the turn's hop accounting and picks its path."""
+    goto = pre_route(state)
+    log_sampled("routing", "Start node routing to: {}", goto)
+    return Command(goto=goto, update={"routing_history": [NEW_TURN]})
+
+
+def agent_done(state: State, config: RunnableConfig) -> str:
+    """
+    Where an agent goes when its sub-graph returns: the ledger, unless the agent
+    handed the turn off (its latest hop starts at it), in which case the
+    handoff's Command already routes the turn on.
+    """
+    agent = config.get("metadata", {}).get("langgraph_node")
+    hops = state.get("routing_history") or []
+    if hops and hops[-1].split("->")[0] == agent:
+        return END
+    return Node.LEDGER.value
+
+def pending_question(state: State) -> Optional[str]:
+    """The SOP collector's question the turn ended on, if any."""
+    messages = state.get("messages", [])
+    last = messages[-1] if messages else None
+    if isinstance(last, AIMessage) and last.name == SOP_QUESTION and get_message_content(last):
+        return get_message_content(last)
+    return None
+
+
+def after_ledger(state: State, config: RunnableConfig) -> str:
+    """End the turn, or pause it on an SOP question when the run can be resumed (configurable.sop_interrupts)."""
+    if config.get("configurable", {}).get("sop_interrupts", False) and pending_question(state):
+        return Node.AWAIT_ANSWER.value
+    return END
+
+
+def await_answer(state: State) -> Command:
+    """
+    Pause the conversation on the SOP collector's question, after the ledger has
+    recorded the turn. The user's next message resumes the run here as a new
+    turn and goes straight to the appointment agent, without routing again.
+    Greetings/farewells and sessions over budget are not answers: they take
+    their usual path, which leaves the appointment flow.
+    """
+    # Raises on the first run; on resume the node runs again and gets the user's message
+    answer = HumanMessage(content=interrupt({"question": pending_question(state), "node": SOP_QUESTION}))
+    goto = pre_route({**state, "messages": state["messages"] + [answer]}, default=Node.APPOINTMENT.value)
+    if goto == Node.APPOINTMENT.value:
+        metrics.inc("sop_resumes")
+    logger.info("SOP question answered, resuming at {}: {}", goto, preview(answer.content))
+    # start does not run on a resumed turn, so the turn's hop accounting starts here
+    return Command(goto=goto, update={"messages": [answer], "routing_history": [NEW_TURN]})
+
+def reply_agent(message: Any) -> Optional[str]:
+    """The agent that wrote a reply, from the message's name ("general_agent" -> "general"); SOP questions belong to the appointment agent."""
+    name = getattr(message, "name", None) or ""
+    if name == SOP_QUESTION:
+        return Node.APPOINTMENT.value
+    return name[:-len("_agent")] if name.endswith("_agent") else None
 
 # Export all nodes with proper state management
 __all__ = [
+    'pre_route',
+    'small_talk',
+    'budget_exceeded',
+    'ledger',
     'start',
-    'general',
-    'appointment',
-    'support', 
-    'estimate',
-    'advisor'
+    'await_answer',
+    'after_ledger',
+    'reply_agent'
 ]
@@ -0,0 +1,127 @@
+"""
+Graph Registry - Compiled graphs shared by every thread of the process.
+
+Each graph is compiled at most once per registry version: concurrent first
+calls wait on a per-graph lock instead of compiling the same graph in
+parallel. ``reload()`` compiles a new version of every graph built so far
+and swaps them in at once (for prompt or config changes). In-flight calls
+keep using the graph object they already hold. ``reset()`` drops every graph
+atomically. Compiles are counted in ``stats()`` and the ``graph_compiles``
+metric.
+
+Graphs nest: a factory may get() the graphs it embeds (the main graph embeds
+the agent sub-graphs). During ``reload()`` those nested get() calls return the
+version being built, so a reloaded graph never embeds a stale sub-graph.
+"""
+
+import time
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.logger import logger
+from core.metrics import metrics
+
+
+class GraphRegistry:
+    """Compiled graphs by name, built once per version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        # name -> (version, compiled graph)
+        self._graphs: Dict[str, Tuple[int, Any]] = {}
+        self._compiles: Counter = Counter()
+        # Graphs compiled by a reload() running on this thread, not yet swapped in
+        self._staged = threading.local()
+        self.version = 0
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """The current compiled graph for name, compiling it with factory on first use."""
+        staged = getattr(self._staged, "graphs", None)
+        if staged is not None:
+            return self._stage(staged, name, factory)
+
+        entry = self._graphs.get(name)
+        version = self.version
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        with self._lock:
+            self._factories.setdefault(name, factory)
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        with build_lock:
+            # Another thread may have compiled it while we waited
+            entry = self._graphs.get(name)
+            if entry is not None and entry[0] == self.version:
+                return entry[1]
+            version = self.version
+            graph = self._compile(name, factory, version)
+            with self._lock:
+                # A reset or reload during the compile wins; the caller still gets a working graph
+                if self.version == version:
+                    self._graphs[name] = (version, graph)
+            return graph
+
+    def _compile(self, name: str, factory: Callable[[], Any], version: int) -> Any:
+        started = time.perf_counter()
+        graph = factory()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._compiles[name] += 1
+        metrics.inc("graph_compiles", graph=name)
+        logger.info(f"Compiled graph {name} (version {version}) in {elapsed_ms:.1f}ms")
+        return graph
+
+    def _stage(self, staged: Dict[str, Any], name: str, factory: Callable[[], Any]) -> Any:
+        if name not in staged:
+            with self._lock:
+                self._factories.setdefault(name, factory)
+            staged[name] = self._compile(name, factory, self._staged.version)
+        return staged[name]
+
+    def reload(self, names: Optional[List[str]] = None, reason: str = "") -> int:
+        """
+        Compile a new version of the given (default: all built) graphs and swap
+        them in together; returns the new version.
+        """
+        with self._lock:
+            targets = [name for name in (names or list(self._graphs)) if name in self._factories]
+            factories = {name: self._factories[name] for name in targets}
+            next_version = self.version + 1
+
+        # Compile outside the lock: callers keep getting the current version meanwhile
+        self._staged.graphs, self._staged.version = {}, next_version
+        try:
+            for name, factory in factories.items():
+                self._stage(self._staged.graphs, name, factory)
+            compiled = self._staged.graphs
+        finally:
+            self._staged.graphs = None
+
+        with self._lock:
+            self.version = next_version
+            # Graphs not recompiled are rebuilt on their next get()
+            self._graphs = {name: (next_version, graph) for name, graph in compiled.items()}
+        metrics.inc("graph_reloads")
+        logger.info(f"Graph registry reloaded to version {next_version} ({', '.join(compiled) or 'no graphs'})"
+                    + (f": {reason}" if reason else ""))
+        return next_version
+
+    def reset(self) -> None:
+        """Drop every compiled graph; the next get() compiles again."""
+        with self._lock:
+            self.version += 1
+            self._graphs = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "graphs": {name: version for name, (version, _) in self._graphs.items()},
+                "compiles": dict(self._compiles),
+            }
+
+
+graphs = GraphRegistry()
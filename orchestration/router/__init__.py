@@ -7,14 +7,12 @@ and agent nodes for routing and handoff management.
 
 from .graph import (
     create,
-    node,
     get
 )
 from .nodes import router
 
 __all__ = [
     'create',
-    'node',
     'get',
     'router'
 ]
@@ -5,14 +5,16 @@ This sub-graph manages router workflow.
 """
 
 import traceback
-from langgraph.graph import StateGraph, START, END
+from langgraph.graph import StateGraph, MessagesState, START, END
 from orchestration.state import State
 from orchestration.schema import Node
 from .nodes import router
-from core.logger import logger
+from orchestration.registry import graphs
 
 def create():
-    workflow = StateGraph(State)
+    # Only messages flow back: returning the whole State would append
+    # routing_history to itself in the main graph
+    workflow = StateGraph(State, output_schema=MessagesState)
     
     workflow.add_node(Node.ROUTER.value, router)
     workflow.add_edge(START, Node.ROUTER.value)
@@ -20,24 +22,5 @@ def create():
     
     return workflow.compile()
 
-def node(state) -> State:
-    try:
-        logger.info("Starting router sub-graph workflow")
-        
-        sub_graph = create()
-        result = sub_graph.invoke(state)
-        
-        logger.info("Router sub-graph workflow completed")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in router sub-graph: {str(e)}")
-        raise
-
-_router_subgraph = None
-
 def get():
-    global _router_subgraph
-    if _router_subgraph is None:
-        _router_subgraph = create()
-    return _router_subgraph
+    return graphs.get("router", create)
@@ -2,14 +2,70 @@ import traceback
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import MessagesState
 from langgraph.prebuilt import create_react_agent
+from langchain_core.messages import AIMessage
 from langgraph.errors import ParentCommand
-from utils.llm_helpers import create_llm_client
-from utils.agent_handoff import get_handoff_tools
-from utils.helper import format_conversation_history
+from langgraph.types import Command
+from utils.tool_registry import get_tool_registry
+from utils.agent_handoff import hop_limit_reason
 from core.logger import logger
+from core.metrics import metrics
+from orchestration.registry import graphs
 from orchestration.state import State
 from orchestration.schema import Node
 
+# Static system prompt. The conversation follows it as messages, so this prefix
+# stays byte-identical across turns and can be served from the provider prompt cache.
+ROUTER_PROMPT = (
+    "You are a router managing specialized agents. Your ONLY job is to route requests to the appropriate agent.\n\n"
+    "Available agents:\n"
+    "- general: For casual conversation, greetings, general inquiries, and initial customer interactions\n"
+    "- appointment: For booking appointments, scheduling, calendar management, availability checking, and rescheduling\n"
+    "- support: For customer support, warranty claims, technical issues, problem resolution, and ticket creation\n"
+    "- estimate: For price quotes, cost estimates, pricing information, service catalogs, and address verification\n"
+    "- advisor: For business information, service details, recommendations, business hours, and contact information\n\n"
+    "CRITICAL RULES:\n"
+    "1. You MUST ALWAYS transfer to an agent - NEVER respond directly to the user\n"
+    "2. You are NOT allowed to answer questions or provide information yourself\n"
+    "3. Your ONLY action should be to use a handoff tool to transfer to the appropriate agent\n"
+    "4. Provide a clear task description when transferring to an agent\n"
+    "5. Transfer to one agent at a time, do not call agents in parallel\n"
+    "6. If a request comes from another agent (routing request), analyze the reason and route appropriately\n\n"
+    "ROUTING GUIDELINES:\n"
+    "- If the request mentions 'ROUTING REQUEST:', look at the conversation history to find the original user request\n"
+    "- Route based on the original user request, not the routing reason\n"
+    "- Look for the user's actual intent in the conversation history\n"
+    "- Consider the full context when making routing decisions\n"
+    "- If unclear, route to the general agent for initial assessment\n\n"
+    "IMPORTANT: When you see 'ROUTING REQUEST:', the original user request will be shown after 'User's original request:'\n"
+    "Use that original request to determine which agent to route to.\n\n"
+    "The conversation so far follows as messages. The latest user message is the current request.\n\n"
+    "Your task:\n"
+    "- Analyze the user's intent and choose the most appropriate agent\n"
+    "- Use the handoff tools to transfer to the selected agent\n"
+    "- Provide clear task descriptions for the receiving agent\n"
+    "- Be efficient and accurate in routing decisions\n"
+    "- If you see 'ROUTING REQUEST:', find the original user request in the conversation history\n\n"
+    "REMEMBER: You are ONLY a router. Transfer the request to an agent immediately."
+)
+
+def create_agent():
+    tool_registry = get_tool_registry()
+    return create_react_agent(
+        model=tool_registry.bound(Node.ROUTER.value),
+        tools=tool_registry.tools(Node.ROUTER.value),
+        prompt=ROUTER_PROMPT,
+        name="router"
+    )
+
+def get_agent():
+    return graphs.get("router_agent", create_agent)
+
+HANDOFF_FALLBACK_RESPONSE = (
+    "I want to make sure the right person helps you with this. Could you tell me a bit "
+    "more about what you need - booking a visit, a price estimate, help with an existing "
+    "service, or information about our business? You can also call our office anytime."
+)
+
 def router(state) -> State:
     try:
         if not state["messages"]:
@@ -18,58 +74,27 @@ def router(state) -> State:
         last_message = state["messages"][-1]
         task_description = last_message.content if hasattr(last_message, 'content') else str(last_message)
         
-        conversation_context = format_conversation_history(state["messages"])
-        
         if hasattr(state, 'current'):
             state.current = Node.ROUTER.value
         
         if hasattr(state, 'add_routing_decision'):
             state.add_routing_decision("router")
         
-        llm = create_llm_client()
-        tools = get_handoff_tools()
-        
-        agent = create_react_agent(
-            model=llm,
-            tools=tools,
-            prompt=(
-                "You are a router managing specialized agents. Your ONLY job is to route requests to the appropriate agent.\n\n"
-                "Available agents:\n"
-                "- general: For casual conversation, greetings, general inquiries, and initial customer interactions\n"
-                "- appointment: For booking appointments, scheduling, calendar management, availability checking, and rescheduling\n"
-                "- support: For customer support, warranty claims, technical issues, problem resolution, and ticket creation\n"
-                "- estimate: For price quotes, cost estimates, pricing information, service catalogs, and address verification\n"
-                "- advisor: For business information, service details, recommendations, business hours, and contact information\n\n"
-                "CRITICAL RULES:\n"
-                "1. You MUST ALWAYS transfer to an agent - NEVER respond directly to the user\n"
-                "2. You are NOT allowed to answer questions or provide information yourself\n"
-                "3. Your ONLY action should be to use a handoff tool to transfer to the appropriate agent\n"
-                "4. Provide a clear task description when transferring to an agent\n"
-                "5. Transfer to one agent at a time, do not call agents in parallel\n"
-                "6. If a request comes from another agent (routing request), analyze the reason and route appropriately\n\n"
-                "ROUTING GUIDELINES:\n"
-                "- If the request mentions 'ROUTING REQUEST:', look at the conversation history to find the original user request\n"
-                "- Route based on the original user request, not the routing reason\n"
-                "- Look for the user's actual intent in the conversation history\n"
-                "- Consider the full context when making routing decisions\n"
-                "- If unclear, route to the general agent for initial assessment\n\n"
-                "IMPORTANT: When you see 'ROUTING REQUEST:', the original user request will be shown after 'User's original request:'\n"
-                "Use that original request to determine which agent to route to.\n\n"
-                "Previous conversation context:\n"
-                f"{conversation_context}\n\n"
-                "Current user request: {task_description}\n\n"
-                "Your task:\n"
-                "- Analyze the user's intent and choose the most appropriate agent\n"
-                "- Use the handoff tools to transfer to the selected agent\n"
-                "- Provide clear task descriptions for the receiving agent\n"
-                "- Be efficient and accurate in routing decisions\n"
-                "- If you see 'ROUTING REQUEST:', find the original user request in the conversation history\n\n"
-                "REMEMBER: You are ONLY a router. Transfer the request to an agent immediately."
-            ),
-            name="router"
-        )
+        # Agents handing the turn back and forth, or a hop chain over budget,
+        # end the turn with a fixed answer instead of another LLM hop
+        hops = state.get("routing_history") or []
+        reason = hop_limit_reason(hops)
+        if reason:
+            metrics.inc("handoff_fallbacks", reason=reason)
+            logger.warning("Handoff {} after {} hops ({}), answering with the fallback", reason, len(hops), " ".join(hops))
+            # Straight to the main graph's ledger: no agent runs this turn
+            return Command(
+                graph=Command.PARENT,
+                goto=Node.LEDGER.value,
+                update={"messages": [AIMessage(content=HANDOFF_FALLBACK_RESPONSE, name="general_agent")]}
+            )
         
-        response = agent.invoke(state)
+        response = get_agent().invoke(state)
         return response
         
     except ParentCommand as pc:
@@ -8,4 +8,8 @@ class Node(Enum):
     APPOINTMENT = "appointment"
     ESTIMATE = "estimate"
     ADVISOR = "advisor"
-    GENERAL = "general"
\ No newline at end of file
+    GENERAL = "general"
+    SMALL_TALK = "small_talk"
+    LEDGER = "ledger"
+    BUDGET_EXCEEDED = "budget_exceeded"
+    AWAIT_ANSWER = "await_answer"
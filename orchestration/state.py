@@ -1,14 +1,24 @@
 from typing import Dict, Any, Optional, List, TypedDict, Annotated
-from operator import add
+from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage
 from core.logger import logger
 from .schema import Node
 
+# First entry of a routing_history update that starts a new turn
+NEW_TURN = "__new_turn__"
+
+def add_hops(history: List[str], hops: List[str]) -> List[str]:
+    """Append handoff hops ("from->to"); an update starting with NEW_TURN replaces the history."""
+    if hops and hops[0] == NEW_TURN:
+        return list(hops[1:])
+    return (history or []) + (hops or [])
+
 class State(TypedDict):
     current: str
-    messages: Annotated[List[BaseMessage], add]
+    messages: Annotated[List[BaseMessage], add_messages]
     metadata: Dict[str, Any]
-    routing_history: Annotated[List[str], add]
+    # Handoff hops of the current turn
+    routing_history: Annotated[List[str], add_hops]
     sop_steps: Dict[str, Any]
     adherence_percentage: float
     should_route: bool
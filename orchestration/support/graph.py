@@ -8,7 +8,7 @@ import traceback
 from langgraph.graph import StateGraph, START, END
 from .state import State
 from .nodes import support_agent
-from core.logger import logger
+from orchestration.registry import graphs
 
 def create():
     workflow = StateGraph(State)
@@ -20,24 +20,5 @@ def create():
     
     return workflow.compile()
 
-def node(state) -> State:
-    try:
-        logger.info("Starting support agent sub-graph workflow")
-        
-        sub_graph = create()
-        result = sub_graph.invoke(state)
-        
-        logger.info("Support agent sub-graph workflow completed")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error in support agent sub-graph: {str(e)}")
-        raise
-
-_support_subgraph = None
-
 def get():
-    global _support_subgraph
-    if _support_subgraph is None:
-        _support_subgraph = create()
-    return _support_subgraph
+    return graphs.get("support", create)
@@ -2,13 +2,56 @@ import traceback
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import MessagesState
 from langgraph.prebuilt import create_react_agent
-from tools.support_tools import create_support_ticket, check_warranty_status, escalate_ticket
-from utils.llm_helpers import create_llm_client
-from utils.helper import format_conversation_history
-from utils.agent_handoff import get_agent_router_tools
+from utils.tool_registry import get_tool_registry
 from core.logger import logger
+from orchestration.registry import graphs
+from orchestration.schema import Node
 from .state import State
 
+# Static system prompt - no per-turn values, so it stays prompt-cache friendly.
+SUPPORT_PROMPT = (
+    "You are a customer support agent with access to support tools. Your role is to:\n"
+    "1. Handle customer support requests and warranty claims\n"
+    "2. Create support tickets for issues\n"
+    "3. Check warranty status for products\n"
+    "4. Escalate issues when necessary\n"
+    "5. Be empathetic and professional\n"
+    "6. Route to router when requests are outside your scope\n\n"
+    "Available tools:\n"
+    "- create_support_ticket(issue_type, description, priority): Create a new support ticket\n"
+    "- check_warranty_status(product_id): Check warranty status for a product\n"
+    "- escalate_ticket(ticket_id, reason): Escalate an existing ticket\n"
+    "- route_to_router(reason): Route to router when request is outside support scope\n\n"
+    "When to route to router:\n"
+    "- User asks about appointment booking → Route to appointment agent (scheduling specialist)\n"
+    "- User asks about pricing or estimates → Route to estimate agent (pricing specialist)\n"
+    "- User asks about business information or recommendations → Route to advisor agent (information specialist)\n"
+    "- User asks general questions → Route to general agent (conversation specialist)\n"
+    "- Unclear or ambiguous requests → Route to router for proper agent selection\n\n"
+    "The conversation so far follows as messages. The latest user message is the current request.\n\n"
+    "Instructions:\n"
+    "- If the user has a support issue, use create_support_ticket\n"
+    "- If the user wants to check warranty, use check_warranty_status\n"
+    "- If an issue needs escalation, use escalate_ticket\n"
+    "- If the request is outside support scope, use route_to_router\n"
+    "- Be empathetic and understanding of customer frustrations\n"
+    "- Provide clear next steps and expectations\n"
+    "- Remember details from the conversation and build upon them\n\n"
+    "Respond in a helpful, professional manner that builds upon the conversation context."
+)
+
+def create_agent():
+    tool_registry = get_tool_registry()
+    return create_react_agent(
+        model=tool_registry.bound(Node.SUPPORT.value),
+        tools=tool_registry.tools(Node.SUPPORT.value),
+        prompt=SUPPORT_PROMPT,
+        name="support_agent"
+    )
+
+def get_agent():
+    return graphs.get("support_agent", create_agent)
+
 def support_agent(state) -> State:
     try:
         if not state["messages"]:
@@ -17,57 +60,10 @@ def support_agent(state) -> State:
         last_message = state["messages"][-1]
         task_description = last_message.content if hasattr(last_message, 'content') else str(last_message)
         
-        conversation_context = format_conversation_history(state["messages"])
-        
         if hasattr(state, 'set_workflow_step'):
             state.set_workflow_step("support_handling")
         
-        llm = create_llm_client()
-        
-        # Include both support tools and router tools
-        support_tools = [create_support_ticket, check_warranty_status, escalate_ticket]
-        router_tools = get_agent_router_tools()
-        all_tools = support_tools + router_tools
-        
-        agent = create_react_agent(
-            model=llm,
-            tools=all_tools,
-            prompt=(
-                "You are a customer support agent with access to support tools. Your role is to:\n"
-                "1. Handle customer support requests and warranty claims\n"
-                "2. Create support tickets for issues\n"
-                "3. Check warranty status for products\n"
-                "4. Escalate issues when necessary\n"
-                "5. Be empathetic and professional\n"
-                "6. Route to router when requests are outside your scope\n\n"
-                "Available tools:\n"
-                "- create_support_ticket(issue_type, description, priority): Create a new support ticket\n"
-                "- check_warranty_status(product_id): Check warranty status for a product\n"
-                "- escalate_ticket(ticket_id, reason): Escalate an existing ticket\n"
-                "- route_to_router(reason): Route to router when request is outside support scope\n\n"
-                "When to route to router:\n"
-                "- User asks about appointment booking → Route to appointment agent (scheduling specialist)\n"
-                "- User asks about pricing or estimates → Route to estimate agent (pricing specialist)\n"
-                "- User asks about business information or recommendations → Route to advisor agent (information specialist)\n"
-                "- User asks general questions → Route to general agent (conversation specialist)\n"
-                "- Unclear or ambiguous requests → Route to router for proper agent selection\n\n"
-                "Previous conversation context:\n"
-                f"{conversation_context}\n\n"
-                "Current user request: {task_description}\n\n"
-                "Instructions:\n"
-                "- If the user has a support issue, use create_support_ticket\n"
-                "- If the user wants to check warranty, use check_warranty_status\n"
-                "- If an issue needs escalation, use escalate_ticket\n"
-                "- If the request is outside support scope, use route_to_router\n"
-                "- Be empathetic and understanding of customer frustrations\n"
-                "- Provide clear next steps and expectations\n"
-                "- Remember details from the conversation and build upon them\n\n"
-                "Respond in a helpful, professional manner that builds upon the conversation context."
-            ),
-            name="support_agent"
-        )
-        
-        response = agent.invoke(state)
+        response = get_agent().invoke(state)
         return response
         
     except Exception as e:
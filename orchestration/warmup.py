@@ -0,0 +1,91 @@
+"""
+Warm-up - Pay one-time startup costs before the first turn.
+
+``warmup()`` loads the prompt templates, creates the LLM client of every node,
+builds every agent's tools and their JSON schemas (see utils.tool_registry;
+the schema-generation time is logged) and compiles the graphs, so the first
+conversation after a start does not pay for them. It returns the time spent
+per stage in milliseconds. Entry points call it once at startup; calling it
+again is cheap.
+"""
+
+import time
+import importlib
+from typing import Dict
+from core.logger import logger
+from .schema import Node
+
+# Nodes with their own LLM client (kept by utils.tool_registry, see client())
+LLM_NODES = [
+    Node.ROUTER.value,
+    Node.GENERAL.value,
+    Node.SUPPORT.value,
+    Node.ESTIMATE.value,
+    Node.ADVISOR.value,
+    "sop_collector",
+    "booking_agent",
+]
+
+# Agent modules whose react agent is built once (get_agent())
+AGENT_MODULES = [
+    "orchestration.router.nodes",
+    "orchestration.general.nodes",
+    "orchestration.support.nodes",
+    "orchestration.estimate.nodes",
+    "orchestration.advisor.nodes",
+]
+
+
+def _templates() -> None:
+    from utils.template_registry import get_template_registry
+    get_template_registry().preload()
+
+
+def _llm_clients() -> None:
+    from utils.tool_registry import get_tool_registry
+    for node in LLM_NODES:
+        get_tool_registry().client(node)
+
+
+def _tool_schemas() -> None:
+    from utils.tool_registry import get_tool_registry
+    get_tool_registry().preload()
+
+
+def _graphs(persistent: bool) -> None:
+    from .graph import get, get_persistent
+    get()
+    for module_name in AGENT_MODULES:
+        importlib.import_module(module_name).get_agent()
+    if persistent:
+        get_persistent()
+
+
+def warmup(persistent: bool = False) -> Dict[str, float]:
+    """
+    Run every warm-up stage and return its duration in ms.
+
+    Args:
+        persistent: Also compile the checkpointer-backed graph (services with thread_ids)
+    """
+    stages = [
+        ("templates", _templates),
+        ("llm_clients", _llm_clients),
+        ("tool_schemas", _tool_schemas),
+        ("graphs", lambda: _graphs(persistent)),
+    ]
+    timings: Dict[str, float] = {}
+    for name, stage in stages:
+        started = time.perf_counter()
+        try:
+            stage()
+        except Exception as e:
+            # A failed stage is paid on the first turn instead
+            logger.error(f"Warm-up stage {name} failed: {str(e)}")
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    logger.info(
+        "Warm-up finished in {:.1f}ms ({})",
+        sum(timings.values()), ", ".join(f"{name} {ms:.1f}ms" for name, ms in timings.items())
+    )
+    return timings
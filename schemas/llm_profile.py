@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+class LLMProfile(BaseModel):
+    tier: str = Field(default="default", description="Tier name the profile belongs to (e.g. fast, standard, strong)")
+    model: str = Field(description="Chat model name")
+    temperature: float = Field(default=0.1, ge=0.0, le=2.0, description="Sampling temperature")
+    max_tokens: Optional[int] = Field(default=None, ge=1, description="Maximum completion tokens")
+    timeout: Optional[float] = Field(default=None, gt=0, description="Request timeout in seconds")
+
+class ModelPricing(BaseModel):
+    input: float = Field(ge=0.0, description="USD per 1M uncached prompt tokens")
+    cached_input: float = Field(ge=0.0, description="USD per 1M cached prompt tokens")
+    output: float = Field(ge=0.0, description="USD per 1M completion tokens")
+
+class LLMProfilesConfig(BaseModel):
+    tiers: Dict[str, LLMProfile] = Field(default_factory=dict, description="Named model profiles")
+    nodes: Dict[str, str] = Field(default_factory=dict, description="Node name to tier name mapping")
+    default: Optional[str] = Field(default=None, description="Tier used for nodes without a mapping")
+    pricing: Dict[str, ModelPricing] = Field(default_factory=dict, description="Per-model pricing overrides")
@@ -0,0 +1,15 @@
+"""
+Server Package - HTTP service for the orchestration graph.
+
+An ASGI app exposing conversations keyed by thread_id, with server-sent
+event streaming of tokens and agent switches.
+"""
+
+from .app import app, ConversationApp, SessionScheduler, run_turn
+
+__all__ = [
+    'app',
+    'ConversationApp',
+    'SessionScheduler',
+    'run_turn'
+]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Run the conversation service.
+
+Usage:
+    python -m server [--host 127.0.0.1] [--port 8000]
+
+Needs an ASGI server (uvicorn); any other ASGI server can serve server.app:app.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve conversations over HTTP with SSE streaming")
+    parser.add_argument("--host", default=os.getenv("SERVER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVER_PORT", "8000")))
+    args = parser.parse_args()
+
+    # Loaded before uvicorn imports the app: modules such as core.logger read their settings at import
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("Error: uvicorn is required to run the service (pip install uvicorn)")
+        sys.exit(1)
+
+    # One worker: conversation state lives in the in-process checkpointer
+    uvicorn.run("server.app:app", host=args.host, port=args.port, workers=1, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
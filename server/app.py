@@ -0,0 +1,351 @@
+"""
+HTTP Service - ASGI app serving conversations over server-sent events.
+
+Routes:
+
+- ``POST /conversations/{thread_id}/messages`` with ``{"content": "..."}`` runs
+  one turn. With ``Accept: text/event-stream`` the reply streams as events:
+  ``agent`` (``{"agent"}``, whenever a different agent starts answering),
+  ``token`` (``{"content", "agent", "message_id"}``), ``message`` (the final reply,
+  ``{"content", "agent"}``), then ``done`` (``{"thread_id", "llm_calls",
+  "prompt_tokens", "completion_tokens", "cost_usd", "hops", "elapsed_ms"}``) or ``error`` (``{"detail"}``). Other clients
+  get the final reply as one JSON object.
+- ``GET /conversations/{thread_id}`` returns the stored conversation, with the
+  SOP question it is paused on (``pending_question``), if any.
+- ``DELETE /conversations/{thread_id}`` forgets it.
+- ``GET /health`` reports active turns, sessions and graph compiles.
+
+Conversation state lives in the checkpointer of
+``orchestration.graph.get_persistent()``, keyed by thread_id, so clients send
+only the new message; a message to a conversation paused on an SOP question
+resumes the appointment flow with it (greetings, farewells and sessions over
+budget take their usual path instead). Turns of one conversation run
+strictly in arrival order. ``SERVER_MAX_CONCURRENT_TURNS`` bounds the turns
+running at once.
+``SERVER_MAX_PENDING_PER_SESSION`` bounds the turns queued per conversation
+(answered with 429 beyond that). A turn that cannot start within
+``SERVER_QUEUE_TIMEOUT_SECONDS`` is answered with 503.
+
+The app only needs an ASGI server; see ``python -m server``.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langgraph.types import Command
+from core.logger import logger, enable_file_logging
+from core.metrics import metrics
+from core.profiling import profile_requested
+from core.telemetry import node_path
+from orchestration.graph import get_persistent, get_checkpointer
+from orchestration.nodes import reply_agent
+from orchestration.registry import graphs
+from orchestration.state import create as create_state
+from orchestration.schema import Node
+from orchestration.warmup import warmup
+
+THREAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+ROUTES = [
+    (re.compile(r"^/conversations/([^/]+)/messages/?$"), "messages"),
+    (re.compile(r"^/conversations/([^/]+)/?$"), "conversation"),
+    (re.compile(r"^/health/?$"), "health"),
+]
+
+# Nodes whose model output is internal and never streamed to the client
+SILENT_AGENTS = {Node.ROUTER.value}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class SessionScheduler:
+    """Runs turns of one conversation in arrival order, within a global concurrency limit."""
+
+    def __init__(self, max_concurrent: int = 32, max_pending_per_session: int = 4, queue_timeout: float = 30.0):
+        self.max_pending_per_session = max_pending_per_session
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # thread_id -> [lock, turns queued or running]
+        self._sessions: Dict[str, List[Any]] = {}
+        self.active_turns = 0
+
+    @property
+    def sessions(self) -> int:
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def slot(self, thread_id: str):
+        session = self._sessions.setdefault(thread_id, [asyncio.Lock(), 0])
+        if session[1] >= self.max_pending_per_session:
+            metrics.inc("server_rejected_turns", reason="session_busy")
+            raise HTTPError(429, f"Too many pending messages for conversation {thread_id}")
+
+        session[1] += 1
+        acquired_lock = acquired_slot = False
+        try:
+            try:
+                deadline = time.monotonic() + self.queue_timeout
+                await asyncio.wait_for(session[0].acquire(), self.queue_timeout)
+                acquired_lock = True
+                await asyncio.wait_for(self._semaphore.acquire(), max(deadline - time.monotonic(), 0.001))
+                acquired_slot = True
+            except asyncio.TimeoutError:
+                metrics.inc("server_rejected_turns", reason="queue_timeout")
+                raise HTTPError(503, "Server busy, try again later")
+            self.active_turns += 1
+            yield
+        finally:
+            if acquired_slot:
+                self.active_turns -= 1
+                self._semaphore.release()
+            if acquired_lock:
+                session[0].release()
+            session[1] -= 1
+            if session[1] == 0:
+                self._sessions.pop(thread_id, None)
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", "")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content if isinstance(content, str) else str(content)
+
+
+def _pending_question(snapshot: Any) -> Optional[str]:
+    """The SOP question a paused conversation is waiting on, if any."""
+    for pending in snapshot.interrupts or ():
+        if isinstance(pending.value, dict) and pending.value.get("question"):
+            return pending.value["question"]
+    return None
+
+
+async def run_turn(thread_id: str, content: str, profile: bool = False) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Run one turn of a conversation, yielding (event, data) pairs as the reply is produced."""
+    graph = get_persistent()
+    config: Dict[str, Any] = {"configurable": {"thread_id": thread_id}}
+    if profile:
+        config["metadata"] = {"profile": True}
+
+    started = time.perf_counter()
+    snapshot = await graph.aget_state(config)
+    message = HumanMessage(content=content)
+    if snapshot.interrupts:
+        # The conversation is paused on an SOP question: the run resumes with the
+        # message, which goes back to the appointment agent unless it is small talk
+        turn_input: Any = Command(resume={pending.id: content for pending in snapshot.interrupts})
+    elif snapshot.values:
+        turn_input = {"messages": [message]}
+    else:
+        turn_input = create_state()
+        turn_input["messages"] = [message]
+
+    agent = None
+    # Agents are react agents / sub-graphs invoked inside nodes; their tokens only stream with subgraphs=True
+    async for _, (chunk, metadata) in graph.astream(turn_input, config, stream_mode="messages", subgraphs=True):
+        if not isinstance(chunk, (AIMessage, AIMessageChunk)):
+            continue
+        text = _message_text(chunk)
+        node = metadata.get("langgraph_node")
+        speaker = node_path(node, metadata).split("/")[0] if node else "assistant"
+        if not text or speaker in SILENT_AGENTS:
+            continue
+        if speaker != agent:
+            agent = speaker
+            yield "agent", {"agent": agent}
+        yield "token", {"content": text, "agent": agent, "message_id": chunk.id}
+
+    snapshot = await graph.aget_state(config)
+    values = snapshot.values or {}
+    if snapshot.interrupts:
+        # Paused on an SOP question, which the next message answers
+        yield "message", {"content": _pending_question(snapshot), "agent": agent or Node.APPOINTMENT.value}
+    else:
+        reply = next(
+            (m for m in reversed(values.get("messages", [])) if isinstance(m, BaseMessage) and m.type == "ai" and _message_text(m)),
+            None
+        )
+        # The reply's author; replies that never streamed (FAQ answers, small talk) are known only by name
+        yield "message", {"content": _message_text(reply) if reply else "", "agent": reply_agent(reply) or agent}
+    # The ledger records every turn, paused ones included, before it ends
+    turn_usage = (values.get("metadata") or {}).get("ledger", {}).get("last_turn", {})
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    metrics.inc("server_turns")
+    yield "done", {
+        "thread_id": thread_id,
+        "llm_calls": turn_usage.get("llm_calls"),
+        "prompt_tokens": turn_usage.get("prompt_tokens"),
+        "completion_tokens": turn_usage.get("completion_tokens"),
+        "cost_usd": turn_usage.get("cost_usd"),
+        "hops": turn_usage.get("hops"),
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class ConversationApp:
+    """Framework-free ASGI application; mount it in any ASGI server."""
+
+    def __init__(self, scheduler: Optional[SessionScheduler] = None):
+        self.scheduler = scheduler or SessionScheduler(
+            max_concurrent=int(os.getenv("SERVER_MAX_CONCURRENT_TURNS", "32")),
+            max_pending_per_session=int(os.getenv("SERVER_MAX_PENDING_PER_SESSION", "4")),
+            queue_timeout=float(os.getenv("SERVER_QUEUE_TIMEOUT_SECONDS", "30")),
+        )
+
+    async def __call__(self, scope: Dict[str, Any], receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        try:
+            await self._dispatch(scope, receive, send)
+        except HTTPError as e:
+            await self._json(send, e.status, {"detail": e.detail})
+        except Exception as e:
+            logger.error(f"Error handling {scope.get('method')} {scope.get('path')}: {str(e)}")
+            await self._json(send, 500, {"detail": "Internal server error"})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    # Compile graphs and build clients before the first request
+                    enable_file_logging()
+                    warmup(persistent=True)
+                    logger.info("Conversation service started")
+                    await send({"type": "lifespan.startup.complete"})
+                except Exception as e:
+                    logger.error(f"Error starting conversation service: {str(e)}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope: Dict[str, Any], receive, send) -> None:
+        path, method = scope["path"], scope["method"]
+        for pattern, route in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            raise HTTPError(404, "Not found")
+
+        if route == "health":
+            if method != "GET":
+                raise HTTPError(405, "Method not allowed")
+            registry = graphs.stats()
+            await self._json(send, 200, {
+                "status": "ok",
+                "active_turns": self.scheduler.active_turns,
+                "sessions": self.scheduler.sessions,
+                "graph_version": registry["version"],
+                "graph_compiles": registry["compiles"],
+            })
+            return
+
+        thread_id = match.group(1)
+        if not THREAD_ID_PATTERN.match(thread_id):
+            raise HTTPError(400, "Invalid thread_id")
+
+        if route == "messages":
+            if method != "POST":
+                raise HTTPError(405, "Method not allowed")
+            await self._post_message(scope, receive, send, thread_id)
+        elif method == "GET":
+            await self._get_conversation(send, thread_id)
+        elif method == "DELETE":
+            await get_checkpointer().adelete_thread(thread_id)
+            await self._json(send, 200, {"thread_id": thread_id, "deleted": True})
+        else:
+            raise HTTPError(405, "Method not allowed")
+
+    async def _post_message(self, scope: Dict[str, Any], receive, send, thread_id: str) -> None:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        try:
+            content = json.loads(body or b"{}").get("content")
+        except (ValueError, AttributeError):
+            raise HTTPError(400, "Body must be a JSON object")
+        if not isinstance(content, str) or not content.strip():
+            raise HTTPError(400, "'content' must be a non-empty string")
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        streaming = "text/event-stream" in headers.get("accept", "")
+        profile = profile_requested(headers)
+
+        async with self.scheduler.slot(thread_id):
+            if not streaming:
+                reply: Dict[str, Any] = {"thread_id": thread_id}
+                async for event, data in run_turn(thread_id, content, profile):
+                    if event == "message":
+                        reply.update(data)
+                    elif event == "done":
+                        reply.update(data)
+                await self._json(send, 200, reply)
+                return
+
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            })
+            try:
+                async for event, data in run_turn(thread_id, content, profile):
+                    await send({"type": "http.response.body", "body": _sse(event, data), "more_body": True})
+            except Exception as e:
+                logger.error(f"Error in turn for conversation {thread_id}: {str(e)}")
+                metrics.inc("server_turn_errors")
+                await send({"type": "http.response.body", "body": _sse("error", {"detail": str(e)}), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _get_conversation(self, send, thread_id: str) -> None:
+        snapshot = await get_persistent().aget_state({"configurable": {"thread_id": thread_id}})
+        if not snapshot.values:
+            raise HTTPError(404, f"Unknown conversation {thread_id}")
+        values = snapshot.values
+        await self._json(send, 200, {
+            "thread_id": thread_id,
+            "messages": [
+                {"type": m.type, "content": _message_text(m), "name": m.name}
+                for m in values.get("messages", []) if isinstance(m, BaseMessage) and m.type in ("human", "ai") and _message_text(m)
+            ],
+            "ledger": (values.get("metadata") or {}).get("ledger"),
+            "pending_question": _pending_question(snapshot),
+        })
+
+    @staticmethod
+    async def _json(send, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+app = ConversationApp()
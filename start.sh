@@ -117,60 +117,8 @@ run_interactive() {
     print_status "Type 'quit', 'exit', or 'bye' to end"
     echo ""
     
-    # Create a simple interactive loop
-    while true; do
-        echo -n "You: "
-        read -r user_input
-        
-        if [[ "$user_input" =~ ^(quit|exit|bye|q)$ ]]; then
-            echo "Goodbye!"
-            break
-        fi
-        
-        if [[ -n "$user_input" ]]; then
-            # Create a temporary script to run main.py with input
-            echo "#!/usr/bin/env python3
-import os
-import sys
-from pathlib import Path
-from dotenv import load_dotenv
-
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
-from orchestration.graph import get as get_graph
-from orchestration.state import create as create_state
-from utils.llm_helpers import initialize_langsmith
-from langchain_core.messages import HumanMessage
-
-def main():
-    load_dotenv()
-    
-    if not os.getenv('OPENAI_API_KEY'):
-        print('Error: OPENAI_API_KEY required')
-        return
-    
-    initialize_langsmith()
-    
-    state = create_state()
-    state['messages'] = [HumanMessage(content='$user_input')]
-    
-    graph = get_graph()
-    for chunk in graph.stream(state):
-        if 'messages' in chunk and len(chunk['messages']) > 0:
-            last_message = chunk['messages'][-1]
-            if hasattr(last_message, 'type') and last_message.type == 'ai':
-                print(f'Assistant: {last_message.content}')
-                break
-
-if __name__ == '__main__':
-    main()" > temp_main.py
-            
-            python3 temp_main.py
-            rm temp_main.py
-            echo ""
-        fi
-    done
+    # One conversation: state is kept between turns and replies stream as they arrive
+    python3 main.py --interactive
 }
 
 # Function to run tests
@@ -1,161 +1,212 @@
 #!/usr/bin/env python3
 """
 Simple Streamlit App for LangGraph Multi-Agent Orchestration System
+
+Turns run on a background worker (one event loop shared by all sessions,
+held with st.cache_resource together with the warmed-up graph). The script
+thread only renders, streaming the reply's tokens as they arrive. Session
+state holds just the conversation's thread_id. Messages live only in the
+graph's checkpointer: a rerun reads the conversation from it and renders the
+last STREAMLIT_RENDER_LIMIT messages, without running the graph.
 """
 
 import os
 import sys
+import time
+import uuid
+import asyncio
+import threading
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 import streamlit as st
-from datetime import datetime
-from core.logger import logger
+from dotenv import load_dotenv
+
+# Before any project import: modules such as core.logger read their settings at import
+load_dotenv()
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from orchestration.graph import get as get_graph
-from orchestration.state import create as create_state
+from core.logger import logger, enable_file_logging
+from orchestration.graph import get_persistent, get_checkpointer
+from orchestration.nodes import reply_agent
+from orchestration.warmup import warmup
+from server import run_turn
 from utils.llm_helpers import initialize_langsmith
-from langchain_core.messages import HumanMessage
-
-def process_message(current_state=None):
-    """Process a single message through the graph"""
-    try:
-        # Initialize or use existing state
-        if current_state is None:
-            current_state = create_state()
-        
-        logger.info(f"Current state: {current_state}")
-
-
-        # Ensure the state has the proper structure
-        if "messages" not in current_state:
-            current_state["messages"] = []
-        
-        logger.info(f"Starting graph execution with {len(current_state['messages'])} messages")
-        
-        # Get graph and process
-        graph = get_graph()
-        the_response = ""
-        the_agent = "Unknown"
-        
-        for chunk in graph.stream(current_state):
-            
-            # Always update final_state to the latest chunk
-            final_state = chunk
-            
-            logger.info(f"Processing chunk with keys: {list(chunk.keys())}")
-            if "messages" in chunk:
-                logger.info(f"Chunk has {len(chunk['messages'])} messages")
-            
-            # Check for any agent response in the chunk
-            for agent_name, state in chunk.items():
-
-                logger.info(f"Agent name: {agent_name}")
-                logger.info(f"State: {state}")
-                
-                if state and isinstance(state, dict):
-                    messages = state.get("messages", [])
-                    if len(messages) > 0:
-                        last_message = messages[-1]
-                        the_response = last_message
-                        the_agent = agent_name
-
-        return the_response, the_agent
-        
-    except Exception as e:
-        st.error(f"Error: {str(e)}")
-        return "Error processing message", "Error"
+
+RENDER_LIMIT = int(os.getenv("STREAMLIT_RENDER_LIMIT", "50"))
+
+
+class Turn:
+    """One running turn; the worker fills it in, the script thread renders it."""
+
+    def __init__(self, thread_id: str, text: str):
+        self.thread_id = thread_id
+        self.text = text
+        self.agent: Optional[str] = None
+        self.tokens: List[str] = []
+        self.reply: Optional[Dict[str, Any]] = None
+        self.stats: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.started = time.perf_counter()
+        self.first_token_ms: Optional[float] = None
+        self.done = threading.Event()
+
+    def partial(self) -> str:
+        return "".join(self.tokens)
+
+
+class TurnWorker:
+    """Runs turns on a background event loop and reads transcripts from the checkpointer."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="streamlit-turns", daemon=True)
+        self.thread.start()
+        self._lock = threading.Lock()
+        self._active: Dict[str, Turn] = {}
+
+    def submit(self, thread_id: str, text: str) -> Turn:
+        turn = Turn(thread_id, text)
+        with self._lock:
+            self._active[thread_id] = turn
+        asyncio.run_coroutine_threadsafe(self._run(turn), self.loop)
+        return turn
+
+    async def _run(self, turn: Turn) -> None:
+        try:
+            async for event, data in run_turn(turn.thread_id, turn.text):
+                if event == "agent":
+                    turn.agent = data["agent"]
+                elif event == "token":
+                    if turn.first_token_ms is None:
+                        turn.first_token_ms = (time.perf_counter() - turn.started) * 1000
+                    turn.tokens.append(data["content"])
+                elif event == "message":
+                    turn.reply = data
+                elif event == "done":
+                    turn.stats = data
+        except Exception as e:
+            logger.error(f"Error in turn for conversation {turn.thread_id}: {str(e)}")
+            turn.error = str(e)
+        finally:
+            with self._lock:
+                self._active.pop(turn.thread_id, None)
+            turn.done.set()
+
+    def transcript(self, thread_id: str, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """The last limit display messages of a thread, read from the checkpointer, and the total count."""
+        snapshot = get_persistent().get_state({"configurable": {"thread_id": thread_id}})
+        # Named human messages are agent handoffs (the router's task description), not user input
+        messages = [
+            {"role": "user", "content": m.content} if m.type == "human"
+            else {"role": "assistant", "content": m.content, "agent": reply_agent(m)}
+            for m in (snapshot.values or {}).get("messages", [])
+            if m.type in ("human", "ai") and isinstance(m.content, str) and m.content
+            and not (m.type == "human" and m.name)
+        ]
+        # A running turn's message is checkpointed only once the run records it
+        turn = self.active(thread_id)
+        last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), None)
+        if turn is not None and last_user != turn.text:
+            messages.append({"role": "user", "content": turn.text})
+        return messages[-limit:], len(messages)
+
+    def active(self, thread_id: str) -> Optional[Turn]:
+        with self._lock:
+            return self._active.get(thread_id)
+
+    def forget(self, thread_id: str) -> None:
+        get_checkpointer().delete_thread(thread_id)
+
+
+@st.cache_resource(show_spinner="Initializing system...")
+def get_worker() -> TurnWorker:
+    """Process-wide worker; the graph, LLM clients and templates are warmed up once."""
+    enable_file_logging()
+    initialize_langsmith()
+    warmup(persistent=True)
+    return TurnWorker()
+
+
+def render_turn(turn: Turn) -> None:
+    """Stream a running turn's tokens into the page until it finishes."""
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        shown = None
+        while True:
+            finished = turn.done.wait(0.05)
+            text = turn.partial()
+            if text != shown:
+                placeholder.markdown(f"**{turn.agent or 'assistant'}**: {text}▌")
+                shown = text
+            if finished:
+                break
+    if turn.error:
+        st.error(f"Error: {turn.error}")
+        return
+    st.session_state.last_turn = {
+        "ttft_ms": turn.first_token_ms,
+        "total_ms": (time.perf_counter() - turn.started) * 1000,
+        "llm_calls": turn.stats.get("llm_calls"),
+    }
+    st.rerun()
+
 
 def main():
     st.title("🤖 Multi-Agent Orchestration System")
     st.markdown("---")
-    
-    # Initialize session state
-    if "graph_state" not in st.session_state:
-        st.session_state.graph_state = create_state()
-    
-    the_messages = st.session_state.graph_state['messages']
-    the_current = st.session_state.graph_state['current']
-
-    logger.info(f"Messages: {the_messages}")
-    logger.info(f"Current: {the_current}")
-    
-    # Initialize system on first run
-    if st.session_state.graph_state is None:
-        with st.spinner("Initializing system..."):
-            initialize_langsmith()
-            st.session_state.graph_state = create_state()
-
-    logger.info(f"Messages: {the_messages}")
-    
+
+    worker = get_worker()
+
+    # The conversation itself is in the checkpointer; the session only knows which one
+    if "thread_id" not in st.session_state:
+        st.session_state.thread_id = f"streamlit-{uuid.uuid4().hex[:12]}"
+    thread_id = st.session_state.thread_id
+
     # Display chat messages
-    for message in the_messages:
-        if message.type == "human":
-            st.chat_message("user").write(message.content)
+    messages, total = worker.transcript(thread_id, RENDER_LIMIT)
+    if total > len(messages):
+        st.caption(f"{total - len(messages)} earlier messages not shown")
+    for message in messages:
+        if message["role"] == "user":
+            st.chat_message("user").write(message["content"])
         else:
-            # Check if this is a tool response
-            if "Tool Response:" in message.content:
-                # Display tool responses with a different style
-                with st.chat_message("assistant"):
-                    st.markdown("🔧 **Tool Response**")
-                    st.write(message.content.replace("Tool Response: ", ""))
-            else:
-                st.chat_message("assistant").write(message.content)
-    
-    # Chat input
-    if prompt := st.chat_input("Type your message here..."):
-        # Add user message to chat
-        the_messages.append(HumanMessage(content=prompt))
+            st.chat_message("assistant").write(f"**{message.get('agent') or 'assistant'}**: {message['content']}")
+
+    # A turn still running (e.g. after a rerun) is re-attached and keeps streaming
+    turn = worker.active(thread_id)
+    prompt = st.chat_input("Type your message here...", disabled=turn is not None)
+    if turn is None and prompt:
         st.chat_message("user").write(prompt)
-        
-        # Process message
-        with st.spinner("Processing..."):
-            response, agent_name = process_message(
-                st.session_state.graph_state
-            )
-        
-        # Add assistant response to chat
-        the_messages.append(response)
-        the_current = agent_name
-
-        # print messages
-        st.chat_message("assistant").write(f"**{agent_name}**: {response.content}")
-
-        st.session_state.graph_state["messages"] = the_messages
-        st.session_state.graph_state["current"] = the_current
-    
-    logger.info(f"Messages: {the_messages}")
+        turn = worker.submit(thread_id, prompt)
+    if turn is not None:
+        render_turn(turn)
 
     # Sidebar with controls
     with st.sidebar:
         st.header("Controls")
-        
+
         # Clear chat button
         if st.button("🗑️ Clear Chat"):
-            the_messages = []
-            the_current = "start"
-            st.session_state.graph_state = create_state()
+            worker.forget(thread_id)
+            del st.session_state.thread_id
+            st.session_state.pop("last_turn", None)
             st.rerun()
-        
-        # Show current state info
+
+        # Show current conversation info
         st.header("System Info")
-        if st.session_state.graph_state:
-            st.write(f"Messages in state: {len(st.session_state.graph_state.get('messages', []))}")
-            st.write(f"Current agent: {st.session_state.graph_state.get('current', 'N/A')}")
-            st.write(f"Chat messages: {len(the_messages)}")
-            
-            # Show message types in current state
-            if "messages" in st.session_state.graph_state:
-                message_types = []
-                for msg in st.session_state.graph_state["messages"]:
-                    if hasattr(msg, 'type'):
-                        message_types.append(msg.type)
-                if message_types:
-                    st.write(f"Message types: {', '.join(message_types[-5:])}")  # Show last 5
-        
-        
+        st.write(f"Conversation: {thread_id}")
+        st.write(f"Messages: {total}")
+        if messages and messages[-1]["role"] == "assistant":
+            st.write(f"Current agent: {messages[-1].get('agent') or 'N/A'}")
+        last_turn = st.session_state.get("last_turn")
+        if last_turn:
+            ttft = f"{last_turn['ttft_ms']:.0f} ms" if last_turn["ttft_ms"] is not None else "n/a"
+            st.write(f"Last turn: first token {ttft}, total {last_turn['total_ms']:.0f} ms, "
+                     f"{last_turn['llm_calls'] or 0} LLM calls")
+
         # Help section
         st.header("Help")
         st.markdown("""
@@ -0,0 +1,17 @@
+import os
+
+# Offline, instant model for every test; set before any module reads the environment
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ["FAKE_LLM_LATENCY_MS"] = "0"
+os.environ["FAKE_LLM_TOKEN_LATENCY_MS"] = "0"
+
+import pytest
+
+
+@pytest.fixture
+def fresh_graphs():
+    """Compile the graphs (and their agents' tools and clients) from scratch, and drop them afterwards."""
+    from orchestration.graph import reset
+    reset()
+    yield
+    reset()
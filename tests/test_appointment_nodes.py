@@ -0,0 +1,56 @@
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from orchestration.appointment import nodes
+from utils.llm_cassette import CassetteMissError
+
+
+class FailingModel:
+    """Stands in for an LLM client whose every call raises."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def _fail(self, *args, **kwargs):
+        raise self.error
+
+    def invoke(self, *args, **kwargs):
+        self._fail()
+
+    def with_structured_output(self, *args, **kwargs):
+        return RunnableLambda(self._fail)
+
+
+class FailingRegistry:
+    def __init__(self, error):
+        self.model = FailingModel(error)
+
+    def client(self, node):
+        return self.model
+
+    def bound(self, node):
+        return self.model
+
+
+def state():
+    return {"messages": [HumanMessage(content="I want to book a lawn mowing appointment")], "sop_steps": {}}
+
+
+@pytest.mark.parametrize("node", [nodes.sop_collector, nodes.booking_agent])
+def test_model_failure_returns_an_error_message(monkeypatch, node):
+    monkeypatch.setattr(nodes, "get_tool_registry", lambda: FailingRegistry(TimeoutError("Request timed out")))
+
+    result = node(state())
+
+    message = result["messages"][-1]
+    assert isinstance(message, SystemMessage)
+    assert "Request timed out" in message.content
+
+
+@pytest.mark.parametrize("node", [nodes.sop_collector, nodes.booking_agent])
+def test_cassette_miss_is_not_swallowed(monkeypatch, node):
+    monkeypatch.setattr(nodes, "get_tool_registry", lambda: FailingRegistry(CassetteMissError("not recorded")))
+
+    with pytest.raises(CassetteMissError):
+        node(state())
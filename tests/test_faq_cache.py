@@ -0,0 +1,51 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tools import advisor_tools
+from utils.faq_cache import FAQCache
+from utils.helper import get_user_message
+
+
+@pytest.fixture
+def faq():
+    return FAQCache()
+
+
+def test_faq_answers_questions(faq):
+    answer = faq.match("What are your business hours?")
+
+    assert answer is not None
+    assert str(advisor_tools.BUSINESS_HOURS) in answer
+
+
+@pytest.mark.parametrize("text", [
+    # Statements and the user's own details are answers, not FAQ questions
+    "My phone number is 555-123-4567",
+    "You can reach me at jane@example.com",
+    "It's 42 Main Street",
+    "My hours are flexible",
+    "Your hours are fine by me",
+    # Questions that need an agent to act
+    "How much does a kitchen remodel cost?",
+    "Can I book an appointment for tomorrow?",
+    "",
+])
+def test_faq_rejects_statements_user_data_and_actions(faq, text):
+    assert faq.match(text) is None
+
+
+def test_answers_are_rebuilt_when_business_data_changes(faq, monkeypatch):
+    faq.match("What are your business hours?")
+    monkeypatch.setattr(advisor_tools, "BUSINESS_HOURS", "Mon-Fri 7am-3pm")
+
+    assert "Mon-Fri 7am-3pm" in faq.match("What are your business hours?")
+
+
+def test_matching_uses_the_users_message_not_the_routers_task():
+    messages = [
+        HumanMessage(content="What are your hours?"),
+        AIMessage(content="", name="router"),
+        HumanMessage(content="The user is looking for business hours", name="router"),
+    ]
+
+    assert get_user_message(messages).content == "What are your hours?"
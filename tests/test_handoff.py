@@ -0,0 +1,30 @@
+from orchestration.state import NEW_TURN, add_hops
+from utils.agent_handoff import hop_limit_reason
+
+
+def test_add_hops_appends_within_a_turn():
+    assert add_hops(["router->estimate"], ["estimate->router"]) == ["router->estimate", "estimate->router"]
+    assert add_hops(None, ["router->support"]) == ["router->support"]
+    assert add_hops(["router->support"], []) == ["router->support"]
+
+
+def test_add_hops_new_turn_replaces_history():
+    assert add_hops(["router->estimate", "estimate->router"], [NEW_TURN]) == []
+    assert add_hops(["router->estimate"], [NEW_TURN, "router->advisor"]) == ["router->advisor"]
+
+
+def test_hop_limit_reason_allows_a_fresh_hop():
+    assert hop_limit_reason([]) is None
+    assert hop_limit_reason(["router->estimate", "estimate->router"]) is None
+
+
+def test_hop_limit_reason_detects_ping_pong():
+    hops = ["router->estimate", "estimate->router", "router->estimate"]
+    assert hop_limit_reason(hops) == "loop"
+
+
+def test_hop_limit_reason_enforces_budget(monkeypatch):
+    monkeypatch.setenv("HANDOFF_MAX_HOPS", "3")
+    hops = ["router->estimate", "estimate->router", "router->support"]
+    assert hop_limit_reason(hops[:2]) is None
+    assert hop_limit_reason(hops) == "budget"
@@ -0,0 +1,27 @@
+import pytest
+
+from schemas.intent_analysis import IntentType
+from utils.intent_detector import detect_trivial_intent
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("Hi there!", IntentType.GREETING),
+    ("Good morning :)", IntentType.GREETING),
+    ("Thanks, bye!", IntentType.FAREWELL),
+    ("Thank you so much, have a great day", IntentType.FAREWELL),
+])
+def test_small_talk_is_detected(text, intent):
+    assert detect_trivial_intent(text) == intent
+
+
+@pytest.mark.parametrize("text", [
+    "hi, I need to book a cleaning",
+    "Thanks! 555-123-4567",
+    "thanks, 42 Main St",
+    "bye@example.com",
+    "Hey, my sink is broken",
+    "",
+    "!!!",
+])
+def test_messages_with_content_are_not_small_talk(text):
+    assert detect_trivial_intent(text) is None
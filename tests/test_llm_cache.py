@@ -0,0 +1,87 @@
+import json
+import types
+
+import pytest
+
+from utils import llm_cache
+from utils.llm_cache import ResponseStore, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module."""
+    now = {"t": 1_000_000.0}
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=lambda: now["t"]))
+    return now
+
+
+def test_least_recently_used_entry_is_evicted():
+    store = ResponseStore(max_entries=2)
+    store.set("a", "1")
+    store.set("b", "2")
+    store.get("a")
+
+    store.set("c", "3")
+
+    assert store.get("b") == (None, None)
+    assert store.get("a") == ("1", "memory")
+    assert store.get("c") == ("3", "memory")
+
+
+def test_byte_budget_evicts_oldest_entries():
+    store = ResponseStore(max_entries=100, max_bytes=10)
+    store.set("a", "x" * 6)
+    store.set("b", "y" * 6)
+
+    assert store.get("a") == (None, None)
+    assert store.stats() == {"memory_entries": 1, "memory_bytes": 6}
+
+
+def test_entries_expire_after_ttl(clock):
+    store = ResponseStore(ttl=60)
+    store.set("a", "1")
+
+    clock["t"] += 59
+    assert store.get("a") == ("1", "memory")
+    clock["t"] += 2
+    assert store.get("a") == (None, None)
+    assert store.stats()["memory_entries"] == 0
+
+
+def test_disk_tier_survives_a_new_store(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    ResponseStore(sqlite_path=path).set("a", "1")
+
+    assert ResponseStore(sqlite_path=path).get("a") == ("1", "disk")
+
+
+def test_disk_tier_is_pruned_to_below_its_cap(tmp_path, clock):
+    store = ResponseStore(sqlite_path=str(tmp_path / "cache.sqlite"), sqlite_max_entries=10,
+                          sqlite_prune_interval=3600)
+    for index in range(11):
+        clock["t"] += 1
+        store.set(f"key{index}", "value")
+
+    assert store.stats()["disk_entries"] == 9
+    store.clear()
+    assert store.get("key0") == (None, None)
+
+
+def test_expired_disk_rows_are_dropped(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    ResponseStore(sqlite_path=path, ttl=60).set("a", "1")
+    clock["t"] += 61
+
+    store = ResponseStore(sqlite_path=path)
+
+    assert store.stats()["disk_entries"] == 0
+
+
+def test_cache_key_ignores_volatile_fields():
+    def prompt(message_id, content):
+        return json.dumps([{"kwargs": {"id": message_id, "content": content}}])
+
+    assert make_cache_key(prompt("run-1", "What are  your hours?"), "m") == \
+        make_cache_key(prompt("run-2", "What are your hours? "), "m")
+    assert make_cache_key(prompt("run-1", "What are your hours?"), "m") != \
+        make_cache_key(prompt("run-1", "What are your hours?"), "other-model")
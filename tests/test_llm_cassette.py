@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from utils.llm_cassette import Cassette, CassetteMissError, cassette_key
+
+RECORDED_PROMPT = json.dumps([{"kwargs": {"content": "How much is lawn care?"}}])
+LLM_STRING = "fake-model"
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    entry = {
+        "key": cassette_key(RECORDED_PROMPT, LLM_STRING),
+        "node": "estimate",
+        "generations": [{"message": {"type": "ai", "data": {"content": "About $50", "type": "ai"}}}],
+    }
+    path.write_text(json.dumps(entry) + "\n")
+    return Cassette(str(path), mode="replay")
+
+
+def test_replay_returns_the_recorded_response(cassette):
+    generations = cassette.lookup("estimate", RECORDED_PROMPT, LLM_STRING)
+
+    assert generations[0].message.content == "About $50"
+    cassette.assert_no_misses()
+
+
+def test_replay_miss_raises_instead_of_calling_the_api(cassette):
+    prompt = json.dumps([{"kwargs": {"content": "How much is pest control?"}}])
+
+    with pytest.raises(CassetteMissError, match="pest control"):
+        cassette.lookup("estimate", prompt, LLM_STRING)
+
+    assert cassette.stats()["misses"] == 1
+    with pytest.raises(CassetteMissError):
+        cassette.assert_no_misses()
+
+
+def test_volatile_values_do_not_cause_misses():
+    first = json.dumps([{"kwargs": {"content": "Ticket TKT-20261019035501 created on 2026-10-19"}}])
+    second = json.dumps([{"kwargs": {"content": "Ticket TKT-20261020101010 created on 2026-10-20"}}])
+
+    assert cassette_key(first, LLM_STRING) == cassette_key(second, LLM_STRING)
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from orchestration.registry import GraphRegistry
+
+
+def run_threads(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slow_factory(built):
+    def factory():
+        time.sleep(0.05)
+        graph = object()
+        built.append(graph)
+        return graph
+    return factory
+
+
+def test_concurrent_first_calls_compile_once():
+    registry = GraphRegistry()
+    built = []
+
+    results = run_threads(8, lambda: registry.get("main", slow_factory(built)))
+
+    assert len(built) == 1
+    assert all(graph is built[0] for graph in results)
+    assert registry.stats()["compiles"] == {"main": 1}
+
+
+def test_reload_swaps_in_new_version_while_readers_run():
+    registry = GraphRegistry()
+    built = []
+    factory = slow_factory(built)
+    original = registry.get("main", factory)
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            seen.append(registry.get("main", factory))
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    version = registry.reload(reason="test")
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    reloaded = registry.get("main", factory)
+    assert version == 1
+    assert reloaded is not original
+    assert built == [original, reloaded]
+    # Readers only ever saw a complete graph: the old one, then the new one
+    assert set(map(id, seen)) <= {id(original), id(reloaded)}
+    assert registry.stats()["compiles"] == {"main": 2}
+
+
+def test_reload_embeds_the_new_version_of_nested_graphs():
+    registry = GraphRegistry()
+
+    def child():
+        return object()
+
+    def parent():
+        return ("parent", registry.get("child", child))
+
+    before = registry.get("parent", parent)
+    registry.reload()
+    after = registry.get("parent", parent)
+
+    assert after[1] is not before[1]
+    assert after[1] is registry.get("child", child)
+
+
+def test_reset_drops_graphs_and_recompiles_on_next_get():
+    registry = GraphRegistry()
+    built = []
+    factory = slow_factory(built)
+    first = registry.get("main", factory)
+
+    registry.reset()
+
+    assert registry.stats()["graphs"] == {}
+    assert registry.get("main", factory) is not first
+    assert len(built) == 2
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from server.app import ConversationApp, HTTPError, SessionScheduler
+
+
+def test_turns_of_one_conversation_run_in_order():
+    scheduler = SessionScheduler(max_concurrent=4)
+    order = []
+
+    async def turn(index):
+        async with scheduler.slot("thread-1"):
+            order.append(("start", index))
+            await asyncio.sleep(0.01)
+            order.append(("end", index))
+
+    async def main():
+        await asyncio.gather(*(turn(index) for index in range(3)))
+
+    asyncio.run(main())
+
+    assert order == [(kind, index) for index in range(3) for kind in ("start", "end")]
+    assert scheduler.sessions == 0
+
+
+def test_too_many_pending_turns_get_429():
+    scheduler = SessionScheduler(max_pending_per_session=1)
+
+    async def main():
+        async with scheduler.slot("thread-1"):
+            with pytest.raises(HTTPError) as error:
+                async with scheduler.slot("thread-1"):
+                    pass
+            return error.value
+
+    error = asyncio.run(main())
+
+    assert error.status == 429
+    assert scheduler.sessions == 0
+
+
+def test_turn_that_cannot_start_in_time_gets_503():
+    scheduler = SessionScheduler(max_concurrent=1, queue_timeout=0.05)
+
+    async def main():
+        async with scheduler.slot("thread-1"):
+            with pytest.raises(HTTPError) as error:
+                async with scheduler.slot("thread-2"):
+                    pass
+            return error.value
+
+    error = asyncio.run(main())
+
+    assert error.status == 503
+    assert scheduler.sessions == 0
+    assert scheduler.active_turns == 0
+
+
+def call_app(app, method, path, body=None):
+    """Run one HTTP request through the ASGI app; returns (status, JSON body)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": json.dumps(body).encode() if body is not None else b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": method, "path": path, "headers": []}, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    payload = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(payload)
+
+
+def test_busy_conversation_is_answered_with_429():
+    app = ConversationApp(SessionScheduler(max_pending_per_session=0))
+
+    status, payload = call_app(app, "POST", "/conversations/thread-1/messages", {"content": "Hi"})
+
+    assert status == 429
+    assert "thread-1" in payload["detail"]
+
+
+def test_post_message_returns_the_reply(fresh_graphs):
+    app = ConversationApp(SessionScheduler())
+
+    status, payload = call_app(app, "POST", "/conversations/test-server-1/messages", {"content": "Hello!"})
+    call_app(app, "DELETE", "/conversations/test-server-1")
+
+    assert status == 200
+    assert payload["agent"] == "general"
+    assert payload["content"]
+    assert payload["llm_calls"] == 0
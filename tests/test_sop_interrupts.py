@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.types import Command
+
+from benchmarks.scenarios import SCENARIOS
+from core.metrics import metrics
+from orchestration.graph import get_checkpointer, get_persistent
+from orchestration.state import create as create_state
+
+# Request, timing, address, contact: every answer but the last is followed by the next question
+SOP_TURNS = SCENARIOS["appointment_sop"]
+
+
+@pytest.fixture
+def conversation(fresh_graphs):
+    """Send user messages to one checkpointed conversation; answers to SOP questions resume the paused run."""
+    graph = get_persistent()
+    config = {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+
+    def send(text):
+        snapshot = graph.get_state(config)
+        if snapshot.interrupts:
+            turn_input = Command(resume=text)
+        elif snapshot.values:
+            turn_input = {"messages": [HumanMessage(content=text)]}
+        else:
+            turn_input = create_state()
+            turn_input["messages"] = [HumanMessage(content=text)]
+        graph.invoke(turn_input, config)
+        return graph.get_state(config)
+
+    yield send
+    get_checkpointer().delete_thread(config["configurable"]["thread_id"])
+
+
+def ledger_of(snapshot):
+    return snapshot.values["metadata"]["ledger"]
+
+
+def test_paused_and_resumed_turns_are_each_recorded(conversation):
+    metrics.reset()
+    summed = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    paused = 0
+
+    for number, text in enumerate(SOP_TURNS, start=1):
+        snapshot = conversation(text)
+        ledger = ledger_of(snapshot)
+        assert ledger["turns"] == number
+        assert ledger["last_turn"]["llm_calls"] > 0
+        for field in summed:
+            summed[field] += ledger["last_turn"][field]
+        if snapshot.interrupts:
+            paused += 1
+            if number > 1:
+                # Answers go straight back to the appointment agent
+                assert ledger["last_turn"]["hops"] == 0
+
+    assert paused == len(SOP_TURNS) - 1
+    # The last answer completes the SOP and the booking agent answers
+    assert not snapshot.interrupts
+    assert ledger["nodes"].get("appointment/booking_agent", {}).get("llm_calls", 0) > 0
+    assert {field: ledger["totals"][field] for field in summed} == summed
+    assert ledger["totals"]["llm_calls"] == sum(metrics.snapshot().get("llm_calls", {}).values())
+
+
+def test_farewell_leaves_a_paused_sop(conversation):
+    snapshot = conversation(SOP_TURNS[0])
+    assert snapshot.interrupts
+    calls_before = ledger_of(snapshot)["totals"]["llm_calls"]
+
+    snapshot = conversation("Thanks, bye!")
+
+    assert not snapshot.interrupts
+    assert snapshot.values["messages"][-1].name == "general_agent"
+    assert ledger_of(snapshot)["turns"] == 2
+    assert ledger_of(snapshot)["totals"]["llm_calls"] == calls_before
@@ -0,0 +1,57 @@
+import os
+
+from utils.template_registry import TemplateRegistry
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_template_is_read_once_and_served_from_memory(tmp_path):
+    write(tmp_path / "greeting.md", "Hello {name}", 1_000_000)
+    registry = TemplateRegistry(tmp_path, reload_interval=3600)
+
+    prompt = registry.get_prompt("greeting")
+    (tmp_path / "greeting.md").unlink()
+
+    assert registry.get_prompt("greeting") is prompt
+    assert prompt.format_messages(name="Ana")[0].content == "Hello Ana"
+    assert registry.stats()["greeting"]["loads"] == 1
+
+
+def test_changed_mtime_reloads_the_template(tmp_path):
+    path = tmp_path / "greeting.md"
+    write(path, "Hello {name}", 1_000_000)
+    registry = TemplateRegistry(tmp_path, reload_interval=0)
+    assert registry.get_text("greeting") == "Hello {name}"
+
+    write(path, "Welcome back, {name}", 1_000_100)
+
+    assert registry.get_prompt("greeting").format_messages(name="Ana")[0].content == "Welcome back, Ana"
+    assert registry.stats()["greeting"]["loads"] == 2
+
+
+def test_unchanged_file_is_not_reloaded(tmp_path):
+    write(tmp_path / "greeting.md", "Hello {name}", 1_000_000)
+    registry = TemplateRegistry(tmp_path, reload_interval=0)
+
+    registry.get_text("greeting")
+    registry.get_text("greeting")
+
+    assert registry.stats()["greeting"]["loads"] == 1
+
+
+def test_hot_reload_off_keeps_the_first_version(tmp_path):
+    path = tmp_path / "greeting.md"
+    write(path, "Hello {name}", 1_000_000)
+    registry = TemplateRegistry(tmp_path, reload_interval=0, hot_reload=False)
+    registry.get_text("greeting")
+
+    write(path, "Welcome back, {name}", 1_000_100)
+
+    assert registry.get_text("greeting") == "Hello {name}"
+
+
+def test_missing_template_returns_none(tmp_path):
+    assert TemplateRegistry(tmp_path).get_text("missing") is None
@@ -0,0 +1,82 @@
+import pytest
+from langchain_core.messages import HumanMessage
+
+from core.metrics import metrics
+from utils.token_ledger import apply_turn, over_budget
+
+
+def call(node, prompt_tokens, completion_tokens, cost_usd):
+    return {
+        "node": node,
+        "agent": node.split("/")[0],
+        "llm_calls": 1,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": 0,
+        "completion_tokens": completion_tokens,
+        "cost_usd": cost_usd,
+    }
+
+
+def test_apply_turn_folds_calls_by_agent_and_node():
+    ledger = apply_turn(None, [call("router/agent", 100, 10, 0.001), call("estimate/agent", 200, 20, 0.002)])
+    ledger = apply_turn(ledger, [call("estimate/agent", 300, 30, 0.003)])
+
+    assert ledger["turns"] == 2
+    assert ledger["totals"]["llm_calls"] == 3
+    assert ledger["totals"]["prompt_tokens"] == 600
+    assert ledger["totals"]["cost_usd"] == pytest.approx(0.006)
+    assert ledger["agents"]["estimate"]["completion_tokens"] == 50
+    assert ledger["nodes"]["router/agent"]["llm_calls"] == 1
+    assert ledger["last_turn"]["prompt_tokens"] == 300
+
+
+def test_turn_without_llm_calls_still_counts():
+    ledger = apply_turn(apply_turn(None, [call("router/agent", 100, 10, 0.001)]), [])
+
+    assert ledger["turns"] == 2
+    assert ledger["last_turn"]["llm_calls"] == 0
+    assert ledger["totals"]["llm_calls"] == 1
+
+
+def test_budget(monkeypatch):
+    ledger = apply_turn(None, [call("router/agent", 900, 100, 0.01)])
+    assert not over_budget(ledger)
+
+    monkeypatch.setenv("LEDGER_MAX_TOKENS", "1000")
+    assert over_budget(ledger)
+    assert apply_turn(ledger, [])["budget_exceeded"]
+
+
+def test_graph_turns_are_recorded_once(fresh_graphs):
+    from orchestration.graph import get
+    from orchestration.state import create as create_state
+
+    metrics.reset()
+    state = create_state()
+    for number, text in enumerate(["How much would lawn care cost at 12 Elm Road?", "And pest control?"], start=1):
+        state["messages"] = state["messages"] + [HumanMessage(content=text)]
+        state = get().invoke(state)
+        ledger = state["metadata"]["ledger"]
+        assert ledger["turns"] == number
+        assert ledger["last_turn"]["llm_calls"] > 0
+
+    assert ledger["totals"]["llm_calls"] == sum(metrics.snapshot().get("llm_calls", {}).values())
+
+
+def test_session_over_budget_gets_the_canned_reply(fresh_graphs, monkeypatch):
+    from orchestration.graph import get
+    from orchestration.nodes import BUDGET_EXCEEDED_RESPONSE
+    from orchestration.state import create as create_state
+
+    monkeypatch.setenv("LEDGER_MAX_TOKENS", "1")
+    state = create_state()
+    state["messages"] = [HumanMessage(content="How much would lawn care cost at 12 Elm Road?")]
+    state = get().invoke(state)
+    assert state["metadata"]["ledger"]["budget_exceeded"]
+
+    state["messages"] = state["messages"] + [HumanMessage(content="And pest control?")]
+    state = get().invoke(state)
+
+    assert state["messages"][-1].content == BUDGET_EXCEEDED_RESPONSE
+    assert state["metadata"]["ledger"]["turns"] == 2
+    assert state["metadata"]["ledger"]["last_turn"]["llm_calls"] == 0
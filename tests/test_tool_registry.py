@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from utils.tool_registry import ToolRegistry
+
+
+@tool
+def lookup_order(order_id: str) -> str:
+    """Look up an order by its id."""
+    return order_id
+
+
+def make_registry(calls):
+    def factory():
+        calls.append(1)
+        return [lookup_order]
+    return ToolRegistry(agent_tools={"support": factory})
+
+
+def test_tool_set_is_built_once_under_threads():
+    calls = []
+    registry = make_registry(calls)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(registry.schemas("support"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(schemas is results[0] for schemas in results)
+    assert results[0] == [convert_to_openai_tool(lookup_order)]
+    assert registry.tools("support") == [lookup_order]
+
+
+def test_unknown_agent_raises():
+    with pytest.raises(KeyError):
+        make_registry([]).tools("billing")
+
+
+def test_client_and_bound_model_are_reused():
+    registry = make_registry([])
+
+    client = registry.client("support")
+    bound = registry.bound("support")
+
+    assert registry.client("support") is client
+    assert registry.bound("support") is bound
+    assert bound.bound is client
+    assert registry.stats()["support"]["bound"] is True
+
+
+def test_clear_drops_tool_sets_and_clients():
+    calls = []
+    registry = make_registry(calls)
+    client = registry.client("support")
+    registry.tools("support")
+
+    registry.clear()
+
+    assert registry.client("support") is not client
+    registry.tools("support")
+    assert len(calls) == 2
+
+
+def test_booking_tool_node_runs_every_bound_tool(fresh_graphs):
+    from orchestration.appointment.graph import create
+    from utils.tool_registry import get_tool_registry
+
+    tool_node = create().nodes["booking_tools"].bound
+    bound = {schema["function"]["name"] for schema in get_tool_registry().schemas("booking_agent")}
+
+    assert set(tool_node.tools_by_name) == bound
+    assert "route_to_router" in tool_node.tools_by_name
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from core.tracing import BatchTraceExporter, SampledTracer, conversation_sampled
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.runs = []
+
+    def submit(self, run):
+        self.runs.append(run)
+
+
+def run_turn(tracer, thread_id):
+    chain = RunnableLambda(lambda text: text.upper()).with_config(run_name="turn")
+    return chain.invoke("hi", config={"callbacks": [tracer], "metadata": {"thread_id": thread_id}})
+
+
+def test_sampling_is_decided_per_conversation():
+    threads = [f"thread-{index}" for index in range(2000)]
+    decisions = {thread: conversation_sampled(thread, 0.25) for thread in threads}
+
+    assert all(conversation_sampled(thread, 0.25) == sampled for thread, sampled in decisions.items())
+    assert 0.2 < sum(decisions.values()) / len(threads) < 0.3
+    assert conversation_sampled("thread-1", 1.0) and not conversation_sampled("thread-1", 0.0)
+
+
+def test_only_sampled_conversations_are_traced():
+    exporter = CollectingExporter()
+    tracer = SampledTracer(exporter, sample_rate=0.5)
+    sampled = next(f"t{i}" for i in range(100) if conversation_sampled(f"t{i}", 0.5))
+    skipped = next(f"t{i}" for i in range(100) if not conversation_sampled(f"t{i}", 0.5))
+
+    for _ in range(3):
+        run_turn(tracer, sampled)
+        run_turn(tracer, skipped)
+
+    assert len(exporter.runs) == 3
+    assert all(run.name == "turn" for run in exporter.runs)
+    assert tracer.run_map == {}
+
+
+def test_exporter_falls_back_to_the_file_sink_without_an_api_key(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = BatchTraceExporter(project="tests", api_url="http://127.0.0.1:9", api_key=None,
+                                  fallback_path=str(path), flush_seconds=0.05)
+    tracer = SampledTracer(exporter, sample_rate=1.0)
+
+    run_turn(tracer, "thread-1")
+    exporter.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["turn"]
+    assert lines[0]["session_name"] == "tests"
@@ -2,6 +2,13 @@ from datetime import datetime
 from typing import Dict, Any, Literal
 from langchain_core.tools import tool
 
+SERVICE_CATALOG = [
+    "Lawn Care - Regular lawn maintenance and care",
+    "House Cleaning - Residential cleaning services",
+    "Pest Control - Pest elimination and prevention",
+    "Landscaping - Landscape design and installation"
+]
+
 @tool
 def calculate_estimate(service: str, location: str) -> str:
     """
@@ -64,13 +71,6 @@ def get_service_catalog() -> str:
         str: List of available services with descriptions
     """
     try:
-        services = [
-            "Lawn Care - Regular lawn maintenance and care",
-            "House Cleaning - Residential cleaning services", 
-            "Pest Control - Pest elimination and prevention",
-            "Landscaping - Landscape design and installation"
-        ]
-        
-        return f"Available services: {', '.join(services)}"
+        return f"Available services: {', '.join(SERVICE_CATALOG)}"
     except Exception as e:
         return f"Failed to get service catalog: {str(e)}"
@@ -6,10 +6,26 @@ from .helper import (
     to_plain_dict,
     format_conversation_history
 )
+from .template_registry import (
+    TemplateRegistry,
+    get_template_registry,
+    reset_template_registry
+)
+from .tool_registry import (
+    ToolRegistry,
+    get_tool_registry,
+    reset_tool_registry
+)
 
 __all__ = [
     'load_template',
     'to_plain_text',
     'to_plain_dict',
-    'format_conversation_history'
+    'format_conversation_history',
+    'TemplateRegistry',
+    'get_template_registry',
+    'reset_template_registry',
+    'ToolRegistry',
+    'get_tool_registry',
+    'reset_tool_registry'
 ]
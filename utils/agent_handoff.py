@@ -1,9 +1,59 @@
-from typing import Annotated
+import os
+from typing import Annotated, List, NoReturn, Optional
 from langchain_core.tools import tool, InjectedToolCallId
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command, Send
 from langgraph.graph import MessagesState
-from core.logger import logger
+from langgraph.config import get_config
+from langgraph.errors import ParentCommand
+from core.logger import logger, log_sampled, preview
+from utils.helper import get_user_message
+
+def main_graph() -> str:
+    """Checkpoint namespace of the main graph's task running the calling agent."""
+    try:
+        # "node:task_id|node:task_id|...": the first entry belongs to the main graph
+        namespace = get_config().get("configurable", {}).get("checkpoint_ns", "")
+    except RuntimeError:
+        # Called outside a graph run
+        namespace = ""
+    return namespace.split("|")[0] if namespace else Command.PARENT
+
+def hand_off(**command) -> NoReturn:
+    """
+    Apply a Command in the main graph, however deep the calling agent is nested
+    (main graph -> agent sub-graph -> react agent -> tool). A returned
+    Command(graph=Command.PARENT) would only reach the agent's own sub-graph.
+    The hop is recorded in the turn's routing_history as "from->to".
+    """
+    graph = main_graph()
+    source = graph.split(":")[0] if graph != Command.PARENT else "unknown"
+    goto = command["goto"]
+    targets = [goto] if isinstance(goto, (str, Send)) else goto
+    hops = [f"{source}->{target.node if isinstance(target, Send) else target}" for target in targets]
+    command["update"] = {**(command.get("update") or {}), "routing_history": hops}
+    raise ParentCommand(Command(graph=graph, **command))
+
+def max_hops() -> int:
+    """Handoff hops allowed per turn (HANDOFF_MAX_HOPS)."""
+    return int(os.getenv("HANDOFF_MAX_HOPS", "4"))
+
+def hop_limit_reason(hops: List[str]) -> Optional[str]:
+    """
+    Why a turn must stop handing off, or None.
+
+    Args:
+        hops: The turn's routing_history, ending with the hop that led here
+
+    Returns:
+        "loop" when the latest hop already happened this turn (the same agent
+        pair ping-ponging), "budget" when the turn has used up its hops
+    """
+    if hops and hops[-1] in hops[:-1]:
+        return "loop"
+    if len(hops) >= max_hops():
+        return "budget"
+    return None
 
 def create_handoff_tool(*, agent_name: str, description: str | None = None):
     name = f"transfer_to_{agent_name}"
@@ -13,17 +63,16 @@ def create_handoff_tool(*, agent_name: str, description: str | None = None):
     def handoff_tool(
         state: Annotated[MessagesState, InjectedState],
         tool_call_id: Annotated[str, InjectedToolCallId],
-    ) -> Command:
+    ) -> NoReturn:
         tool_message = {
             "role": "tool",
             "content": f"Successfully transferred to {agent_name}",
             "name": name,
             "tool_call_id": tool_call_id,
         }
-        return Command(
-            goto=agent_name,  
-            update={**state, "messages": state["messages"] + [tool_message]},  
-            graph=Command.PARENT,  
+        hand_off(
+            goto=agent_name,
+            update={**state, "messages": state["messages"] + [tool_message]},
         )
 
     return handoff_tool
@@ -39,13 +88,13 @@ def create_task_description_handoff_tool(*, agent_name: str, description: str |
             "Description of what the next agent should do, including all of the relevant context.",
         ],
         state: Annotated[MessagesState, InjectedState],
-    ) -> Command:
-        task_description_message = {"role": "user", "content": task_description}
-        agent_input = {**state, "messages": [task_description_message]}
-        return Command(
-            goto=[Send(agent_name, agent_input)],
-            graph=Command.PARENT,
-        )
+    ) -> NoReturn:
+        # The agent sees the user's own words, then the router's description of the task
+        task_description_message = {"role": "user", "content": task_description, "name": "router"}
+        user_message = get_user_message(state["messages"])
+        messages = ([user_message] if user_message is not None else []) + [task_description_message]
+        agent_input = {**state, "messages": messages}
+        hand_off(goto=[Send(agent_name, agent_input)])
 
     return handoff_tool
 
@@ -56,7 +105,8 @@ def route_to_router(
         "Clear explanation of why routing to router is needed (e.g., 'User requested pricing information which is outside appointment agent scope', 'Unclear user intent requires router routing')"
     ],
     state: Annotated[MessagesState, InjectedState],
-) -> Command:
+    tool_call_id: Annotated[str, InjectedToolCallId],
+) -> NoReturn:
     """Route the conversation to the router for proper agent selection when unsure or when request is outside current agent's scope. Available agents: general (conversation), appointment (scheduling), support (issues), estimate (pricing), advisor (information)."""
     # Find the original user request in the conversation history
     original_request = None
@@ -80,27 +130,41 @@ def route_to_router(
     if not original_request:
         original_request = "No original request found"
     
-    logger.info(f"Router tool found original request: {original_request}")
+    log_sampled("routing", "Router tool found original request: {}", preview(original_request))
     
     # Create a message explaining the routing decision
     routing_message = {
         "role": "user", 
-        "content": f"ROUTING REQUEST: {reason}\n\nUser's original request: {original_request}"
+        "content": f"ROUTING REQUEST: {reason}\n\nUser's original request: {original_request}",
+        "name": "route_to_router"
+    }
+    
+    # The tool call gets its result, or the router's model would reject the history
+    tool_message = {
+        "role": "tool",
+        "content": "Routing to router",
+        "name": "route_to_router",
+        "tool_call_id": tool_call_id,
     }
     
     # Update state with routing context - preserve conversation history
-    updated_messages = state.get("messages", []) + [routing_message]
+    updated_messages = state.get("messages", []) + [tool_message, routing_message]
     updated_state = {**state, "messages": updated_messages}
     
-    logger.info(f"Agent routing to router: {reason}")
+    log_sampled("routing", "Agent routing to router: {}", preview(reason))
     
-    return Command(
-        goto="router",
-        update=updated_state,
-        graph=Command.PARENT,
-    )
+    hand_off(goto="router", update=updated_state)
 
 def get_handoff_tools():
+    """The transfer_to_<agent> tools; created once, they hold no per-call state."""
+    global _handoff_tools
+    if _handoff_tools is None:
+        _handoff_tools = _create_handoff_tools()
+    return list(_handoff_tools)
+
+_handoff_tools = None
+
+def _create_handoff_tools():
     return [
         create_task_description_handoff_tool(
             agent_name="general",
@@ -0,0 +1,480 @@
+"""
+Fake LLM - Deterministic, offline stand-in for the chat model.
+
+``FakeChatModel`` is a ``BaseChatModel`` that answers from a ``FakeScript``
+instead of calling OpenAI. It supports ``bind_tools`` (tool calls come back in
+the same shape ChatOpenAI produces, including ``additional_kwargs["tool_calls"]``),
+``with_structured_output``, streaming, and per-node latency distributions.
+Select it with ``LLM_PROVIDER=fake``; ``create_llm_client`` then returns a fake
+client wired with the same callbacks and response cache as the real one.
+
+The default script knows this system's flows: the router hands off by keyword,
+the SOP collector fills steps from what the user has said, and the specialized
+agents call their tools before answering. Replies are derived from a hash of the
+request, so the same conversation always produces the same responses.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from core.metrics import metrics
+
+
+#
+# Latency
+#
+class LatencyModel:
+    """
+    Latency distribution for a fake call.
+
+    Args:
+        distribution: "fixed", "uniform", "normal" or "lognormal"
+        mean_ms: Mean latency (time to first token) in milliseconds
+        jitter_ms: Standard deviation (normal/lognormal) or half-width (uniform)
+        token_ms: Delay between streamed tokens
+    """
+
+    def __init__(self, distribution: str = "fixed", mean_ms: float = 0.0, jitter_ms: float = 0.0, token_ms: float = 0.0):
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.token_ms = token_ms
+
+    @classmethod
+    def from_env(cls) -> "LatencyModel":
+        return cls(
+            distribution=os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "fixed"),
+            mean_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("FAKE_LLM_LATENCY_JITTER_MS", "0")),
+            token_ms=float(os.getenv("FAKE_LLM_TOKEN_LATENCY_MS", "0")),
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        """Sample a latency in seconds."""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            value = rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean_ms, self.jitter_ms)
+        elif self.distribution == "lognormal":
+            # Parameterized so the distribution's mean and stddev match mean_ms / jitter_ms
+            variance = self.jitter_ms ** 2
+            sigma = (max(0.0, math.log(1 + variance / self.mean_ms ** 2))) ** 0.5
+            mu = math.log(self.mean_ms) - sigma ** 2 / 2
+            value = rng.lognormvariate(mu, sigma)
+        else:
+            value = self.mean_ms
+        return max(value, 0.0) / 1000
+
+
+#
+# Requests and scripts
+#
+class FakeRequest:
+    """What the fake model was asked: the node, the prompt messages and the bound tools."""
+
+    def __init__(self, node: str, messages: List[BaseMessage], tools: List[Dict[str, Any]], tool_choice: Any = None):
+        self.node = node
+        self.messages = messages
+        self.tools = tools
+        self.tool_choice = tool_choice
+        self.tool_names = [tool["function"]["name"] for tool in tools]
+
+        self.last_human = ""
+        self.human_messages: List[str] = []
+        last_human_index = -1
+        for index, message in enumerate(messages):
+            if isinstance(message, HumanMessage):
+                self.human_messages.append(str(message.content))
+                self.last_human = str(message.content)
+                last_human_index = index
+
+        # Tool results produced since the latest user message, in order
+        self.tool_results = [m for m in messages[last_human_index + 1:] if isinstance(m, ToolMessage)]
+
+    @property
+    def structured(self) -> bool:
+        """True for with_structured_output calls (one tool, forced)."""
+        return self.tool_choice not in (None, "auto", "none") and len(self.tools) == 1
+
+    def digest(self) -> str:
+        payload = json.dumps(
+            [self.node, [(m.type, str(m.content)) for m in self.messages], self.tool_names],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+Handler = Callable[[FakeRequest], Optional[AIMessage]]
+
+
+def tool_call_message(request: FakeRequest, name: str, args: Dict[str, Any], content: str = "") -> AIMessage:
+    """Build an AIMessage with a tool call, in the shape ChatOpenAI returns."""
+    call_id = f"call_{request.digest()[:16]}"
+    return AIMessage(
+        content=content,
+        tool_calls=[{"name": name, "args": args, "id": call_id, "type": "tool_call"}],
+        additional_kwargs={"tool_calls": [{
+            "id": call_id,
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(args)},
+        }]},
+    )
+
+
+def default_args(request: FakeRequest, name: str) -> Dict[str, Any]:
+    """Fill a tool's required arguments from its schema."""
+    schema = next(t["function"] for t in request.tools if t["function"]["name"] == name)
+    properties = schema.get("parameters", {}).get("properties", {})
+    args = {}
+    for field in schema.get("parameters", {}).get("required", []):
+        spec = properties.get(field, {})
+        if spec.get("enum"):
+            args[field] = spec["enum"][0]
+        elif spec.get("type") in ("integer", "number"):
+            args[field] = 1
+        elif spec.get("type") == "boolean":
+            args[field] = False
+        else:
+            args[field] = request.last_human
+    return args
+
+
+class FakeScript:
+    """
+    Decides what the fake model answers.
+
+    Queued responses (per node) are returned first, in order; otherwise the
+    handlers are tried in order and the first non-None reply wins.
+    """
+
+    def __init__(self, handlers: Optional[List[Handler]] = None,
+                 latency: Optional[Dict[str, LatencyModel]] = None, seed: int = 0):
+        self.handlers = handlers if handlers is not None else default_handlers()
+        self.latency = latency or {}
+        self.seed = seed
+        self._queued: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def queue(self, node: str, *responses: Any) -> "FakeScript":
+        """Queue exact responses (str, AIMessage or {"name", "args"} tool call) for a node."""
+        with self._lock:
+            self._queued.setdefault(node, []).extend(responses)
+        return self
+
+    def latency_for(self, node: str) -> LatencyModel:
+        return self.latency.get(node) or self.latency.get("*") or LatencyModel.from_env()
+
+    def rng(self, request: FakeRequest) -> random.Random:
+        return random.Random(f"{self.seed}:{request.digest()}")
+
+    def respond(self, request: FakeRequest) -> AIMessage:
+        with self._lock:
+            queued = self._queued.get(request.node)
+            response = queued.pop(0) if queued else None
+
+        if isinstance(response, AIMessage):
+            return response
+        if isinstance(response, dict):
+            return tool_call_message(request, response["name"], response.get("args", {}))
+        if isinstance(response, str):
+            return AIMessage(content=response)
+
+        for handler in self.handlers:
+            reply = handler(request)
+            if reply is not None:
+                return reply
+        return AIMessage(content="OK")
+
+
+#
+# Default handlers for this system's flows
+#
+AGENT_KEYWORDS = [
+    ("appointment", r"\b(book|booking|appointment|schedule|reschedul\w*)\b"),
+    ("support", r"\b(broken|broke|issue|problem|warranty|escalat\w*|ticket|not working|complain\w*|damaged?)\b"),
+    ("estimate", r"\b(quote|estimate|price|pricing|cost|how much)\b"),
+    ("advisor", r"\b(hours|open|contact|phone number|email|recommend\w*|advice)\b"),
+]
+
+SOP_PATTERNS = {
+    "agenda": r"\b(need|want|would like|looking for|book|schedule)\b",
+    "service": r"\b(lawn\w*|mow\w*|clean\w*|pest\w*|landscap\w*)\b",
+    "timing": r"\b(today|tomorrow|next week|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,2}(:\d{2})?\s*(am|pm)|\d{4}-\d{2}-\d{2})\b",
+    "location": r"\b\d+\s+\w+(\s+\w+)?\s+(st|street|ave|avenue|rd|road|ln|lane|dr|drive|blvd|way)\b",
+    "contact": r"(@|\b(phone|email|call me|text me)\b|\d{3}[-.\s]?\d{3}[-.\s]?\d{4})",
+}
+
+SOP_QUESTIONS = {
+    "agenda": "What can we help you with at this appointment?",
+    "service": "Which service would you like - lawn care, house cleaning, pest control or landscaping?",
+    "timing": "What day and time works best for you?",
+    "location": "What's the address for the visit?",
+    "contact": "What's the best phone number or email to reach you?",
+}
+
+SERVICES = {"lawn": "lawn care", "mow": "lawn care", "clean": "house cleaning", "pest": "pest control", "landscap": "landscaping"}
+
+# Tools each agent calls, in order, before answering
+TOOL_PLANS = {
+    "support": [
+        (r"\b(escalat\w*|urgent|asap|emergency)\b", ["create_support_ticket", "escalate_ticket"]),
+        (r"\bwarranty\b", ["check_warranty_status"]),
+        (r".", ["create_support_ticket"]),
+    ],
+    "estimate": [(r".", ["calculate_estimate"])],
+    "advisor": [
+        (r"\b(hours|open|close)\b", ["get_business_hours"]),
+        (r"\b(contact|phone|email|reach)\b", ["get_contact_info"]),
+        (r".", ["get_service_info"]),
+    ],
+    "booking_agent": [(r".", ["create_appointment"])],
+}
+
+
+def _find_service(text: str) -> str:
+    lowered = text.lower()
+    return next((service for key, service in SERVICES.items() if key in lowered), "lawn care")
+
+
+def _tool_args(request: FakeRequest, name: str) -> Dict[str, Any]:
+    conversation = " ".join(request.human_messages)
+    location = re.search(SOP_PATTERNS["location"], conversation, re.IGNORECASE)
+    address = location.group(0) if location else "123 Main St"
+
+    if name == "create_support_ticket":
+        return {"issue": request.last_human, "priority": "high"}
+    if name == "escalate_ticket":
+        previous = str(request.tool_results[-1].content) if request.tool_results else ""
+        ticket = re.search(r"SUP-\d+", previous)
+        return {"ticket_id": ticket.group(0) if ticket else "SUP-0", "reason": request.last_human}
+    if name == "check_warranty_status":
+        return {"customer_id": "CUST-001"}
+    if name == "calculate_estimate":
+        return {"service": _find_service(conversation), "location": address}
+    if name == "get_service_info":
+        return {"service": _find_service(conversation).split()[0]}
+    if name == "create_appointment":
+        visit = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        return {"date": visit, "time": "10:00", "service": _find_service(conversation), "location": address}
+    return default_args(request, name)
+
+
+def sop_handler(request: FakeRequest) -> Optional[AIMessage]:
+    """Structured SOP output: a step is completed once the user has said something matching it."""
+    if not request.structured or request.tool_names[0] != "SOPExecutionResult":
+        return None
+
+    # Only the user's lines of the rendered history: the checklist and the questions
+    # already asked mention "phone" and "email" too
+    prompt = " ".join(request.human_messages)
+    conversation = " ".join(re.findall(r"^Human: (.*)$", prompt, re.MULTILINE)) or prompt
+    steps = {}
+    for step, pattern in SOP_PATTERNS.items():
+        found = re.search(pattern, conversation, re.IGNORECASE)
+        steps[step] = {
+            "value": found.group(0) if found else "",
+            "status": "completed" if found else "pending",
+            "reasoning": "Mentioned by the user" if found else "Not provided yet",
+            "description": step,
+            "question": "" if found else SOP_QUESTIONS[step],
+        }
+    completed = sum(1 for step in steps.values() if step["status"] == "completed")
+    args = {
+        "sop_steps": steps,
+        "adherence_percentage": completed * 100 // len(steps),
+        "should_route": completed == len(steps),
+    }
+    return tool_call_message(request, "SOPExecutionResult", args)
+
+
+def structured_handler(request: FakeRequest) -> Optional[AIMessage]:
+    """Any other structured output: required fields filled from the schema."""
+    if not request.structured:
+        return None
+    return tool_call_message(request, request.tool_names[0], default_args(request, request.tool_names[0]))
+
+
+def _topic_agent(text: str) -> Optional[str]:
+    return next((agent for agent, pattern in AGENT_KEYWORDS if re.search(pattern, text, re.IGNORECASE)), None)
+
+
+def handoff_handler(request: FakeRequest) -> Optional[AIMessage]:
+    """
+    Router (and agents holding transfer tools) hand off by keyword. A message
+    without one ("Tomorrow at 10am", an address) stays with the agent of the
+    latest earlier message that had one, like an answer to that agent's question.
+    """
+    if not any(name.startswith("transfer_to_") for name in request.tool_names) or request.tool_results:
+        return None
+
+    target = next(
+        (agent for agent in map(_topic_agent, reversed(request.human_messages)) if agent is not None),
+        "general"
+    )
+    name = f"transfer_to_{target}"
+    if target == request.node or name not in request.tool_names:
+        return None
+    return tool_call_message(request, name, {"task_description": request.last_human})
+
+
+def tool_plan_handler(request: FakeRequest) -> Optional[AIMessage]:
+    """Call the next planned tool for this node that has not run since the latest user message."""
+    for pattern, plan in TOOL_PLANS.get(request.node, []):
+        if not re.search(pattern, request.last_human, re.IGNORECASE):
+            continue
+        called = [str(m.name) for m in request.tool_results]
+        for name in plan:
+            if name in request.tool_names and name not in called:
+                return tool_call_message(request, name, _tool_args(request, name))
+        return None
+    return None
+
+
+def reply_handler(request: FakeRequest) -> Optional[AIMessage]:
+    """Plain answer; summarizes the latest tool result when there is one."""
+    if request.tool_results:
+        return AIMessage(content=f"Here's what I found: {request.tool_results[-1].content}")
+    variants = [
+        "Sure thing! I can help with that.",
+        "Got it! Let me help you with that.",
+        "Absolutely, happy to help.",
+    ]
+    return AIMessage(content=f"{variants[int(request.digest(), 16) % len(variants)]} You said: {request.last_human}")
+
+
+def default_handlers() -> List[Handler]:
+    return [sop_handler, structured_handler, handoff_handler, tool_plan_handler, reply_handler]
+
+
+#
+# Model
+#
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers from a FakeScript with simulated latency and token usage."""
+
+    node: str = "default"
+    # Model the fake stands in for; reported as ls_model_name so usage is priced like it
+    model: str = "fake-chat"
+    script: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"node": self.node}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return super().bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], **kwargs: Any):
+        script = self.script or get_fake_script()
+        request = FakeRequest(self.node, messages, kwargs.get("tools") or [], kwargs.get("tool_choice"))
+        message = script.respond(request)
+
+        prompt_text = "".join(str(m.content) for m in messages) + json.dumps(request.tools)
+        completion_text = str(message.content) + json.dumps([c["args"] for c in message.tool_calls])
+        prompt_tokens, completion_tokens = _estimate_tokens(prompt_text), _estimate_tokens(completion_text)
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "input_token_details": {"cache_read": 0},
+        }
+        message.response_metadata = {"model_name": "fake-chat", "finish_reason": "tool_calls" if message.tool_calls else "stop"}
+
+        latency = script.latency_for(self.node)
+        metrics.inc("fake_llm_calls", node=self.node)
+        return message, latency, script.rng(request)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message, latency, rng = self._respond(messages, **kwargs)
+        delay = latency.sample(rng) + latency.token_ms / 1000 * (message.usage_metadata["output_tokens"])
+        if delay:
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message, latency, rng = self._respond(messages, **kwargs)
+        delay = latency.sample(rng) + latency.token_ms / 1000 * (message.usage_metadata["output_tokens"])
+        if delay:
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        words = re.findall(r"\S+\s*", str(message.content)) or [""]
+        chunks = [AIMessageChunk(content=word) for word in words]
+        if message.tool_calls:
+            chunks.append(AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ], additional_kwargs=message.additional_kwargs))
+        chunks[-1].usage_metadata = message.usage_metadata
+        chunks[-1].response_metadata = message.response_metadata
+        return chunks
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message, latency, rng = self._respond(messages, **kwargs)
+        first = latency.sample(rng)
+        if first:
+            time.sleep(first)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index and latency.token_ms:
+                time.sleep(latency.token_ms / 1000)
+            if run_manager:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        message, latency, rng = self._respond(messages, **kwargs)
+        first = latency.sample(rng)
+        if first:
+            await asyncio.sleep(first)
+        for index, chunk in enumerate(self._chunks(message)):
+            if index and latency.token_ms:
+                await asyncio.sleep(latency.token_ms / 1000)
+            if run_manager:
+                await run_manager.on_llm_new_token(str(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+_fake_script = None
+
+def get_fake_script() -> FakeScript:
+    global _fake_script
+    if _fake_script is None:
+        _fake_script = FakeScript(seed=int(os.getenv("FAKE_LLM_SEED", "0")))
+    return _fake_script
+
+def set_fake_script(script: Optional[FakeScript]):
+    """Install the script every fake client answers from (None restores the default)."""
+    global _fake_script
+    _fake_script = script
+
+def reset_fake_script():
+    set_fake_script(None)
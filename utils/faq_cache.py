@@ -0,0 +1,281 @@
+"""
+FAQ Answer Cache - Local semantic cache of approved answers.
+
+Matches incoming questions (not statements or messages carrying the user's
+own details) against a TF-IDF index of approved FAQ questions and returns
+the approved answer without an LLM call when the cosine similarity clears
+``FAQ_CACHE_THRESHOLD``. Every answer records which
+business data it depends on (service info, catalog, hours, contact); when
+that data changes the affected answers are invalidated and the index is
+rebuilt.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+from tools import advisor_tools, estimate_tools
+from core.logger import logger, log_sampled
+from core.metrics import metrics
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "did", "you", "your", "yours",
+    "i", "me", "my", "we", "our", "us", "can", "could", "would", "will", "please", "to", "of", "for",
+    "on", "in", "at", "and", "or", "what", "whats", "it", "its", "this", "that", "there", "tell",
+    "about", "know", "like", "want", "get", "some", "any", "hey", "hi", "hello", "ok", "okay"
+}
+
+# Questions containing these need an agent to act (book, quote, open a ticket),
+# not a canned answer
+ACTION_KEYWORDS = {
+    "book", "booking", "schedule", "appointment", "reschedule", "cancel", "availability", "available",
+    "tomorrow", "warranty", "broken", "problem", "issue", "complaint", "ticket", "escalate",
+    "quote", "estimate", "price", "pricing", "cost", "much"
+}
+
+# A message opening with one of these asks something (or asks to be told something)
+QUESTION_WORDS = {
+    "what", "whats", "when", "where", "which", "who", "how", "why", "are", "is", "do", "does",
+    "can", "could", "will", "would", "tell", "show", "list"
+}
+
+# Details customers give about themselves: numbers, email addresses, "my ..."
+USER_DATA = re.compile(r"\d|[^\s@]+@[^\s@]+|\b(my|mine)\b", re.IGNORECASE)
+
+
+def is_question(text: str) -> bool:
+    """True for a question: ends with '?' or opens with an interrogative."""
+    words = re.findall(r"[a-z']+", text.lower())
+    return text.strip().endswith("?") or (bool(words) and words[0].replace("'", "") in QUESTION_WORDS)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, drop stopwords and strip plural 's' so 'hours' matches 'hour'."""
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text.lower().replace("'", "")):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def get_data_sources() -> Dict[str, Any]:
+    """Business data the FAQ answers are derived from, keyed by source name."""
+    # Read through the modules so reassigned data is picked up, not just mutated data
+    return {
+        "service_info": advisor_tools.SERVICE_INFO,
+        "service_catalog": estimate_tools.SERVICE_CATALOG,
+        "business_hours": advisor_tools.BUSINESS_HOURS,
+        "contact_info": advisor_tools.CONTACT_INFO,
+    }
+
+
+def fingerprint(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class FAQEntry:
+    """An approved answer, the question phrasings it serves and the data it depends on."""
+
+    def __init__(self, questions: List[str], answer: str, sources: List[str],
+                 fingerprints: Optional[Dict[str, str]] = None):
+        self.questions = questions
+        self.answer = answer
+        self.sources = sources
+        self.fingerprints = fingerprints or {}
+
+
+def build_seed_entries() -> List[FAQEntry]:
+    """Answers generated from the current business data, in the general agent's voice."""
+    data = get_data_sources()
+    catalog = ", ".join(item.split(" - ")[0] for item in data["service_catalog"])
+    entries = [
+        FAQEntry(
+            ["What are your business hours?", "When are you open?", "What time do you open?",
+             "What time do you close?", "Are you open on weekends?", "Are you open on Saturday?",
+             "Are you open on Sunday?", "What are your hours?"],
+            f"Sure thing! Our hours are {data['business_hours']}. Anything else I can help you with?",
+            ["business_hours"],
+        ),
+        FAQEntry(
+            ["How can I contact you?", "What is your phone number?", "What is your email?",
+             "Where are you located?", "What is your address?", "How do I reach you?"],
+            f"Absolutely! You can reach us here - {data['contact_info']}. Is there anything else you need?",
+            ["contact_info"],
+        ),
+        FAQEntry(
+            ["What services do you offer?", "What services do you provide?", "Which services are available?",
+             "What do you do?", "What do you offer?", "Show me your service catalog", "List your services"],
+            f"Great question! We offer {catalog}. Want to hear more about any of them?",
+            ["service_catalog"],
+        ),
+    ]
+    for service, info in data["service_info"].items():
+        entries.append(FAQEntry(
+            [f"Tell me about {service}", f"Tell me about your {service} services", f"What is included in {service}?",
+             f"What does your {service} service include?", f"Do you offer {service}?"],
+            f"Sure! Here's what our {service} service looks like: {info}. Would you like a quote or to book a visit?",
+            ["service_info"],
+        ))
+    return entries
+
+
+class FAQCache:
+    """
+    TF-IDF index over approved FAQ questions with data-change invalidation.
+    """
+
+    def __init__(self, threshold: float = 0.7, max_query_tokens: int = 12,
+                 seed_builder: Callable[[], List[FAQEntry]] = build_seed_entries,
+                 approved_path: Optional[str] = None):
+        self.threshold = threshold
+        self.max_query_tokens = max_query_tokens
+        self.seed_builder = seed_builder
+        self.approved_path = approved_path
+        self.approved: List[FAQEntry] = []
+        self._entries: List[FAQEntry] = []
+        self._vectors: List[Dict[str, float]] = []
+        self._owners: List[int] = []
+        self._idf: Dict[str, float] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._action_keywords = {token for keyword in ACTION_KEYWORDS for token in tokenize(keyword)}
+
+        if approved_path:
+            self._load_approved(approved_path)
+
+    def _load_approved(self, path: str) -> None:
+        """Load reviewed answers from a JSON list of {questions, answer, sources, fingerprints}."""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                for item in json.load(file):
+                    self.approved.append(FAQEntry(
+                        item["questions"], item["answer"], item.get("sources", []), item.get("fingerprints")
+                    ))
+            logger.info(f"Loaded {len(self.approved)} approved FAQ answers from {path}")
+        except FileNotFoundError:
+            logger.warning(f"Approved FAQ file not found: {path}")
+        except Exception as e:
+            logger.error(f"Error loading approved FAQ answers: {str(e)}")
+
+    def approve(self, questions: List[str], answer: str, sources: List[str]) -> None:
+        """Add a reviewed answer, pinned to the current version of its data sources."""
+        current = {name: fingerprint(value) for name, value in get_data_sources().items()}
+        with self._lock:
+            self.approved.append(FAQEntry(questions, answer, sources, {s: current[s] for s in sources}))
+            self._fingerprints = {}
+
+    def _vectorize(self, tokens: List[str]) -> Dict[str, float]:
+        counts = Counter(tokens)
+        vector = {t: c * self._idf.get(t, 0.0) for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        return {t: v / norm for t, v in vector.items()} if norm else {}
+
+    def _refresh(self) -> None:
+        """Rebuild the index if any data source changed since it was built."""
+        current = {name: fingerprint(value) for name, value in get_data_sources().items()}
+        if current == self._fingerprints:
+            return
+
+        with self._lock:
+            if current == self._fingerprints:
+                return
+
+            if self._fingerprints:
+                changed = [name for name in current if current[name] != self._fingerprints.get(name)]
+                metrics.inc("faq_cache_invalidations")
+                logger.info(f"FAQ cache invalidated, data changed: {changed}")
+
+            # Seed answers are regenerated from the new data; approved answers pinned
+            # to an older version of their sources are dropped
+            approved = [
+                entry for entry in self.approved
+                if all(entry.fingerprints.get(s, current.get(s)) == current.get(s) for s in entry.sources)
+            ]
+            entries = self.seed_builder() + approved
+
+            documents = []
+            owners = []
+            for index, entry in enumerate(entries):
+                for question in entry.questions:
+                    documents.append(tokenize(question))
+                    owners.append(index)
+
+            document_frequency = Counter(token for tokens in documents for token in set(tokens))
+            total = len(documents)
+            self._idf = {t: math.log((1 + total) / (1 + df)) + 1 for t, df in document_frequency.items()}
+            self._entries = entries
+            self._owners = owners
+            self._vectors = [self._vectorize(tokens) for tokens in documents]
+            self._fingerprints = current
+
+    def match(self, text: str, node: str = "default") -> Optional[str]:
+        """
+        Find an approved answer for a question.
+
+        Statements ("My address is ...") and messages carrying the user's own
+        details never match: they are answers, not FAQ questions.
+
+        Args:
+            text: The user's message
+            node: Node name used to label hit/miss metrics
+
+        Returns:
+            The approved answer, or None if no question is similar enough
+        """
+        try:
+            text = text or ""
+            if not is_question(text) or USER_DATA.search(text):
+                metrics.inc("faq_cache_misses", node=node)
+                return None
+
+            tokens = tokenize(text)
+            if not tokens or len(tokens) > self.max_query_tokens or self._action_keywords.intersection(tokens):
+                metrics.inc("faq_cache_misses", node=node)
+                return None
+
+            self._refresh()
+            query = self._vectorize(tokens)
+
+            best_score, best_owner = 0.0, None
+            for owner, vector in zip(self._owners, self._vectors):
+                score = sum(weight * vector.get(token, 0.0) for token, weight in query.items())
+                if score > best_score:
+                    best_score, best_owner = score, owner
+
+            if best_owner is None or best_score < self.threshold:
+                metrics.inc("faq_cache_misses", node=node)
+                return None
+
+            metrics.inc("faq_cache_hits", node=node)
+            log_sampled("faq", "FAQ cache hit for {} (score {:.2f})", node, best_score)
+            return self._entries[best_owner].answer
+
+        except Exception as e:
+            logger.warning(f"FAQ cache lookup failed: {str(e)}")
+            return None
+
+
+_faq_cache = None
+
+def get_faq_cache() -> Optional[FAQCache]:
+    """Get the process-wide FAQ cache, or None when FAQ_CACHE_ENABLED is false."""
+    global _faq_cache
+    if os.getenv("FAQ_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    if _faq_cache is None:
+        _faq_cache = FAQCache(
+            threshold=float(os.getenv("FAQ_CACHE_THRESHOLD", "0.7")),
+            approved_path=os.getenv("FAQ_APPROVED_PATH") or None,
+        )
+    return _faq_cache
+
+def reset_faq_cache():
+    global _faq_cache
+    _faq_cache = None
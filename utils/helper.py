@@ -1,16 +1,13 @@
 import json
-import pytz
 import traceback
-import xml.etree.ElementTree as ET
-from datetime import datetime
-from dateutil import parser
+from datetime import datetime, timezone
 from collections.abc import Mapping
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel
 
-from dotty_dictionary import dotty
 from core.logger import logger
+from utils.template_registry import get_template_registry
 
 def union_lists(*lists) -> List:
     """Union of multiple lists."""
@@ -31,6 +28,7 @@ def read_file(file_path, encoding='utf-8'):
     """Read content from a file based on its extension."""
     try:
         if file_path.endswith('.json'):
+            from dotty_dictionary import dotty
             with open(file_path, 'r', encoding=encoding) as file:
                 return dotty(json.load(file))
         elif file_path.endswith('.md'):
@@ -88,6 +86,8 @@ def parse_datetime(datetime_str = None) -> str:
                 return None
                 
             try:
+                # Imported on first use: dateutil is only needed for free-form dates
+                from dateutil import parser
                 given_time = parser.parse(datetime_str)
             except (ValueError, TypeError) as e:
                 logger.error(f"parse_datetime: Failed to parse datetime string '{datetime_str}': {e}")
@@ -96,9 +96,9 @@ def parse_datetime(datetime_str = None) -> str:
         # Ensure the datetime has timezone info
         if given_time.tzinfo is None:
             # Assume UTC if no timezone info
-            given_time = pytz.UTC.localize(given_time)
+            given_time = given_time.replace(tzinfo=timezone.utc)
             
-        given_time_utc = given_time.astimezone(pytz.UTC)
+        given_time_utc = given_time.astimezone(timezone.utc)
         given_time_iso_utc = given_time_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
         
         return given_time_iso_utc
@@ -182,6 +182,8 @@ def convert_to_langchain_messages(messages: List[Dict[str, Any]]) -> List[Union[
     return result
 
 def dict_to_xml(data, root_tag="root") -> str:
+    import xml.etree.ElementTree as ET
+
     def build_tree(parent, structure):
         if isinstance(structure, dict):
             for key, value in structure.items():
@@ -290,6 +292,28 @@ def format_conversation_history(messages: List[Union[SystemMessage, HumanMessage
             formatted_messages.append(f"Assistant: {message.content}")
     return "\n".join(formatted_messages)
 
+def get_user_message(messages: List[Any]) -> Optional[Any]:
+    """
+    The latest message the user wrote. Handoff requests sent to agents as user
+    messages (task descriptions, routing requests) carry a name and are skipped.
+    """
+    for message in reversed(messages or []):
+        if isinstance(message, dict):
+            role, name = message.get("role"), message.get("name")
+        else:
+            role, name = getattr(message, "type", None), getattr(message, "name", None)
+        if role in ("user", "human") and not name:
+            return message
+    return None
+
+def get_message_content(message: Any) -> str:
+    """Get the text of a message object or a {"role", "content"} dict (as sent by handoff tools)."""
+    if hasattr(message, 'content'):
+        return message.content if isinstance(message.content, str) else str(message.content)
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    return str(message)
+
 def convert_to_pointwise_strings(strings: List[str]) -> List[str]:
     return '\n'.join([f"• {s}" for s in strings])
 
@@ -307,7 +331,5 @@ def format_conversation_dict(conversation_dict: Dict[str, Any]) -> str:
 
 
 def load_template(template_name: str):
-        prompts_path = "prompts/"
-        template = read_file(f"{prompts_path}{template_name}.md")
-
-        return template
\ No newline at end of file
+        # Served from the in-memory registry; reloaded only when the file changes
+        return get_template_registry().get_text(template_name)
\ No newline at end of file
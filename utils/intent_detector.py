@@ -0,0 +1,71 @@
+"""
+Trivial intent detection - recognizes pure greetings and farewells without an LLM.
+
+Only messages made up entirely of greeting/farewell phrases are matched, so
+"hi, I need to book a cleaning" (or "Thanks! 555-123-4567") still goes
+through the router.
+"""
+
+import re
+import string
+from typing import List, Optional
+from schemas.intent_analysis import IntentType
+
+GREETING_WORDS = {
+    "hi", "hello", "hey", "hiya", "howdy", "greetings", "yo", "morning", "afternoon", "evening",
+    "good", "there", "how", "are", "you", "doing", "whats", "up", "sup"
+}
+
+FAREWELL_WORDS = {
+    "bye", "goodbye", "byebye", "cya", "see", "you", "later", "soon", "take", "care", "good", "night",
+    "have", "a", "great", "nice", "day", "thats", "all", "for", "now", "talk", "to"
+}
+
+THANKS_WORDS = {"thanks", "thank", "thx", "ty", "cheers", "appreciate", "it", "much", "so", "very", "you"}
+
+FILLER_WORDS = {"ok", "okay", "great", "awesome", "perfect", "cool", "alright", "and", "again", "everyone", "all"}
+
+# A message must contain at least one of these to count as the intent
+GREETING_MARKERS = {"hi", "hello", "hey", "hiya", "howdy", "greetings", "yo", "morning", "afternoon", "evening", "sup"}
+FAREWELL_MARKERS = {"bye", "goodbye", "byebye", "cya", "later", "night", "day", "thanks", "thank", "thx", "ty", "cheers", "appreciate"}
+
+MAX_WORDS = 8
+
+
+def _words(text: str) -> List[str]:
+    """
+    Whitespace-separated tokens with surrounding punctuation stripped. Digits and
+    inner symbols stay ("555-123-4567"), so they never count as greeting words;
+    tokens made only of punctuation or emoji are dropped.
+    """
+    words = []
+    for token in re.findall(r"\S+", text.lower().replace("'", "").replace("\u2019", "")):
+        token = token.strip(string.punctuation)
+        if any(char.isalnum() for char in token):
+            words.append(token)
+    return words
+
+
+def detect_trivial_intent(text: str) -> Optional[IntentType]:
+    """
+    Detect a pure greeting or farewell.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        IntentType.GREETING, IntentType.FAREWELL, or None if the message carries any other content
+    """
+    if not text:
+        return None
+
+    words = _words(text)
+    if not words or len(words) > MAX_WORDS:
+        return None
+
+    unique = set(words)
+    if unique <= (FAREWELL_WORDS | THANKS_WORDS | FILLER_WORDS) and unique & FAREWELL_MARKERS:
+        return IntentType.FAREWELL
+    if unique <= (GREETING_WORDS | FILLER_WORDS) and unique & GREETING_MARKERS:
+        return IntentType.GREETING
+    return None
@@ -0,0 +1,294 @@
+"""
+LLM Response Cache - Exact-match cache for chat model responses.
+
+Plugs into LangChain's ``BaseCache`` extension point, so it is consulted by
+``BaseChatModel`` before any network call. Keys are a hash of the model
+configuration (model, temperature, bound tool schemas) and the normalized
+prompt messages. Entries live in an in-memory LRU with TTL and size-based
+eviction, optionally backed by a SQLite disk tier.
+
+Caching is enabled per node with ``LLM_CACHE_NODES`` (comma-separated node
+names, or ``*`` for all nodes).
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+from core.logger import logger
+from core.metrics import metrics
+
+# Message fields that vary between otherwise identical requests
+VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    """Recursively drop volatile fields and collapse whitespace in message content."""
+    if isinstance(value, dict):
+        return {
+            k: (_WHITESPACE.sub(" ", v).strip() if k == "content" and isinstance(v, str) else _normalize(v))
+            for k, v in value.items()
+            if k not in VOLATILE_MESSAGE_FIELDS
+        }
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def make_cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Build the cache key for a request.
+
+    Args:
+        prompt: Serialized prompt messages as passed by LangChain
+        llm_string: Serialized model configuration including bound tools and temperature
+
+    Returns:
+        Hex SHA-256 digest of the normalized request
+    """
+    try:
+        normalized_prompt = json.dumps(_normalize(json.loads(prompt)), sort_keys=True)
+    except (ValueError, TypeError):
+        normalized_prompt = prompt
+    return hashlib.sha256(f"{llm_string}\n{normalized_prompt}".encode("utf-8")).hexdigest()
+
+
+def serialize_generations(return_val: RETURN_VAL_TYPE) -> str:
+    """
+    Serialize chat generations for storage.
+
+    Token usage is dropped so that cache hits are not counted as LLM spend.
+    """
+    serialized = []
+    for generation in return_val:
+        message = generation.message.model_copy(update={"usage_metadata": None})
+        serialized.append({
+            "message": message_to_dict(message),
+            "generation_info": generation.generation_info,
+        })
+    return json.dumps(serialized)
+
+
+def deserialize_generations(value: str) -> RETURN_VAL_TYPE:
+    """Rebuild chat generations stored by serialize_generations."""
+    return [
+        ChatGeneration(
+            message=messages_from_dict([item["message"]])[0],
+            generation_info=item.get("generation_info"),
+        )
+        for item in json.loads(value)
+    ]
+
+
+class ResponseStore:
+    """
+    Two-tier key/value store: in-memory LRU with TTL and byte budget,
+    plus an optional SQLite tier that survives restarts.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024,
+                 ttl: float = 3600.0, sqlite_path: Optional[str] = None,
+                 sqlite_max_entries: int = 100000, sqlite_prune_interval: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sqlite_max_entries = sqlite_max_entries
+        self.sqlite_prune_interval = sqlite_prune_interval
+        self._memory: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Upper bound of the disk tier's row count (replaced keys are counted twice until the next prune)
+        self._disk_entries = 0
+        self._next_prune = 0.0
+
+        if sqlite_path:
+            os.makedirs(os.path.dirname(os.path.abspath(sqlite_path)), exist_ok=True)
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_expires_at ON llm_cache (expires_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+            self._db.commit()
+            self._prune(time.time())
+
+    def _evict(self) -> None:
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, size, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= size
+            metrics.inc("llm_cache_evictions", tier="memory")
+
+    def _put_memory(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value)
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+        self._memory[key] = (expires_at, size, value)
+        self._memory_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (value, tier) for a live entry, or (None, None) on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return value, "memory"
+                del self._memory[key]
+                self._memory_bytes -= size
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        self._put_memory(key, value, expires_at)
+                        return value, "disk"
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+        return None, None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._put_memory(key, value, expires_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now),
+                )
+                self._disk_entries += 1
+                if self._disk_entries > self.sqlite_max_entries or now >= self._next_prune:
+                    self._prune(now)
+                self._db.commit()
+
+    def _prune(self, now: float) -> None:
+        """
+        Drop expired rows, and the oldest rows while the disk tier is over its
+        cap, down to 90% of it so the next inserts do not prune again.
+        Runs every sqlite_prune_interval seconds or when over the cap (caller
+        holds the lock or is the constructor).
+        """
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        entries = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if entries > self.sqlite_max_entries:
+            excess = entries - self.sqlite_max_entries * 9 // 10
+            self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY created_at LIMIT ?)",
+                (excess,),
+            )
+            entries -= excess
+            metrics.inc("llm_cache_evictions", excess, tier="disk")
+        self._db.commit()
+        self._disk_entries = entries
+        self._next_prune = now + self.sqlite_prune_interval
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {"memory_entries": len(self._memory), "memory_bytes": self._memory_bytes}
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return stats
+
+
+class NodeResponseCache(BaseCache):
+    """LangChain cache bound to one node, sharing the process-wide response store."""
+
+    def __init__(self, node: str, store: ResponseStore):
+        self.node = node
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        try:
+            value, tier = self.store.get(make_cache_key(prompt, llm_string))
+            if value is None:
+                metrics.inc("llm_cache_misses", node=self.node)
+                return None
+
+            metrics.inc("llm_cache_hits", node=self.node, tier=tier)
+            logger.debug(f"LLM cache hit for {self.node} ({tier})")
+            return deserialize_generations(value)
+
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed for {self.node}: {str(e)}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        try:
+            value = serialize_generations(return_val)
+            self.store.set(make_cache_key(prompt, llm_string), value)
+        except Exception as e:
+            logger.warning(f"LLM cache update failed for {self.node}: {str(e)}")
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+def is_cache_enabled(node: Optional[str]) -> bool:
+    """Check whether response caching is enabled for a node via LLM_CACHE_NODES."""
+    nodes = {n.strip() for n in os.getenv("LLM_CACHE_NODES", "").split(",") if n.strip()}
+    return "*" in nodes or (node is not None and node in nodes)
+
+
+_response_store = None
+
+def get_response_store() -> ResponseStore:
+    global _response_store
+    if _response_store is None:
+        _response_store = ResponseStore(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+            ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+            sqlite_path=os.getenv("LLM_CACHE_SQLITE_PATH") or None,
+            sqlite_max_entries=int(os.getenv("LLM_CACHE_SQLITE_MAX_ENTRIES", "100000")),
+            sqlite_prune_interval=float(os.getenv("LLM_CACHE_SQLITE_PRUNE_SECONDS", "300")),
+        )
+    return _response_store
+
+def get_node_cache(node: Optional[str]) -> Optional[NodeResponseCache]:
+    """Get the response cache for a node, or None when caching is disabled for it."""
+    if not is_cache_enabled(node):
+        return None
+    return NodeResponseCache(node or "default", get_response_store())
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters per node and the current store size."""
+    snapshot = metrics.snapshot()
+    return {
+        "hits": {",".join(f"{k}={v}" for k, v in labels): int(count) for labels, count in snapshot.get("llm_cache_hits", {}).items()},
+        "misses": {",".join(f"{k}={v}" for k, v in labels): int(count) for labels, count in snapshot.get("llm_cache_misses", {}).items()},
+        "store": get_response_store().stats() if _response_store is not None else {},
+    }
+
+def reset_response_store():
+    global _response_store
+    _response_store = None
@@ -0,0 +1,216 @@
+"""
+LLM Cassettes - Record real model responses and replay them offline.
+
+In ``record`` mode every LLM call made through ``create_llm_client`` (agents,
+the booking agent and the ``sop_collector`` structured output) is appended to
+a JSONL cassette, keyed by the normalized request. In ``replay`` mode calls are
+answered from the cassette with no network access; a request that is not on
+the cassette raises ``CassetteMissError`` instead of silently falling back to
+the API, so replayed performance numbers stay honest.
+
+Like the response cache, cassettes plug into LangChain's ``BaseCache``
+extension point; while a cassette is active it takes the place of the
+response cache.
+
+Configured with ``LLM_CASSETTE_MODE`` (off, record, replay) and
+``LLM_CASSETTE_PATH``.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict
+from core.logger import logger
+from core.metrics import metrics
+from utils.llm_cache import make_cache_key, deserialize_generations
+
+# Values that differ between a recording and a replay of the same conversation:
+# generated ticket/estimate/appointment IDs, timestamps and dates
+VOLATILE_PATTERNS = [
+    (re.compile(r"\b[A-Z]{3}-\d{8,14}\b"), "<ID>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?\b"), "<DATETIME>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<DATE>"),
+]
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when a request was not recorded."""
+
+
+def cassette_key(prompt: str, llm_string: str) -> str:
+    """Cache key of the request with volatile values masked."""
+    for pattern, placeholder in VOLATILE_PATTERNS:
+        prompt = pattern.sub(placeholder, prompt)
+    return make_cache_key(prompt, llm_string)
+
+
+def _last_message_preview(prompt: str) -> str:
+    try:
+        messages = json.loads(prompt)
+        content = messages[-1].get("kwargs", {}).get("content", "")
+        return str(content)[:120]
+    except Exception:
+        return ""
+
+
+class Cassette:
+    """
+    Recorded request/response pairs backed by a JSONL file.
+
+    The same request may be recorded several times (e.g. a repeated question);
+    replay returns the recorded responses in order and then keeps returning
+    the last one.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", replay_latency: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.misses: List[Dict[str, str]] = []
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        count = 0
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+                    count += 1
+        logger.info(f"Loaded {count} recorded LLM responses from {self.path}")
+
+    def lookup(self, node: str, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cassette_key(prompt, llm_string)
+
+        if self.mode == "record":
+            # Let the real call through; remember when it started to record its latency
+            with self._lock:
+                self._started[key] = time.perf_counter()
+            return None
+
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses.append({"node": node, "key": key, "last_message": _last_message_preview(prompt)})
+                metrics.inc("llm_cassette_misses", node=node)
+                message = (
+                    f"No recorded LLM response for node '{node}' (key {key[:12]}) in {self.path}; "
+                    f"last message: {_last_message_preview(prompt)!r}"
+                )
+                logger.error(message)
+                raise CassetteMissError(message)
+
+            position = self._positions.get(key, 0)
+            entry = entries[min(position, len(entries) - 1)]
+            self._positions[key] = position + 1
+
+        metrics.inc("llm_cassette_hits", node=node)
+        if self.replay_latency and entry.get("latency_ms"):
+            time.sleep(entry["latency_ms"] / 1000)
+        return deserialize_generations(json.dumps(entry["generations"]))
+
+    def record(self, node: str, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.mode != "record":
+            return
+
+        key = cassette_key(prompt, llm_string)
+        with self._lock:
+            started = self._started.pop(key, None)
+            entry = {
+                "key": key,
+                "node": node,
+                "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1) if started is not None else None,
+                # Usage is kept so replayed runs report realistic token counts
+                "generations": [
+                    {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+                    for generation in return_val
+                ],
+            }
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+        metrics.inc("llm_cassette_recorded", node=node)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "recorded_requests": len(self._entries),
+                "misses": len(self.misses),
+            }
+
+    def assert_no_misses(self) -> None:
+        """Raise if any replayed request was missing from the cassette."""
+        if self.misses:
+            nodes = sorted({miss["node"] for miss in self.misses})
+            raise CassetteMissError(f"{len(self.misses)} LLM requests were not on the cassette (nodes: {nodes})")
+
+
+class NodeCassetteCache(BaseCache):
+    """LangChain cache bound to one node that records to / replays from the cassette."""
+
+    def __init__(self, node: str, cassette: Cassette):
+        self.node = node
+        self.cassette = cassette
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        # Misses propagate: replay must never fall through to the API
+        return self.cassette.lookup(self.node, prompt, llm_string)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        try:
+            self.cassette.record(self.node, prompt, llm_string, return_val)
+        except Exception as e:
+            logger.error(f"Failed to record LLM response for {self.node}: {str(e)}")
+
+    def clear(self, **kwargs: Any) -> None:
+        pass
+
+
+def get_cassette_mode() -> str:
+    return os.getenv("LLM_CASSETTE_MODE", "off").lower()
+
+
+_cassette = None
+
+def get_cassette() -> Optional[Cassette]:
+    """Get the process-wide cassette, or None when LLM_CASSETTE_MODE is off."""
+    global _cassette
+    mode = get_cassette_mode()
+    if mode == "off":
+        return None
+    if _cassette is None:
+        _cassette = Cassette(
+            path=os.getenv("LLM_CASSETTE_PATH", "cassettes/llm_cassette.jsonl"),
+            mode=mode,
+            replay_latency=os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true",
+        )
+    return _cassette
+
+def get_node_cassette(node: Optional[str]) -> Optional[NodeCassetteCache]:
+    cassette = get_cassette()
+    if cassette is None:
+        return None
+    return NodeCassetteCache(node or "default", cassette)
+
+def reset_cassette():
+    global _cassette
+    _cassette = None
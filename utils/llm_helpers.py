@@ -2,41 +2,143 @@ import os
 import json
 import time
 import traceback
-from typing import List, Dict, Any
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from typing import List, Dict, Any, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import LLMResult
 from langchain_core.prompts import ChatPromptTemplate
 from core.logger import logger
-
-load_dotenv()
+from core.metrics import metrics
+from core.tracing import get_tracer, get_tracing_mode
+from utils.llm_cache import get_node_cache
+from utils.llm_cassette import get_node_cassette
+from utils.llm_profiles import get_llm_profile, estimate_cost
+from schemas.llm_profile import LLMProfile
 
 def initialize_langsmith():
     try:
         langsmith_api_key = os.getenv("LANGSMITH_API_KEY")
         langsmith_project = os.getenv("LANGSMITH_PROJECT", "langgraph-multi-agent-system")
-        langsmith_tracing = os.getenv("LANGSMITH_TRACING", "false").lower() == "true"
+        mode = get_tracing_mode()
+        
+        # Sampled mode exports in the background and falls back to a local file without a key
+        if mode == "sampled":
+            os.environ["LANGSMITH_PROJECT"] = langsmith_project
+            return get_tracer() is not None
         
-        if langsmith_api_key and langsmith_tracing:
+        if langsmith_api_key and mode == "global":
             os.environ["LANGSMITH_TRACING"] = "true"
             os.environ["LANGSMITH_PROJECT"] = langsmith_project
             os.environ["LANGSMITH_ENDPOINT"] = os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com")
             return True
         else:
+            get_tracer()
             return False
             
     except Exception as e:
         logger.warning(f"Failed to initialize LangSmith: {str(e)}")
         return False
 
-def create_llm_client() -> ChatOpenAI:
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """Records prompt (cached/uncached) and completion tokens per node, and latency/cost per tier."""
+
+    def __init__(self, node: str, profile: Optional[LLMProfile] = None):
+        self.node = node
+        self.profile = profile or get_llm_profile(node)
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        try:
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) if message is not None else None
+                    # Cache hits carry no token usage and are not LLM calls
+                    if not usage or usage.get("input_tokens") is None:
+                        continue
+
+                    prompt_tokens = usage.get("input_tokens", 0)
+                    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+                    metrics.inc("llm_calls", node=self.node)
+                    metrics.inc("llm_prompt_tokens", prompt_tokens, node=self.node)
+                    metrics.inc("llm_prompt_tokens_cached", cached_tokens, node=self.node)
+                    metrics.inc("llm_prompt_tokens_uncached", prompt_tokens - cached_tokens, node=self.node)
+                    metrics.inc("llm_completion_tokens", usage.get("output_tokens", 0), node=self.node)
+
+                    tier_labels = {"tier": self.profile.tier, "model": self.profile.model}
+                    completion_tokens = usage.get("output_tokens", 0)
+                    metrics.inc("llm_tier_calls", **tier_labels)
+                    metrics.inc("llm_tier_latency_ms", latency_ms, **tier_labels)
+                    metrics.inc("llm_tier_prompt_tokens", prompt_tokens, **tier_labels)
+                    metrics.inc("llm_tier_completion_tokens", completion_tokens, **tier_labels)
+                    metrics.inc(
+                        "llm_tier_cost_usd",
+                        estimate_cost(self.profile.model, prompt_tokens, cached_tokens, completion_tokens),
+                        **tier_labels
+                    )
+        except Exception as e:
+            logger.warning(f"Failed to record token usage for {self.node}: {str(e)}")
+
+def get_prompt_cache_report() -> Dict[str, Dict[str, Any]]:
+    """Get cached vs uncached prompt tokens and the cache hit ratio per node."""
+    snapshot = metrics.snapshot()
+    report = {}
+    for labels, prompt_tokens in snapshot.get("llm_prompt_tokens", {}).items():
+        node = dict(labels).get("node", "default")
+        cached = snapshot.get("llm_prompt_tokens_cached", {}).get(labels, 0)
+        report[node] = {
+            "llm_calls": int(snapshot.get("llm_calls", {}).get(labels, 0)),
+            "prompt_tokens": int(prompt_tokens),
+            "cached_tokens": int(cached),
+            "uncached_tokens": int(prompt_tokens - cached),
+            "cache_hit_ratio": round(cached / prompt_tokens, 4) if prompt_tokens else 0.0,
+        }
+    return report
+
+def create_llm_client(node: Optional[str] = None) -> BaseChatModel:
     try:
-        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.1"))
+        # Per-node model tier; falls back to OPENAI_MODEL / OPENAI_TEMPERATURE
+        profile = get_llm_profile(node)
+        
+        # A recording/replay cassette takes the place of the response cache
+        cassette = get_node_cassette(node)
+        cache = cassette if cassette is not None else get_node_cache(node)
+        
+        # Offline, deterministic model for benchmarks and local runs
+        if os.getenv("LLM_PROVIDER", "openai").lower() == "fake":
+            from utils.fake_llm import FakeChatModel
+            return FakeChatModel(
+                node=node or "default",
+                model=profile.model,
+                callbacks=[TokenUsageCallbackHandler(node or "default", profile)],
+                cache=cache
+            )
+        
+        # Replay never reaches the API, so it runs without a key
+        api_key = os.getenv("OPENAI_API_KEY")
+        if cassette is not None and cassette.cassette.mode == "replay":
+            api_key = api_key or "cassette-replay"
         
+        # langchain_openai (and the openai SDK) are only imported when a real client is needed
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
+            model=profile.model,
+            temperature=profile.temperature,
+            max_tokens=profile.max_tokens,
+            timeout=profile.timeout,
+            api_key=api_key,
+            callbacks=[TokenUsageCallbackHandler(node or "default", profile)],
+            cache=cache
         )
     except Exception as e:
         logger.error(f"Failed to create LLM client: {str(e)}")
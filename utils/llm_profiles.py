@@ -0,0 +1,167 @@
+"""
+LLM Profiles - Per-node model tiering.
+
+Each node (``orchestration.schema.Node`` values plus subgraph node names such as
+``sop_collector`` and ``booking_agent``) resolves to a model profile (model,
+temperature, max_tokens, timeout). Profiles are grouped into tiers and loaded
+from the JSON file in ``LLM_PROFILES_PATH``; without it every node uses
+``OPENAI_MODEL`` / ``OPENAI_TEMPERATURE`` as before.
+"""
+
+import os
+import json
+from typing import Dict, Any, Optional
+from core.logger import logger
+from core.metrics import metrics
+from schemas.llm_profile import LLMProfile, LLMProfilesConfig, ModelPricing
+
+# USD per 1M tokens
+DEFAULT_PRICING = {
+    "gpt-4o-mini": ModelPricing(input=0.15, cached_input=0.075, output=0.60),
+    "gpt-4o": ModelPricing(input=2.50, cached_input=1.25, output=10.00),
+    "gpt-4.1": ModelPricing(input=2.00, cached_input=0.50, output=8.00),
+    "gpt-4.1-mini": ModelPricing(input=0.40, cached_input=0.10, output=1.60),
+    "gpt-4.1-nano": ModelPricing(input=0.10, cached_input=0.025, output=0.40),
+}
+
+
+def default_profile() -> LLMProfile:
+    return LLMProfile(
+        tier="default",
+        model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.1")),
+    )
+
+
+def load_profiles(path: Optional[str] = None) -> LLMProfilesConfig:
+    """
+    Load the profiles config.
+
+    Args:
+        path: JSON file path; defaults to LLM_PROFILES_PATH
+
+    Returns:
+        Parsed config, or an empty config if no file is configured or it cannot be read
+    """
+    path = path or os.getenv("LLM_PROFILES_PATH")
+    if not path:
+        return LLMProfilesConfig()
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            config = LLMProfilesConfig(**json.load(file))
+
+        for name, profile in config.tiers.items():
+            profile.tier = name
+
+        unknown = {tier for tier in config.nodes.values() if tier not in config.tiers}
+        if config.default and config.default not in config.tiers:
+            unknown.add(config.default)
+        if unknown:
+            logger.warning(f"LLM profiles reference unknown tiers: {sorted(unknown)}")
+
+        logger.info(f"Loaded {len(config.tiers)} LLM tiers for {len(config.nodes)} nodes from {path}")
+        return config
+
+    except Exception as e:
+        logger.error(f"Error loading LLM profiles from '{path}': {str(e)}")
+        return LLMProfilesConfig()
+
+
+_profiles_config = None
+
+def get_profiles_config() -> LLMProfilesConfig:
+    global _profiles_config
+    if _profiles_config is None:
+        _profiles_config = load_profiles()
+    return _profiles_config
+
+def reset_profiles_config():
+    global _profiles_config
+    _profiles_config = None
+
+
+def get_llm_profile(node: Optional[str] = None) -> LLMProfile:
+    """Resolve the model profile for a node: node mapping, then config default, then env."""
+    config = get_profiles_config()
+    tier = config.nodes.get(node) if node else None
+    tier = tier or config.default
+    if tier and tier in config.tiers:
+        return config.tiers[tier]
+    return default_profile()
+
+
+def get_model_pricing(model: str) -> Optional[ModelPricing]:
+    config = get_profiles_config()
+    if model in config.pricing:
+        return config.pricing[model]
+    if model in DEFAULT_PRICING:
+        return DEFAULT_PRICING[model]
+
+    # Dated snapshots (e.g. gpt-4o-mini-2024-07-18) share the base model's price;
+    # longest prefix first so gpt-4o-mini is not priced as gpt-4o
+    for name in sorted(DEFAULT_PRICING, key=len, reverse=True):
+        if model.startswith(name):
+            return DEFAULT_PRICING[name]
+    return None
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call; 0.0 for models without known pricing."""
+    pricing = get_model_pricing(model)
+    if pricing is None:
+        return 0.0
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * pricing.input
+        + cached_tokens * pricing.cached_input
+        + completion_tokens * pricing.output
+    ) / 1_000_000
+
+
+def get_tier_report() -> Dict[str, Dict[str, Any]]:
+    """
+    Compare latency and cost per tier/model from the calls recorded so far.
+
+    Returns:
+        Mapping of "tier/model" to call count, average latency, tokens and estimated cost
+    """
+    snapshot = metrics.snapshot()
+    report = {}
+    for labels, calls in snapshot.get("llm_tier_calls", {}).items():
+        label = dict(labels)
+        latency = snapshot.get("llm_tier_latency_ms", {}).get(labels, 0)
+        cost = snapshot.get("llm_tier_cost_usd", {}).get(labels, 0)
+        report[f"{label['tier']}/{label['model']}"] = {
+            "tier": label["tier"],
+            "model": label["model"],
+            "calls": int(calls),
+            "avg_latency_ms": round(latency / calls, 1) if calls else 0.0,
+            "prompt_tokens": int(snapshot.get("llm_tier_prompt_tokens", {}).get(labels, 0)),
+            "completion_tokens": int(snapshot.get("llm_tier_completion_tokens", {}).get(labels, 0)),
+            "cost_usd": round(cost, 6),
+            "avg_cost_usd": round(cost / calls, 6) if calls else 0.0,
+        }
+    return report
+
+
+def format_tier_report() -> str:
+    """Render get_tier_report() as a text table."""
+    rows = get_tier_report()
+    lines = [f"{'tier/model':<32} {'calls':>6} {'avg ms':>9} {'prompt':>9} {'compl':>8} {'cost $':>10} {'$/call':>9}"]
+    for name, row in sorted(rows.items()):
+        lines.append(
+            f"{name:<32} {row['calls']:>6} {row['avg_latency_ms']:>9.1f} {row['prompt_tokens']:>9} "
+            f"{row['completion_tokens']:>8} {row['cost_usd']:>10.5f} {row['avg_cost_usd']:>9.6f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from orchestration.schema import Node
+
+    nodes = [node.value for node in Node] + ["sop_collector", "booking_agent"]
+    for node in nodes:
+        profile = get_llm_profile(node)
+        print(f"{node:<16} {profile.tier:<10} {profile.model:<20} temperature={profile.temperature} "
+              f"max_tokens={profile.max_tokens} timeout={profile.timeout}")
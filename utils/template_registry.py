@@ -0,0 +1,177 @@
+"""
+Template Registry - In-memory cache of prompt templates.
+
+Loads every markdown template under ``prompts/`` once, compiles it into a
+``ChatPromptTemplate`` and serves both the raw text and the compiled prompt
+from memory. Files are re-checked by mtime (at most once per
+``PROMPTS_RELOAD_INTERVAL`` seconds) so prompts can be edited without a restart.
+"""
+
+import os
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+from langchain_core.prompts import ChatPromptTemplate
+from core.logger import logger
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+class TemplateEntry:
+    """A loaded template with its compiled prompt and load statistics."""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self.text: Optional[str] = None
+        self.prompts: Dict[str, ChatPromptTemplate] = {}
+        self.mtime: float = 0.0
+        self.checked_at: float = 0.0
+        self.load_ms: float = 0.0
+        self.compile_ms: float = 0.0
+        self.loads: int = 0
+
+
+class TemplateRegistry:
+    """
+    Registry that loads and compiles prompt templates once and hot reloads
+    them when the file on disk changes.
+    """
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, reload_interval: Optional[float] = None,
+                 hot_reload: Optional[bool] = None):
+        self.prompts_dir = Path(prompts_dir)
+        self.reload_interval = reload_interval if reload_interval is not None else float(
+            os.getenv("PROMPTS_RELOAD_INTERVAL", "1.0")
+        )
+        self.hot_reload = hot_reload if hot_reload is not None else (
+            os.getenv("PROMPTS_HOT_RELOAD", "true").lower() == "true"
+        )
+        self._entries: Dict[str, TemplateEntry] = {}
+        self._lock = threading.RLock()
+
+    def _load(self, entry: TemplateEntry, mtime: float) -> None:
+        """Read and compile a template, recording load and compile timings."""
+        started = time.perf_counter()
+        with open(entry.path, "r", encoding="utf-8") as file:
+            text = file.read()
+        loaded = time.perf_counter()
+
+        # Parse the template variables here once instead of on every turn
+        prompts = {}
+        try:
+            prompts["system"] = ChatPromptTemplate.from_messages([("system", text)])
+        except Exception as e:
+            # Plain-text templates (e.g. checklists) are only used as variable values
+            logger.warning(f"Template '{entry.name}' could not be compiled as a prompt: {str(e)}")
+        compiled = time.perf_counter()
+
+        entry.text = text
+        entry.prompts = prompts
+        entry.mtime = mtime
+        entry.load_ms = (loaded - started) * 1000
+        entry.compile_ms = (compiled - loaded) * 1000
+        entry.loads += 1
+
+        if entry.loads > 1:
+            logger.info(f"Template '{entry.name}' reloaded ({entry.load_ms:.2f}ms load, {entry.compile_ms:.2f}ms compile)")
+
+    def _entry(self, name: str) -> TemplateEntry:
+        """Return an up-to-date entry for the template, loading or reloading as needed."""
+        now = time.monotonic()
+        entry = self._entries.get(name)
+
+        # Fast path: fresh entry within the reload interval needs no disk access
+        if entry is not None and entry.text is not None:
+            if not self.hot_reload or now - entry.checked_at < self.reload_interval:
+                return entry
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = TemplateEntry(name, self.prompts_dir / f"{name}.md")
+                self._entries[name] = entry
+
+            mtime = os.stat(entry.path).st_mtime
+            if entry.text is None or mtime != entry.mtime:
+                self._load(entry, mtime)
+            entry.checked_at = now
+            return entry
+
+    def get_text(self, name: str) -> Optional[str]:
+        """
+        Get the raw text of a template.
+
+        Args:
+            name: Template name relative to the prompts directory, without extension
+                (e.g. "sop_enforcer", "sop_checklists/appointment")
+
+        Returns:
+            Template text, or None if the template cannot be read
+        """
+        try:
+            return self._entry(name).text
+        except Exception as e:
+            logger.error(f"Error loading template '{name}': {str(e)}")
+            return None
+
+    def get_prompt(self, name: str, role: str = "system") -> ChatPromptTemplate:
+        """
+        Get the compiled ChatPromptTemplate for a template.
+
+        Args:
+            name: Template name relative to the prompts directory, without extension
+            role: Message role the template is rendered as ("system" or "human")
+
+        Returns:
+            Compiled ChatPromptTemplate with the template as a single message
+        """
+        entry = self._entry(name)
+        prompt = entry.prompts.get(role)
+        if prompt is None:
+            prompt = ChatPromptTemplate.from_messages([(role, entry.text)])
+            entry.prompts[role] = prompt
+        return prompt
+
+    def preload(self) -> Dict[str, Dict[str, Any]]:
+        """Load and compile every template under the prompts directory."""
+        for path in sorted(self.prompts_dir.rglob("*.md")):
+            name = path.relative_to(self.prompts_dir).with_suffix("").as_posix()
+            self.get_text(name)
+
+        stats = self.stats()
+        total_ms = sum(s["load_ms"] + s["compile_ms"] for s in stats.values())
+        logger.info(f"Template registry preloaded {len(stats)} templates in {total_ms:.2f}ms")
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get load/compile timings and reload counts for every loaded template."""
+        with self._lock:
+            return {
+                name: {
+                    "load_ms": round(entry.load_ms, 3),
+                    "compile_ms": round(entry.compile_ms, 3),
+                    "loads": entry.loads,
+                    "size": len(entry.text or ""),
+                }
+                for name, entry in self._entries.items()
+            }
+
+    def clear(self) -> None:
+        """Drop all cached templates so the next access reloads from disk."""
+        with self._lock:
+            self._entries.clear()
+
+
+_template_registry = None
+
+def get_template_registry() -> TemplateRegistry:
+    global _template_registry
+    if _template_registry is None:
+        _template_registry = TemplateRegistry()
+    return _template_registry
+
+def reset_template_registry():
+    global _template_registry
+    _template_registry = None
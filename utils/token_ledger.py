@@ -0,0 +1,249 @@
+"""
+Token Ledger - Per-session LLM token and cost accounting.
+
+``LedgerCallbackHandler`` is attached to the main graph and attributes every
+LLM call (router, agents, the SOP collector and booking agent inside the
+appointment sub-graph) to the turn it belongs to and to the node that made
+it. At the end of each turn the ``ledger`` node folds the turn's usage into
+``state["metadata"]["ledger"]``:
+
+    {
+        "turns": 3,
+        "totals": {"llm_calls": 7, "prompt_tokens": 9120, "cached_tokens": 4096,
+                   "completion_tokens": 410, "cost_usd": 0.0021},
+        "agents": {"router": {...}, "appointment": {...}},
+        "nodes": {"router/agent": {...}, "appointment/sop_collector": {...}},
+        "last_turn": {...},  # usage of the latest turn, plus its handoff "hops"
+        "budget_exceeded": False
+    }
+
+Per-session budgets come from ``LEDGER_MAX_TOKENS`` (prompt + completion)
+and ``LEDGER_MAX_COST_USD``. A session over budget is answered with a canned
+reply on its next turn instead of reaching the router.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from core.logger import logger
+from core.metrics import metrics
+from core.telemetry import node_path
+from utils.llm_profiles import estimate_cost
+
+USAGE_FIELDS = ("llm_calls", "prompt_tokens", "cached_tokens", "completion_tokens", "cost_usd")
+
+
+def empty_usage() -> Dict[str, Any]:
+    return {field: 0 if field != "cost_usd" else 0.0 for field in USAGE_FIELDS}
+
+
+def add_usage(total: Dict[str, Any], usage: Dict[str, Any]) -> Dict[str, Any]:
+    """Sum two usage records into a new one."""
+    combined = empty_usage()
+    for field in USAGE_FIELDS:
+        combined[field] = (total or {}).get(field, 0) + (usage or {}).get(field, 0)
+    combined["cost_usd"] = round(combined["cost_usd"], 6)
+    return combined
+
+
+def empty_ledger() -> Dict[str, Any]:
+    return {
+        "turns": 0,
+        "totals": empty_usage(),
+        "agents": {},
+        "nodes": {},
+        "last_turn": empty_usage(),
+        "budget_exceeded": False,
+    }
+
+
+def get_budget() -> Dict[str, Optional[float]]:
+    """Per-session budget from LEDGER_MAX_TOKENS / LEDGER_MAX_COST_USD (None = unlimited)."""
+    max_tokens = os.getenv("LEDGER_MAX_TOKENS")
+    max_cost = os.getenv("LEDGER_MAX_COST_USD")
+    return {
+        "max_tokens": int(max_tokens) if max_tokens else None,
+        "max_cost_usd": float(max_cost) if max_cost else None,
+    }
+
+
+def over_budget(ledger: Optional[Dict[str, Any]]) -> bool:
+    """True when the session's accumulated usage has reached its budget."""
+    if not ledger:
+        return False
+    budget = get_budget()
+    totals = ledger.get("totals", {})
+    tokens = totals.get("prompt_tokens", 0) + totals.get("completion_tokens", 0)
+    if budget["max_tokens"] is not None and tokens >= budget["max_tokens"]:
+        return True
+    if budget["max_cost_usd"] is not None and totals.get("cost_usd", 0.0) >= budget["max_cost_usd"]:
+        return True
+    return False
+
+
+def apply_turn(ledger: Optional[Dict[str, Any]], calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold one turn's LLM calls into a session ledger, returning a new ledger."""
+    ledger = {**empty_ledger(), **(ledger or {})}
+    agents = dict(ledger["agents"])
+    nodes = dict(ledger["nodes"])
+    added = empty_usage()
+
+    for call in calls:
+        usage = {field: call.get(field, 0) for field in USAGE_FIELDS}
+        added = add_usage(added, usage)
+        agents[call["agent"]] = add_usage(agents.get(call["agent"]), usage)
+        nodes[call["node"]] = add_usage(nodes.get(call["node"]), usage)
+
+    ledger.update({
+        "turns": ledger["turns"] + 1,
+        "totals": add_usage(ledger["totals"], added),
+        "agents": agents,
+        "nodes": nodes,
+        "last_turn": added,
+    })
+    ledger["budget_exceeded"] = over_budget(ledger)
+    return ledger
+
+
+class LedgerCallbackHandler(BaseCallbackHandler):
+    """Collects the LLM calls of each running turn, keyed by the turn's root run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # run_id -> root run_id for every run of an active turn
+        self._roots: Dict[UUID, UUID] = {}
+        self._calls: Dict[UUID, List[Dict[str, Any]]] = {}
+        self._llm_runs: Dict[UUID, Dict[str, str]] = {}
+
+    def _register(self, run_id: UUID, parent_run_id: Optional[UUID]) -> Optional[UUID]:
+        with self._lock:
+            if parent_run_id is None:
+                self._roots[run_id] = run_id
+                self._calls[run_id] = []
+                return run_id
+            root = self._roots.get(parent_run_id)
+            if root is not None:
+                self._roots[run_id] = root
+            return root
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._register(run_id, parent_run_id)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._register(run_id, parent_run_id)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                            **kwargs: Any) -> None:
+        if self._register(run_id, parent_run_id) is None:
+            return
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        path = node_path(node, metadata) if node else "llm"
+        with self._lock:
+            self._llm_runs[run_id] = {
+                "node": path,
+                "agent": path.split("/")[0],
+                "model": metadata.get("ls_model_name") or "",
+            }
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+            root = self._roots.get(run_id)
+        if run is None or root is None:
+            return
+        try:
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                    # Response-cache hits are not LLM calls and cost nothing
+                    if not usage or usage.get("input_tokens") is None:
+                        continue
+                    prompt_tokens = usage.get("input_tokens", 0) or 0
+                    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+                    completion_tokens = usage.get("output_tokens", 0) or 0
+                    call = {
+                        **run,
+                        "llm_calls": 1,
+                        "prompt_tokens": prompt_tokens,
+                        "cached_tokens": cached_tokens,
+                        "completion_tokens": completion_tokens,
+                        "cost_usd": estimate_cost(run["model"], prompt_tokens, cached_tokens, completion_tokens),
+                    }
+                    with self._lock:
+                        if root in self._calls:
+                            self._calls[root].append(call)
+        except Exception as e:
+            logger.warning(f"Failed to record ledger usage for {run['node']}: {str(e)}")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._llm_runs.pop(run_id, None)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            if self._roots.get(run_id) != run_id:
+                return
+            self._calls.pop(run_id, None)
+            self._roots = {run: root for run, root in self._roots.items() if root != run_id}
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def take_turn_calls(self, run_id: Optional[UUID]) -> List[Dict[str, Any]]:
+        """LLM calls of the turn run_id belongs to; each call is handed out once."""
+        with self._lock:
+            root = self._roots.get(run_id) if run_id is not None else None
+            if root is None or root not in self._calls:
+                return []
+            calls, self._calls[root] = self._calls[root], []
+            return calls
+
+
+_ledger_handler = None
+
+def get_ledger_handler() -> Optional[LedgerCallbackHandler]:
+    """Process-wide ledger handler, or None when LEDGER_ENABLED is false."""
+    global _ledger_handler
+    if os.getenv("LEDGER_ENABLED", "true").lower() != "true":
+        return None
+    if _ledger_handler is None:
+        _ledger_handler = LedgerCallbackHandler()
+    return _ledger_handler
+
+def get_ledger_callbacks() -> List[BaseCallbackHandler]:
+    """Callbacks to attach to the main graph (empty when the ledger is off)."""
+    handler = get_ledger_handler()
+    return [handler] if handler else []
+
+def reset_ledger_handler():
+    global _ledger_handler
+    _ledger_handler = None
+
+
+def record_turn(ledger: Optional[Dict[str, Any]], run_id: Optional[UUID]) -> Dict[str, Any]:
+    """Fold the LLM calls of the turn run_id belongs to into the session ledger."""
+    handler = get_ledger_handler()
+    calls = handler.take_turn_calls(run_id) if handler else []
+    updated = apply_turn(ledger, calls)
+
+    turn = updated["last_turn"]
+    for call in calls:
+        metrics.inc("ledger_cost_usd", call["cost_usd"], agent=call["agent"])
+    logger.info(
+        "Turn usage: {} LLM calls, {} prompt ({} cached) / {} completion tokens, ${:.4f}; session ${:.4f}",
+        turn["llm_calls"], turn["prompt_tokens"], turn["cached_tokens"], turn["completion_tokens"],
+        turn["cost_usd"], updated["totals"]["cost_usd"]
+    )
+    if updated["budget_exceeded"] and not (ledger or {}).get("budget_exceeded"):
+        metrics.inc("ledger_budget_exceeded")
+        logger.warning(f"Session budget reached after {updated['turns']} turns: {updated['totals']}")
+    return updated
@@ -0,0 +1,172 @@
+"""
+Tool Registry - Each agent's tools, their OpenAI schemas and bound model, built once.
+
+Agents used to assemble their tool list on every call (re-creating the handoff
+tool closures), and every ``bind_tools()`` re-derived the JSON schemas from the
+tool signatures and docstrings. The registry builds an agent's tool list and
+its OpenAI tool schemas on first use, timing the schema generation, and keeps
+the agent's model bound to those schemas. ``client()`` keeps one LLM client
+per node (nodes without tools, like ``sop_collector``, use it directly).
+``preload()`` builds every agent at startup and logs the schema-generation time.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from core.logger import logger
+
+
+def _agent_tools() -> Dict[str, Callable[[], List[BaseTool]]]:
+    # Imported here: tool modules pull in their own dependencies
+    from tools.appointment_tools import create_appointment, check_availability, reschedule_appointment
+    from tools.support_tools import create_support_ticket, check_warranty_status, escalate_ticket
+    from tools.estimate_tools import calculate_estimate, verify_address, get_service_catalog
+    from tools.advisor_tools import get_service_info, get_business_hours, get_contact_info
+    from utils.agent_handoff import get_handoff_tools, get_agent_router_tools
+
+    # LLM node (see utils.llm_helpers.create_llm_client) -> its tools
+    return {
+        "router": get_handoff_tools,
+        # No transfer_to_general: a self-handoff would re-enter general without the router
+        "general": lambda: [get_service_info, get_service_catalog]
+                           + [t for t in get_handoff_tools() if t.name != "transfer_to_general"],
+        "support": lambda: [create_support_ticket, check_warranty_status, escalate_ticket] + get_agent_router_tools(),
+        "estimate": lambda: [calculate_estimate, verify_address, get_service_catalog] + get_agent_router_tools(),
+        "advisor": lambda: [get_service_info, get_business_hours, get_contact_info] + get_agent_router_tools(),
+        "booking_agent": lambda: [create_appointment, check_availability, reschedule_appointment] + get_agent_router_tools(),
+    }
+
+
+class ToolSet:
+    """An agent's tools with their OpenAI schemas and generation time."""
+
+    def __init__(self, node: str, tools: List[BaseTool]):
+        self.node = node
+        self.tools = tools
+        started = time.perf_counter()
+        self.schemas: List[Dict[str, Any]] = [convert_to_openai_tool(tool) for tool in tools]
+        self.schema_ms = (time.perf_counter() - started) * 1000
+        self.bound: Optional[Any] = None
+
+
+class ToolRegistry:
+    """Registry that builds each agent's tool set, LLM client and bound model once."""
+
+    def __init__(self, agent_tools: Optional[Dict[str, Callable[[], List[BaseTool]]]] = None):
+        self._agent_tools = agent_tools
+        self._sets: Dict[str, ToolSet] = {}
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _factories(self) -> Dict[str, Callable[[], List[BaseTool]]]:
+        if self._agent_tools is None:
+            with self._lock:
+                if self._agent_tools is None:
+                    self._agent_tools = _agent_tools()
+        return self._agent_tools
+
+    def _set(self, node: str) -> ToolSet:
+        tool_set = self._sets.get(node)
+        if tool_set is not None:
+            return tool_set
+
+        with self._lock:
+            tool_set = self._sets.get(node)
+            if tool_set is None:
+                factories = self._factories()
+                if node not in factories:
+                    raise KeyError(f"No tools registered for agent '{node}'")
+                tool_set = ToolSet(node, factories[node]())
+                self._sets[node] = tool_set
+            return tool_set
+
+    def tools(self, node: str) -> List[BaseTool]:
+        """The agent's tools (for its ToolNode or react agent)."""
+        return list(self._set(node).tools)
+
+    def schemas(self, node: str) -> List[Dict[str, Any]]:
+        """The OpenAI tool schemas of the agent's tools."""
+        return self._set(node).schemas
+
+    def client(self, node: str) -> Any:
+        """
+        The node's LLM client.
+
+        Args:
+            node: LLM node name, passed to create_llm_client()
+
+        Returns:
+            Chat model; created on first use and reused afterwards
+        """
+        llm = self._clients.get(node)
+        if llm is not None:
+            return llm
+
+        with self._lock:
+            llm = self._clients.get(node)
+            if llm is None:
+                from utils.llm_helpers import create_llm_client
+                llm = create_llm_client(node)
+                self._clients[node] = llm
+            return llm
+
+    def bound(self, node: str) -> Any:
+        """
+        The agent's LLM client bound to its precomputed tool schemas.
+
+        Args:
+            node: LLM node name, also used for create_llm_client()
+
+        Returns:
+            Runnable chat model; built on first use and reused afterwards
+        """
+        tool_set = self._set(node)
+        if tool_set.bound is None:
+            with self._lock:
+                if tool_set.bound is None:
+                    tool_set.bound = self.client(node).bind_tools(tool_set.schemas)
+        return tool_set.bound
+
+    def preload(self) -> Dict[str, Dict[str, Any]]:
+        """Build the tool set of every agent."""
+        for node in list(self._factories()):
+            self._set(node)
+
+        stats = self.stats()
+        total_ms = sum(s["schema_ms"] for s in stats.values())
+        logger.info(f"Tool registry generated {sum(s['tools'] for s in stats.values())} tool schemas "
+                    f"for {len(stats)} agents in {total_ms:.2f}ms")
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tool count, schema-generation time and binding state per agent."""
+        with self._lock:
+            return {
+                node: {
+                    "tools": len(tool_set.tools),
+                    "schema_ms": round(tool_set.schema_ms, 3),
+                    "bound": tool_set.bound is not None,
+                }
+                for node, tool_set in self._sets.items()
+            }
+
+    def clear(self) -> None:
+        """Drop all tool sets, LLM clients and bound models (e.g. after an LLM profile change)."""
+        with self._lock:
+            self._sets.clear()
+            self._clients.clear()
+
+
+_tool_registry = None
+
+def get_tool_registry() -> ToolRegistry:
+    global _tool_registry
+    if _tool_registry is None:
+        _tool_registry = ToolRegistry()
+    return _tool_registry
+
+def reset_tool_registry():
+    global _tool_registry
+    _tool_registry = None